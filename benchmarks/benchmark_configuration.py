@@ -0,0 +1,401 @@
+""" benchmark_configuration - times and memory-profiles the Configuration hot paths
+	of Rubicon_IV on seeded synthetic data, headlessly.
+
+	Usage:
+		python benchmarks/benchmark_configuration.py --scales small medium
+		python benchmarks/benchmark_configuration.py --baseline benchmarks/baseline.json
+		python benchmarks/benchmark_configuration.py --save-baseline benchmarks/baseline.json
+
+	Results are written as JSON so speedups and regressions can be tracked release
+	over release.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+#
+# Run without a display and keep matplotlib off any interactive backend
+#
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("MPLBACKEND", "Agg")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from PySide6.QtWidgets import QApplication
+
+from Rubicon_IV import Configuration
+
+# --------------------------------------------------------------------------------------------
+#
+# Sizes of synthetic data - points in configurations and respondents in individuals files
+#
+SCALES = {
+	"small": {"npoint": 20, "n_individ": 1_000, "n_evaluator": 100},
+	"medium": {"npoint": 200, "n_individ": 100_000, "n_evaluator": 1_000},
+	"large": {"npoint": 2_000, "n_individ": 1_000_000, "n_evaluator": 10_000}
+}
+NDIM = 2
+SEED = 1960
+application = None		# the QApplication, held for as long as the benchmarks run
+
+# --------------------------------------------------------------------------------------------
+#
+# Seeded synthetic generators
+#
+
+
+def make_labels(npoint):
+	labels = [f"P{each_point:04d}" for each_point in range(npoint)]
+	names = [f"Point {each_point}" for each_point in range(npoint)]
+	return labels, names
+
+
+def write_configuration(file_name, npoint, ndim, rng):
+	labels, names = make_labels(npoint)
+	coords = rng.uniform(-1.0, 1.0, size=(npoint, ndim))
+	with open(file_name, "w") as file_handle:
+		file_handle.write("Configuration\n")
+		file_handle.write(f" {ndim} {npoint}\n")
+		for each_dim in range(ndim):
+			file_handle.write(f"Dim{each_dim + 1};Dimension {each_dim + 1}\n")
+		for each_point in range(npoint):
+			file_handle.write(f"{labels[each_point]};{names[each_point]}\n")
+		for each_point in range(npoint):
+			file_handle.write(" ".join(repr(float(value)) for value in coords[each_point]) + "\n")
+	return coords
+
+
+def write_lower_triangular(file_name, npoint, rng):
+	labels, names = make_labels(npoint)
+	values = rng.uniform(0.0, 100.0, size=(npoint, npoint))
+	with open(file_name, "w") as file_handle:
+		file_handle.write("Lower triangular\n")
+		file_handle.write(f"{npoint}\n")
+		for each_point in range(npoint):
+			file_handle.write(f"{labels[each_point]};{names[each_point]}\n")
+		for each_row in range(1, npoint):
+			file_handle.write(" ".join(f"{value:.3f}" for value in values[each_row, :each_row]) + "\n")
+
+
+def write_evaluations(file_name, npoint, n_evaluator, rng):
+	#
+	# Feeling thermometers, 0 to 100, as read by the Line of Sight command
+	#
+	labels, names = make_labels(npoint)
+	therms = rng.integers(0, 101, size=(n_evaluator, npoint))
+	pd.DataFrame(therms, columns=names).to_csv(file_name, index=False)
+
+
+def make_individuals(n_individ, rng):
+	return pd.DataFrame({
+		"Resp_no": np.arange(n_individ),
+		"Dim1": rng.normal(0.0, 0.5, size=n_individ),
+		"Dim2": rng.normal(0.0, 0.5, size=n_individ),
+		"Group": rng.integers(0, 50, size=n_individ),
+		"Weight": rng.uniform(0.5, 2.0, size=n_individ)
+	})
+
+# --------------------------------------------------------------------------------------------
+#
+# Set up a Configuration in the state each hot path expects
+#
+
+
+def configured(work_dir, scale):
+	conf = Configuration()
+	conf.read_configuration_function(os.path.join(work_dir, f"conf_{scale}.txt"))
+	return conf
+
+
+def with_similarities(work_dir, scale):
+	conf = configured(work_dir, scale)
+	conf.value_type = "similarities"
+	conf.read_lower_triangular(os.path.join(work_dir, f"sims_{scale}.txt"))
+	conf.similarities = conf.values
+	return conf
+
+
+def with_full_printing(work_dir, scale):
+	conf = with_similarities(work_dir, scale)
+	conf.print_rows_limit = conf.nreferent
+	return conf
+
+
+def with_duplicated(work_dir, scale):
+	conf = with_similarities(work_dir, scale)
+	conf.duplicate_similarities()
+	return conf
+
+
+def with_distances(work_dir, scale):
+	conf = with_duplicated(work_dir, scale)
+	conf.inter_point_distances()
+	return conf
+
+
+def with_individuals(work_dir, scale, individuals):
+	conf = configured(work_dir, scale)
+	conf.ind_vars = individuals
+	conf.n_individ = individuals.shape[0]
+	conf.range_n_individ = range(conf.n_individ)
+	conf.dim1 = individuals["Dim1"]
+	conf.dim2 = individuals["Dim2"]
+	return conf
+
+
+def with_reference_points(work_dir, scale, individuals):
+	conf = with_individuals(work_dir, scale, individuals)
+	conf.max_and_min("Individuals")
+	conf.rival_a = 0
+	conf.rival_b = 1
+	conf.set_direction_flags()
+	conf.bisector_function(conf.rival_a, conf.rival_b)
+	conf.set_line_case()
+	conf.dividers()
+	conf.ends_of_bisector_function()
+	return conf
+
+
+def with_crosstabs(work_dir, scale, individuals):
+	conf = with_reference_points(work_dir, scale, individuals)
+	conf.assign_to_segments()
+	conf.crosstab_vars = ["Group"]
+	conf.crosstab_weight = "Weight"
+	return conf
+
+
+def with_mds_input(work_dir, scale):
+	conf = with_duplicated(work_dir, scale)
+	conf.n_comp = NDIM
+	conf.ndim = NDIM
+	return conf
+
+
+def with_landmarks(work_dir, scale):
+	conf = with_similarities(work_dir, scale)
+	conf.n_comp = NDIM
+	conf.ndim = NDIM
+	conf.mds_landmarks = min(conf.mds_landmarks, conf.nreferent // 2)
+	return conf
+
+
+def with_new_points(work_dir, scale):
+	# A tenth as many new points again, with values to every existing and earlier new point
+	conf = with_similarities(work_dir, scale)
+	n_new = max(1, conf.npoint // 10)
+	rng = np.random.default_rng(SEED)
+	conf.new_points = (
+		[f"N{each_new}" for each_new in range(n_new)], [f"New {each_new}" for each_new in range(n_new)],
+		[rng.uniform(0.0, 1.0, conf.npoint + each_new) for each_new in range(n_new)])
+	return conf
+
+# --------------------------------------------------------------------------------------------
+#
+# Measurement
+#
+
+
+def measure(setup, action, repeats):
+	""" measure - runs setup (untimed) then action, repeats times, and returns the
+		best and mean wall time together with the peak memory allocated by action.
+	"""
+	times = []
+	peak = 0
+	for each_repeat in range(repeats):
+		with contextlib.redirect_stdout(io.StringIO()):
+			conf = setup()
+			gc.collect()
+			tracemalloc.start()
+			started = time.perf_counter()
+			action(conf)
+			elapsed = time.perf_counter() - started
+			peak = max(peak, tracemalloc.get_traced_memory()[1])
+			tracemalloc.stop()
+		plt.close("all")
+		times.append(elapsed)
+	return {
+		"best_seconds": min(times),
+		"mean_seconds": float(np.mean(times)),
+		"peak_bytes": peak,
+		"repeats": repeats
+	}
+
+
+def run_benchmarks(scales, only, repeats):
+	results = {}
+	rng = np.random.default_rng(SEED)
+	home = os.getcwd()
+	with tempfile.TemporaryDirectory() as work_dir:
+		for scale in scales:
+			sizes = SCALES[scale]
+			write_configuration(os.path.join(work_dir, f"conf_{scale}.txt"), sizes["npoint"], NDIM, rng)
+			write_lower_triangular(os.path.join(work_dir, f"sims_{scale}.txt"), sizes["npoint"], rng)
+			os.makedirs(os.path.join(work_dir, scale, "elections", "2004"), exist_ok=True)
+			write_evaluations(
+				os.path.join(work_dir, scale, "elections", "2004", "2004_therms.csv"),
+				sizes["npoint"], sizes["n_evaluator"], rng)
+			individuals = make_individuals(sizes["n_individ"], rng)
+			#
+			# name: (setup, action)
+			#
+			cases = {
+				"read_configuration_function": (
+					Configuration,
+					lambda conf: conf.read_configuration_function(os.path.join(work_dir, f"conf_{scale}.txt"))),
+				"read_lower_triangular": (
+					lambda: configured(work_dir, scale),
+					lambda conf: conf.read_lower_triangular(os.path.join(work_dir, f"sims_{scale}.txt"))),
+				"print_lower_triangle": (
+					lambda: with_full_printing(work_dir, scale),
+					lambda conf: conf.print_lower_triangle(
+						2, conf.item_labels, conf.item_names, conf.nreferent, conf.similarities, 8)),
+				"write_lower_triangle": (
+					lambda: with_similarities(work_dir, scale),
+					lambda conf: conf.write_lower_triangle(
+						os.path.join(work_dir, f"triangle_{scale}_{time.perf_counter_ns()}.txt"),
+						conf.item_labels, conf.item_names, conf.similarities)),
+				"duplicate_similarities": (
+					lambda: with_similarities(work_dir, scale),
+					lambda conf: conf.duplicate_similarities()),
+				"write": (
+					lambda: configured(work_dir, scale),
+					lambda conf: conf.write(
+						os.path.join(work_dir, f"written_{scale}_{time.perf_counter_ns()}.txt"), binary=True)),
+				"inter_point_distances": (
+					lambda: with_duplicated(work_dir, scale),
+					lambda conf: conf.inter_point_distances()),
+				"rank": (
+					lambda: with_distances(work_dir, scale),
+					lambda conf: conf.rank()),
+				"assign_to_segments": (
+					lambda: with_reference_points(work_dir, scale, individuals),
+					lambda conf: conf.assign_to_segments()),
+				"segment_crosstabs": (
+					lambda: with_crosstabs(work_dir, scale, individuals),
+					lambda conf: conf.segment_crosstabs()),
+				"matchup_sweep": (
+					lambda: with_individuals(work_dir, scale, individuals),
+					lambda conf: conf.matchup_sweep()),
+				"nearest_segments": (
+					lambda: with_individuals(work_dir, scale, individuals),
+					lambda conf: conf.nearest_segments(list(range(min(5, conf.npoint))), True, True)),
+				"group_individuals": (
+					lambda: with_individuals(work_dir, scale, individuals),
+					lambda conf: conf.group_individuals("Group", "Weighted mean", "Weight")),
+				"los": (
+					Configuration,
+					lambda conf: conf.los()),
+				"mds": (
+					lambda: with_mds_input(work_dir, scale),
+					lambda conf: conf.mds()),
+				"landmark_mds": (
+					lambda: with_landmarks(work_dir, scale),
+					lambda conf: conf.landmark_mds()),
+				"add_points": (
+					lambda: with_new_points(work_dir, scale),
+					lambda conf: conf.add_points(*conf.new_points)),
+				"scree": (
+					lambda: with_mds_input(work_dir, scale),
+					lambda conf: conf.scree())
+			}
+			for name, (setup, action) in cases.items():
+				if only and name not in only:
+					continue
+				key = f"{name}[{scale}]"
+				print(f"\t{key:<40}", end="", flush=True)
+				#
+				# los reads its thermometers relative to the working directory
+				#
+				os.chdir(os.path.join(work_dir, scale))
+				try:
+					results[key] = measure(setup, action, repeats)
+					print(f"{results[key]['best_seconds']:12.4f} s {results[key]['peak_bytes'] / 2**20:10.1f} MiB")
+				except Exception as error:
+					results[key] = {"error": f"{type(error).__name__}: {error}"}
+					print(f"  failed: {results[key]['error']}")
+				finally:
+					os.chdir(home)
+	return results
+
+# --------------------------------------------------------------------------------------------
+#
+# Comparison with a stored baseline
+#
+
+
+def compare(results, baseline, threshold):
+	regressions = []
+	print(f"\n\t{'Benchmark':<40}{'Baseline':>12}{'Current':>12}{'Ratio':>8}")
+	for key, current in results.items():
+		previous = baseline.get("results", {}).get(key)
+		if previous is None or "error" in previous or "error" in current:
+			continue
+		ratio = current["best_seconds"] / previous["best_seconds"]
+		flag = ""
+		if ratio > threshold:
+			flag = "  REGRESSION"
+			regressions.append(key)
+		elif ratio < 1 / threshold:
+			flag = "  faster"
+		print(f"\t{key:<40}{previous['best_seconds']:12.4f}{current['best_seconds']:12.4f}{ratio:8.2f}{flag}")
+	return regressions
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark Configuration hot paths.")
+	parser.add_argument("--scales", nargs="+", choices=SCALES.keys(), default=["small"])
+	parser.add_argument("--only", nargs="+", default=[], help="names of benchmarks to run")
+	parser.add_argument("--repeats", type=int, default=3)
+	parser.add_argument("--output", default="bench_results.json")
+	parser.add_argument("--baseline", help="JSON file of earlier results to compare with")
+	parser.add_argument("--save-baseline", help="also write the results to this baseline file")
+	parser.add_argument(
+		"--threshold", type=float, default=1.10,
+		help="ratio of current to baseline time reported as a regression")
+	args = parser.parse_args()
+	#
+	# Configuration builds Qt objects, so an application must exist and stay referenced
+	# for the whole run; a module global keeps it alive past this statement
+	#
+	global application
+	application = QApplication.instance() or QApplication([])
+	print(f"\n\tBenchmarking scales {', '.join(args.scales)} with {args.repeats} repeats\n")
+	results = run_benchmarks(args.scales, args.only, args.repeats)
+	#
+	document = {
+		"created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"numpy": np.__version__,
+		"pandas": pd.__version__,
+		"seed": SEED,
+		"results": results
+	}
+	with open(args.output, "w") as file_handle:
+		json.dump(document, file_handle, indent=2)
+	print(f"\n\tResults written to {args.output}")
+	if args.save_baseline:
+		with open(args.save_baseline, "w") as file_handle:
+			json.dump(document, file_handle, indent=2)
+		print(f"\tBaseline written to {args.save_baseline}")
+	#
+	regressions = []
+	if args.baseline:
+		with open(args.baseline) as file_handle:
+			regressions = compare(results, json.load(file_handle), args.threshold)
+	if regressions:
+		print(f"\n\t{len(regressions)} regression(s): {', '.join(regressions)}")
+		sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
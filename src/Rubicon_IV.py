@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from typing import List, Dict, Tuple
-from io import StringIO, TextIOWrapper
+from io import BytesIO, StringIO, TextIOWrapper
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 import numpy as np
 from numpy import eye, asarray, dot, sum, diag
 from numpy.linalg import svd
@@ -10,23 +11,39 @@ import pandas as pd
 from sklearn import manifold
 from sklearn.decomposition import FactorAnalysis, PCA
 from sklearn.preprocessing import StandardScaler
+from sklearn.isotonic import IsotonicRegression
 
 from factor_analyzer import FactorAnalyzer
 import math
-import random
+from itertools import chain, islice, repeat
+from concurrent.futures import ThreadPoolExecutor
 import copy
 from scipy.stats import spearmanr
-from scipy.spatial import procrustes
 import os
 import sys
+import time
+import json
+import cProfile
+import pstats
+try:
+	import resource
+except ImportError:
+	resource = None		# not available on Windows, peak RSS is then not recorded
+try:
+	import pyarrow
+	import pyarrow.parquet as pq
+except ImportError:
+	pq = None		# Parquet export of factor scores is offered only with pyarrow
+import gzip
+import hashlib
 from PySide6 import QtWidgets, QtCore
-from PySide6.QtCore import Qt, QFile, QIODevice, QObject, QRect, QSaveFile, QSize, Signal
+from PySide6.QtCore import Qt, QAbstractTableModel, QFile, QIODevice, QModelIndex, QObject, QRect, QSaveFile, QSize, QThread, Signal
 from PySide6.QtWidgets import QApplication, QButtonGroup, QDialog,\
 	QDialogButtonBox, QDoubleSpinBox, QFileDialog, QGridLayout, QGroupBox, QHBoxLayout, \
 	QInputDialog, QLabel, QLineEdit, QMainWindow, QMenu, QMessageBox, QPlainTextEdit,  \
 	QPushButton, QRadioButton, QScrollArea, QSizePolicy, QSpacerItem, \
-	QSpinBox, QStatusBar, QTableWidget, QTableWidgetItem, QTabWidget, QTextEdit, QToolBar, \
-	QVBoxLayout, QWidget
+	QSlider, QSpinBox, QStatusBar, QStyledItemDelegate, QTableView, QTableWidget, QTableWidgetItem, \
+	QTabWidget, QTextEdit, QToolBar, QVBoxLayout, QWidget
 from PySide6.QtGui import QAction, QColor, QFont, QIcon,  QPalette, QKeySequence, QMouseEvent, QWheelEvent
 from PySide6.QtUiTools import QUiLoader
 # os.environ["QT_API"] = "pyside6"
@@ -39,6 +56,35 @@ class VerbositySignal(QObject):
 	signal = Signal(bool)
 
 
+class ScoresExportWorker(QObject):
+	finished = Signal(str)
+	failed = Signal(str)
+
+	def __init__(self, fa, evaluations, file_name, file_format, chunk_rows, columns):
+		super().__init__()
+		self.fa = fa
+		self.evaluations = evaluations
+		self.file_name = file_name
+		self.file_format = file_format
+		self.chunk_rows = chunk_rows
+		self.columns = columns
+
+	def run(self):
+		started = time.perf_counter()
+		try:
+			n_rows = export_factor_scores(
+				self.fa, self.evaluations, self.file_name, self.file_format, self.chunk_rows, self.columns)
+		except Exception as error:
+			# Any failure must be reported, or the export thread would never be released
+			self.failed.emit(f"{self.file_name}: {type(error).__name__}: {error}")
+		else:
+			self.finished.emit(
+				f"Factor scores of {n_rows} evaluators written to {self.file_name} "
+				f"in {time.perf_counter() - started:.3f} seconds")
+		finally:
+			self.thread().quit()
+
+
 class MyTextEditWrapper(TextIOWrapper):
 	def __init__(self, text_edit):
 		self.text_edit = text_edit
@@ -262,52 +308,63 @@ class ModifyValuesDialog(QtWidgets.QDialog):
 		return selected
 
 
-class MoveDialog(QDialog):
-	def __init__(self, title, value_title, options, parent=None):
+class LiveAdjustDialog(QDialog):
+	""" LiveAdjustDialog - a slider and a numeric entry for each adjustment, calling on_change
+		with the values of all of them whenever one changes so that a plot can follow along.
+		Sliders cover minimum to maximum in steps, while any value may be typed.
+	"""
+	def __init__(self, title, adjustments, on_change, steps=1, parent=None):
 		super().__init__(parent)
 
 		self.setWindowTitle(title)
-		self.setFixedWidth(400)
-		self.group = QVBoxLayout()
-		self.input_group = QHBoxLayout()
-		self.button_group = QHBoxLayout()
-		self.main_layout = QVBoxLayout()
-
-		self.selected_option = None
-		self.options = options
-		self.decimal_input = QDoubleSpinBox()
-		self.decimal_input.setRange(-sys.float_info.max, sys.float_info.max)
-
-		for option in options:
-			rb = QRadioButton(option)
-			rb.toggled.connect(self.updateSelectedOption)
-			self.group.addWidget(rb)
-
-		self.input_group.addWidget(QLabel(value_title))
-		self.input_group.addWidget(self.decimal_input)
-		self.group.addLayout(self.input_group)
+		self.setMinimumWidth(400)
+		layout = QVBoxLayout(self)
 
-		ok_button = QPushButton("OK")
-		ok_button.clicked.connect(self.accept)
-		cancel_button = QPushButton("Cancel")
-		cancel_button.clicked.connect(self.reject)
-		self.button_group.addWidget(ok_button)
-		self.button_group.addWidget(cancel_button)
-		self.group.addLayout(self.button_group)
+		# Sliders move in whole steps; steps per unit sets the resolution
+		self.steps = steps
+		self.on_change = on_change
+		self.sliders = []
+		self.entries = []
+		for label, minimum, maximum in adjustments:
+			row = QHBoxLayout()
+			slider = QSlider(Qt.Horizontal)
+			slider.setRange(round(minimum * steps), round(maximum * steps))
+			slider.setValue(0)
+			entry = QDoubleSpinBox()
+			entry.setRange(-sys.float_info.max, sys.float_info.max)
+			entry.setDecimals(2)
+			entry.setSingleStep(1 / steps)
+			entry.setKeyboardTracking(False)
+			entry.setValue(0.0)
+			slider.valueChanged.connect(lambda position, entry=entry: self.slid(entry, position))
+			entry.valueChanged.connect(lambda value, slider=slider: self.typed(slider, value))
+			row.addWidget(QLabel(label))
+			row.addWidget(slider)
+			row.addWidget(entry)
+			layout.addLayout(row)
+			self.sliders.append(slider)
+			self.entries.append(entry)
 
-		self.main_layout.addLayout(self.group)
-		self.setLayout(self.main_layout)
+		button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
+		button_box.accepted.connect(self.accept)
+		button_box.rejected.connect(self.reject)
+		layout.addWidget(button_box)
 
-	def updateSelectedOption(self, checked):
-		if checked:
-			sender = self.sender()
-			self.selected_option = self.options.index(sender.text())
+	def values(self):
+		return [entry.value() for entry in self.entries]
 
-	def getSelectedOption(self):
-		return self.selected_option
+	def slid(self, entry, position):
+		entry.blockSignals(True)
+		entry.setValue(position / self.steps)
+		entry.blockSignals(False)
+		self.on_change(self.values())
 
-	def getDecimalValue(self):
-		return self.decimal_input.value()
+	def typed(self, slider, value):
+		# A value beyond the slider's range leaves the slider at its end
+		slider.blockSignals(True)
+		slider.setValue(max(slider.minimum(), min(round(value * self.steps), slider.maximum())))
+		slider.blockSignals(False)
+		self.on_change(self.values())
 
 
 class SelectItemsDialog(QtWidgets.QDialog):
@@ -477,6 +534,141 @@ class SetValueDialog(QDialog):
 		return self.spin_box.value()
 
 
+class ArrayTableModel(QAbstractTableModel):
+	""" ArrayTableModel - presents a two dimensional array to a table view. Cells are
+		formatted only when the view asks for them and sorting reorders a row
+		permutation, so the array itself is never copied. With a diagonal, values are
+		the rows of a lower triangle, values[i - 1] holding the values below item i,
+		shown as the symmetric square without building it.
+	"""
+	def __init__(self, values, row_labels, column_labels, decimals=2, parent=None, diagonal=None):
+		super().__init__(parent)
+
+		self.values = values
+		self.row_labels = row_labels
+		self.column_labels = column_labels
+		self.decimals = decimals
+		self.diagonal = diagonal
+		if diagonal is None:
+			self.shape = values.shape
+			finite = np.isfinite(values)
+			self.low = float(np.min(values, where=finite, initial=np.inf))
+			self.high = float(np.max(values, where=finite, initial=-np.inf))
+		else:
+			self.shape = (len(row_labels), len(row_labels))
+			self.low = diagonal if np.isfinite(diagonal) else np.inf
+			self.high = diagonal if np.isfinite(diagonal) else -np.inf
+			for each_row in values[:self.shape[0] - 1]:
+				row = np.asarray(each_row, dtype=float)
+				finite = np.isfinite(row)
+				self.low = min(self.low, float(np.min(row, where=finite, initial=np.inf)))
+				self.high = max(self.high, float(np.max(row, where=finite, initial=-np.inf)))
+		self.order = np.arange(self.shape[0])
+
+	def value(self, row, column):
+		if self.diagonal is None:
+			return self.values[row, column]
+		if row == column:
+			return self.diagonal
+		return self.values[max(row, column) - 1][min(row, column)]
+
+	def column_values(self, column):
+		if self.diagonal is None:
+			return self.values[:, column]
+		# Above the diagonal the column is the row of the triangle below item column
+		above = np.asarray(self.values[column - 1], dtype=float) if column > 0 else np.empty(0)
+		below = np.fromiter(
+			(self.values[each_row - 1][column] for each_row in range(column + 1, self.shape[0])),
+			dtype=float, count=self.shape[0] - column - 1)
+		return np.concatenate((above, [self.diagonal], below))
+
+	def rowCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else self.shape[0]
+
+	def columnCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else self.shape[1]
+
+	def data(self, index, role=Qt.DisplayRole):
+		if not index.isValid():
+			return None
+		value = self.value(self.order[index.row()], index.column())
+		if role == Qt.DisplayRole:
+			return "" if np.isnan(value) else f"{value:.{self.decimals}f}"
+		if role == Qt.UserRole:
+			return float(value)
+		if role == Qt.TextAlignmentRole:
+			return int(Qt.AlignRight | Qt.AlignVCenter)
+		return None
+
+	def headerData(self, section, orientation, role=Qt.DisplayRole):
+		if role != Qt.DisplayRole:
+			return None
+		if orientation == Qt.Horizontal:
+			return str(self.column_labels[section])
+		label = self.row_labels[self.order[section]]
+		return " ".join(str(part) for part in label) if isinstance(label, tuple) else str(label)
+
+	def sort(self, column, order=Qt.AscendingOrder):
+		# A column of -1 restores the original order
+		self.layoutAboutToBeChanged.emit()
+		if column < 0:
+			self.order = np.arange(self.shape[0])
+		else:
+			self.order = np.argsort(self.column_values(column), kind="stable")
+			if order == Qt.DescendingOrder:
+				self.order = self.order[::-1]
+		self.layoutChanged.emit()
+
+
+class HeatmapDelegate(QStyledItemDelegate):
+	""" HeatmapDelegate - shades each cell from white at the lowest value in the model
+		to red at the highest before drawing its text.
+	"""
+	def paint(self, painter, option, index):
+		value = index.data(Qt.UserRole)
+		model = index.model()
+		if value is not None and np.isfinite(value) and model.high > model.low:
+			fade = int(255 * (model.high - value) / (model.high - model.low))
+			painter.fillRect(option.rect, QColor(255, fade, fade))
+		super().paint(painter, option, index)
+
+
+class ArrayTableDialog(QDialog):
+	def __init__(
+			self, title, values, row_labels, column_labels, decimals=2, heatmap=False, parent=None, diagonal=None):
+		super().__init__(parent)
+
+		self.setWindowTitle(title)
+		self.resize(700, 500)
+		layout = QVBoxLayout()
+
+		self.model = ArrayTableModel(values, row_labels, column_labels, decimals, self, diagonal)
+		view = QTableView()
+		view.setModel(self.model)
+		if heatmap:
+			self.delegate = HeatmapDelegate(view)
+			view.setItemDelegate(self.delegate)
+		# Rows start in their original order; clicking a heading sorts by that column
+		view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+		view.setSortingEnabled(True)
+		layout.addWidget(view)
+
+		button_box = QDialogButtonBox(QDialogButtonBox.Ok)
+		button_box.accepted.connect(self.accept)
+		layout.addWidget(button_box)
+		self.setLayout(layout)
+
+
+class TableDialog(ArrayTableDialog):
+	def __init__(self, title, frame, decimals=2, parent=None):
+		# Text columns become part of the row labels so the rest is one numeric array
+		text_columns = [column for column in frame.columns if not pd.api.types.is_numeric_dtype(frame[column])]
+		if text_columns:
+			frame = frame.set_index(text_columns, append=not isinstance(frame.index, pd.RangeIndex))
+		super().__init__(
+			title, frame.to_numpy(dtype=float), frame.index, frame.columns, decimals, parent=parent)
+
+
 class Status(QMainWindow):
 	"""Main Window."""
 	def __init__(self, parent=None):
@@ -496,6 +688,18 @@ class Status(QMainWindow):
 		# initialize undo_stack with any object to avoid warning when appending more objects
 		self.undo_stack_source: List[str] = ["Initialize"]
 		#
+		# Cost of commands - see start, complete and incomplete
+		#
+		self.session_started: float = time.perf_counter()
+		self.command_started: Dict = dict()
+		self.profile_next_command = False
+		self.profiler = None
+		self.export_thread = None
+		self.export_worker = None
+		self.live_canvas = None		# canvas on the Plot tab whose artists follow the active configuration
+		self.live_background = None
+		self.live_artists: List = []
+		#
 		# self.show_bisector = False
 		self.width: int = 0  # had been 8 in other class
 		self.decimals: int = 0  # had been 2 in other class
@@ -513,18 +717,18 @@ class Status(QMainWindow):
 		# list of commands
 		#
 		self.commands = (
-			"Alike", "Base", "Battleground", "Bisector", "Center", "Cluster", "Compare",
+			"Add points", "Alike", "Base", "Battleground", "Bisector", "Center", "Cluster", "Compare",
 			"Configuration", "Contest", "Convertibles", "Core supporters",
-			"Correlations", "Create", "Deactivate", "Differences", "Directions", "Distances",
+			"Correlations", "Create", "Crosstabs", "Deactivate", "Differences", "Directions", "Distances",
 			"Evaluations", "Exit", "Factor", "Grouped", "History", "Individual",
-			"Invert", "Joint", "Likely supporters", "Line of Sight", "MDS",
-			"Move", "Paired", "Plane", "Principal Components", "Print configuration",
+			"Invert", "Joint", "Likely supporters", "Line of Sight", "Matchups", "MDS",
+			"Move", "Nearest", "Open session", "Paired", "Plane", "Principal Components", "Print configuration",
 			"Print target", "Print grouped data", "Print correlations", "Print similarities",
-			"Print evaluations", "Ranks",
+			"Print evaluations", "Profile", "Ranks",
 			"Reference points", "Rescale", "Rotate", "Sample designer",
-			"Save configuration", "Save target", "Segment", "Settings",
+			"Save configuration", "Save factor scores", "Save session", "Save similarities", "Save target", "Segment", "Settings",
 			"Scores", "Scree", "Shepard", "Similarities", "Status",
-			"Stress", "Target", "Terse", "Undo", "Varimax", "Vectors", "Verbose",
+			"Stress", "Target", "Terse", "Trace", "Undo", "Varimax", "Vectors", "Verbose",
 			"View configuration", "View target", "View grouped data", "View correlations",
 			"View similarities", "View evaluations"
 		)
@@ -597,6 +801,111 @@ class Status(QMainWindow):
 
 		plt.close(fig)
 
+	def have_live_plot(self):
+		""" have live plot - tells whether the Plot tab still shows the live plot of the active
+			configuration, drawn with the same points and the same connector and bisector.
+		"""
+		artists = self.active.configuration_artists
+		points = artists.get("points")
+		return self.live_canvas is not None \
+			and self.plot_widget.widget() is self.live_canvas \
+			and points is not None and points.figure is self.live_canvas.figure \
+			and len(points.get_offsets()) == self.active.npoint \
+			and (artists["connector"] is not None) == self.active.show_connector \
+			and (artists["bisector"] is not None) == (self.active.have_bisector_info() and self.active.show_bisector)
+
+	def show_live_configuration(self):
+		""" show live configuration - shows the active configuration on the Plot tab. When the
+			live plot is already there its artists are moved to the new coordinates;
+			otherwise it is built once. Either way nothing is added to the Gallery.
+		"""
+		if self.active.ndim < 2:
+			return
+		if self.have_live_plot():
+			self.update_live_plot()
+		else:
+			self.build_live_plot()
+		self.show()
+		self.set_focus_on_tab(0)
+
+	def build_live_plot(self):
+		fig = self.active.plot_configuration()
+		canvas = FigureCanvas(fig)
+		width, height = int(fig.get_size_inches()[0] * fig.dpi), int(fig.get_size_inches()[1] * fig.dpi)
+		canvas.setFixedSize(width, height)
+		self.plot_widget.setWidget(canvas)
+		# Closing detaches the figure from its canvas on newer matplotlib; attach it again
+		plt.close(fig)
+		fig.set_canvas(canvas)
+		self.live_canvas = canvas
+		#
+		# Artists that move are animated, left out of full draws and blitted over the background
+		#
+		artists = self.active.configuration_artists
+		for artist in [artists["points"], artists["connector"], artists["bisector"], *artists["bisector_marks"]]:
+			if artist is not None:
+				artist.set_animated(True)
+		artists["labels"](animated=True)
+		canvas.mpl_connect("draw_event", self.live_plot_drawn)
+		self.update_live_plot(redraw=True)
+
+	def update_live_plot(self, redraw=False):
+		""" update live plot - moves the artists of the live plot to the current coordinates of
+			the active configuration and blits them over the saved background. The whole
+			plot is drawn again only when its limits or axis labels have changed.
+		"""
+		if not self.have_live_plot():
+			return
+		active = self.active
+		artists = active.configuration_artists
+		ax = artists["points"].axes
+		x = active.point_coords.iloc[:, active.hor_dim].to_numpy(dtype=float)
+		y = active.point_coords.iloc[:, active.vert_dim].to_numpy(dtype=float)
+		artists["points"].set_offsets(np.column_stack((x, y)))
+		moving = [artists["points"]]
+		if artists["connector"] is not None:
+			rivals = [active.rival_a, active.rival_b]
+			artists["connector"].set_data(x[rivals], y[rivals])
+			moving.append(artists["connector"])
+		if artists["bisector"] is not None:
+			active.connector_bisector_cross_x = (x[active.rival_a] + x[active.rival_b]) / 2
+			active.connector_bisector_cross_y = (y[active.rival_a] + y[active.rival_b]) / 2
+			active.ends_of_bisector_function()
+			artists["bisector"].set_data(
+				[active.bisector.start_x, active.bisector.end_x], [active.bisector.start_y, active.bisector.end_y])
+			positions = (
+				(active.bisector.start_x, active.bisector.start_y), (active.bisector.end_x, active.bisector.end_y),
+				(active.connector_bisector_cross_x, active.connector_bisector_cross_y))
+			for mark, position in zip(artists["bisector_marks"], positions):
+				mark.set_position(position)
+			moving += [artists["bisector"], *artists["bisector_marks"]]
+		#
+		limits = (active.hor_min, active.hor_max, active.vert_min, active.vert_max)
+		axis_labels = (active.dim_names[active.hor_dim], active.dim_names[active.vert_dim])
+		if tuple(ax.axis()) != limits or (ax.get_xlabel(), ax.get_ylabel()) != axis_labels:
+			ax.set_xlabel(axis_labels[0])
+			ax.set_ylabel(axis_labels[1])
+			ax.axis(limits)
+			redraw = True
+		self.live_artists = moving + artists["labels"](x, y)
+		#
+		if redraw or self.live_background is None:
+			self.live_canvas.draw()
+		else:
+			self.live_canvas.restore_region(self.live_background)
+			self.draw_live_artists()
+			self.live_canvas.blit(self.live_canvas.figure.bbox)
+
+	def live_plot_drawn(self, event):
+		# A full draw leaves out the animated artists; keep it as the background and add them
+		self.live_background = self.live_canvas.copy_from_bbox(self.live_canvas.figure.bbox)
+		self.draw_live_artists()
+
+	def draw_live_artists(self):
+		renderer = self.live_canvas.get_renderer()
+		for artist in self.live_artists:
+			artist.draw(renderer)
+
 	def conf_output(self):
 		title = "Configuration"
 		rows = 1 + len(self.active.point_names)
@@ -668,10 +977,16 @@ class Status(QMainWindow):
 		open_menu.addSeparator()
 		open_menu.addAction(self.open_evaluations_action)
 		open_menu.addAction(self.open_individuals_action)
+		open_menu.addSeparator()
+		open_menu.addAction(self.open_session_action)
 		#
 		save_menu = file_menu.addMenu("Save")
 		save_menu.addAction(self.save_configuration_action)
+		save_menu.addAction(self.save_similarities_action)
 		save_menu.addAction(self.save_target_action)
+		save_menu.addAction(self.save_factor_scores_action)
+		save_menu.addSeparator()
+		save_menu.addAction(self.save_session_action)
 		#
 		file_menu.addAction(self.deactivate_action)
 		file_menu.addSeparator()
@@ -711,7 +1026,10 @@ class Status(QMainWindow):
 		view_menu.addAction(self.view_grouped_action)
 		view_menu.addAction(self.view_similarities_action)
 		view_menu.addAction(self.view_correlations_action)
+		view_menu.addAction(self.view_evaluations_action)
 		view_menu.addAction(self.history_action)
+		view_menu.addAction(self.profile_action)
+		view_menu.addAction(self.trace_action)
 
 		# Transform menu
 		transform_menu = spaces_menu.addMenu("Transform")
@@ -746,6 +1064,7 @@ class Status(QMainWindow):
 		mds_menu = model_menu.addMenu("Multidimensional scaling")
 		mds_menu.addAction(self.mds_non_metric_action)
 		mds_menu.addAction(self.mds_metric_action)
+		model_menu.addAction(self.add_points_action)
 		model_menu.addSeparator()
 		model_menu.addAction(self.vectors_action)
 		model_menu.addAction(self.directions_action)
@@ -760,6 +1079,9 @@ class Status(QMainWindow):
 		respondents_menu.addAction(self.reference_action)
 		respondents_menu.addAction(self.contest_action)
 		respondents_menu.addAction(self.segments_action)
+		respondents_menu.addAction(self.crosstabs_action)
+		respondents_menu.addAction(self.matchups_action)
+		respondents_menu.addAction(self.nearest_action)
 		respondents_menu.addAction(self.core_action)
 		respondents_menu.addAction(self.base_action)
 		respondents_menu.addAction(self.like_action)
@@ -804,8 +1126,12 @@ class Status(QMainWindow):
 			"open_correlations": lambda: self.correlations_command(),
 			"open_evaluations": lambda: self.evaluations_command(),
 			"open_individuals": lambda: self.individuals_command(),
+			"open_session": lambda: self.open_session_command(),
 			"save_configuration": lambda: self.save_configuration_command(),
+			"save_similarities": lambda: self.save_similarities_command(),
 			"save_target": lambda: self.save_target_command(),
+			"save_factor_scores": lambda: self.save_factor_scores_command(),
+			"save_session": lambda: self.save_session_command(),
 			"deactivate": lambda: self.deactivate_command(),
 			"settings_plot": lambda: self.settings_command("plot"),
 			"settings_segment": lambda: self.settings_command("segment"),
@@ -826,7 +1152,10 @@ class Status(QMainWindow):
 			"view_grouped": lambda: self.view_grouped_command(),
 			"view_similarities": lambda: self.view_similarities_command(),
 			"view_correlations": lambda: self.view_correlations_command(),
+			"view_evaluations": lambda: self.view_evaluations_command(),
 			"history": lambda: self.history_command(),
+			"profile": lambda: self.profile_command(),
+			"trace": lambda: self.trace_command(),
 			"center": lambda: self.center_command(),
 			"move": lambda: self.move_command(),
 			"invert": lambda: self.invert_command(),
@@ -850,6 +1179,7 @@ class Status(QMainWindow):
 			"factor_analysis": lambda: self.factor_command(),
 			"mds_non_metric": lambda:  self.mds_command(False),
 			"mds_metric": lambda:  self.mds_command(True),
+			"add_points": lambda: self.add_points_command(),
 			"vectors": lambda: self.vectors_command(),
 			"directions": lambda: self.directions_command(),
 			"evaluations": lambda: self.evaluations_command(),
@@ -859,6 +1189,9 @@ class Status(QMainWindow):
 			"reference_points": lambda: self.reference_command(),
 			"contest": lambda: self.contest_command(),
 			"segments": lambda: self.segments_command(),
+			"crosstabs": lambda: self.crosstabs_command(),
+			"matchups": lambda: self.matchups_command(),
+			"nearest": lambda: self.nearest_command(),
 			"core": lambda: self.core_command(),
 			"base": lambda: self.base_command(),
 			"likely": lambda: self.likely_command(),
@@ -1089,11 +1422,15 @@ class Status(QMainWindow):
 			"Spaces_icons/spaces_evaluations_icon.jpg")), "Evaluations", self)
 		self.open_individuals_action = QAction(QIcon(os.path.join(self.basedir,
 			"Spaces_icons/spaces_individuals_icon.jpg")), "Individuals", self)
+		self.open_session_action = QAction("Session", self)
 		#
 		self.save_action = QAction("Save", self)
 		self.save_configuration_action = QAction(QIcon(os.path.join(self.basedir,
 			"Spaces_icons/spaces_filesave.png")), "Configuration", self)
+		self.save_similarities_action = QAction("Similarities", self)
 		self.save_target_action = QAction("Target", self)
+		self.save_factor_scores_action = QAction("Factor scores", self)
+		self.save_session_action = QAction("Session", self)
 		self.deactivate_action = QAction(QIcon(os.path.join(self.basedir,
 			"Spaces_icons/spaces_deactivate_icon.jpg")), "Deactivate", self)
 		# self.settings_action = QAction(QIcon(os.path.join(self.basedir,
@@ -1127,8 +1464,11 @@ class Status(QMainWindow):
 			"Spaces_icons/spaces_black_icon.jpg")), "Similarities", self)
 		self.view_correlations_action = QAction(QIcon(os.path.join(self.basedir,
 			"Spaces_icons/spaces_r_red_icon.jpg")), "Correlations", self)
+		self.view_evaluations_action = QAction("Evaluations", self)
 		self.history_action = QAction(QIcon(os.path.join(self.basedir,
 			"Spaces_icons/spaces_history_icon.jpg")), "History", self)
+		self.profile_action = QAction("Profile next command", self)
+		self.trace_action = QAction("Export command trace", self)
 		#
 		self.center_action = QAction(QIcon(os.path.join(self.basedir,
 			"Spaces_icons/spaces_center_icon.jpg")), "Center", self)
@@ -1171,6 +1511,7 @@ class Status(QMainWindow):
 		self.mds_non_metric_action = QAction(QIcon(os.path.join(self.basedir,
 			"Spaces_icons/spaces_MDS_icon.jpg")), "Non-metric", self)
 		self.mds_metric_action = QAction("Metric", self)
+		self.add_points_action = QAction("Add points", self)
 		self.vectors_action = QAction(QIcon(os.path.join(self.basedir,
 			"Spaces_icons/spaces_vectors_icon.jfif")), "Vectors", self)
 		self.directions_action = QAction(QIcon(os.path.join(self.basedir,
@@ -1189,6 +1530,9 @@ class Status(QMainWindow):
 			"Spaces_icons/spaces_contest_icon.jpg")), "Contest", self)
 		self.segments_action = QAction(QIcon(os.path.join(self.basedir,
 			"Spaces_icons/spaces_segments_icon.jpg")), "Segments", self)
+		self.crosstabs_action = QAction("Crosstabs", self)
+		self.matchups_action = QAction("Matchups", self)
+		self.nearest_action = QAction("Nearest of several", self)
 		self.core_action = QAction(QIcon(os.path.join(self.basedir,
 			"Spaces_icons/spaces_core_icon.jpg")), "Core supporters", self)
 		self.base_action = QAction(QIcon(os.path.join(self.basedir,
@@ -1227,9 +1571,13 @@ class Status(QMainWindow):
 		self.open_correlations_action.triggered.connect(lambda: self.traffic_control("open_correlations"))
 		self.open_evaluations_action.triggered.connect(lambda: self.traffic_control("open_evaluations"))
 		self.open_individuals_action.triggered.connect(lambda: self.traffic_control("open_individuals"))
+		self.open_session_action.triggered.connect(lambda: self.traffic_control("open_session"))
 		#
 		self.save_configuration_action.triggered.connect(lambda: self.traffic_control("save_configuration"))
+		self.save_similarities_action.triggered.connect(lambda: self.traffic_control("save_similarities"))
 		self.save_target_action.triggered.connect(lambda: self.traffic_control("save_target"))
+		self.save_factor_scores_action.triggered.connect(lambda: self.traffic_control("save_factor_scores"))
+		self.save_session_action.triggered.connect(lambda: self.traffic_control("save_session"))
 		self.deactivate_action.triggered.connect(lambda: self.traffic_control("deactivate"))
 		#
 		self.settings_plot_settings_action.triggered.connect(
@@ -1260,7 +1608,10 @@ class Status(QMainWindow):
 		self.view_grouped_action.triggered.connect(lambda: self.traffic_control("view_grouped"))
 		self.view_similarities_action.triggered.connect(lambda: self.traffic_control("view_similarities"))
 		self.view_correlations_action.triggered.connect(lambda: self.traffic_control("view_correlations"))
+		self.view_evaluations_action.triggered.connect(lambda: self.traffic_control("view_evaluations"))
 		self.history_action.triggered.connect(lambda: self.traffic_control("history"))
+		self.profile_action.triggered.connect(lambda: self.traffic_control("profile"))
+		self.trace_action.triggered.connect(lambda: self.traffic_control("trace"))
 		#
 		self.center_action.triggered.connect(lambda: self.traffic_control("center"))
 		self.move_action.triggered.connect(lambda: self.traffic_control("move"))
@@ -1290,6 +1641,7 @@ class Status(QMainWindow):
 		self.factor_analysis_action.triggered.connect(lambda: self.traffic_control("factor_analysis"))
 		self.mds_non_metric_action.triggered.connect(lambda: self.traffic_control("mds_non_metric"))
 		self.mds_metric_action.triggered.connect(lambda: self.traffic_control("mds_metric"))
+		self.add_points_action.triggered.connect(lambda: self.traffic_control("add_points"))
 		self.vectors_action.triggered.connect(lambda: self.traffic_control("vectors"))
 		self.directions_action.triggered.connect(lambda: self.traffic_control("directions"))
 		#
@@ -1301,6 +1653,9 @@ class Status(QMainWindow):
 		self.reference_action.triggered.connect(lambda: self.traffic_control("reference_points"))
 		self.contest_action.triggered.connect(lambda: self.traffic_control("contest"))
 		self.segments_action.triggered.connect(lambda: self.traffic_control("segments"))
+		self.crosstabs_action.triggered.connect(lambda: self.traffic_control("crosstabs"))
+		self.matchups_action.triggered.connect(lambda: self.traffic_control("matchups"))
+		self.nearest_action.triggered.connect(lambda: self.traffic_control("nearest"))
 		self.battleground_action.triggered.connect(lambda: self.traffic_control("battleground"))
 		self.like_action.triggered.connect(lambda: self.traffic_control("likely"))
 		self.convertible_action.triggered.connect(lambda: self.traffic_control("convertible"))
@@ -1363,6 +1718,64 @@ class Status(QMainWindow):
 
 	# -----------------------------------------------------------------------------
 
+	def add_points_command(self):
+		""" The Add points command places new stimuli into the active configuration from their
+			similarities to the existing points, leaving the existing points where they are.
+		"""
+		#
+		# Record use of Add points command
+		#
+		self.start("Add points")
+		#
+		# Explain what command does (if necessary)
+		#
+		self.active.explain("Add points")
+		#
+		# Handle improper order of commands
+		#
+		problem_detected = self.dependencies("Add points")
+		#
+		if problem_detected:
+			self.incomplete("Add points")
+			return
+		#
+		file_name = QFileDialog.getOpenFileName(caption="Open additional points", filter="*.txt")[0]
+		if len(file_name) == 0:
+			self.active.error("Empty response.",
+				"To add points select file in dialog.")
+			self.incomplete("Add points")
+			return
+		#
+		# Values are mapped to distances through the similarities, which must match the points
+		#
+		if self.active.have_similarities() and self.active.nreferent != self.active.npoint:
+			self.active.error(
+				"The similarities do not cover the points of the active configuration.",
+				"Open similarities for this configuration, or deactivate them, before adding points.")
+			self.incomplete("Add points")
+			return
+		#
+		problem_reading_file, labels, names, rows = self.active.read_additional_points(file_name)
+		if problem_reading_file:
+			self.incomplete("Add points")
+			return
+		#
+		self.active.add_points(labels, names, rows)
+		print(f"\n\t{len(labels)} points added; configuration now has {self.active.npoint} points")
+		#
+		self.active.max_and_min("Add points")
+		if self.active.ndim > 1:
+			fig = self.active.plot_configuration()
+			self.add_plot(fig)
+			self.show()
+			self.set_focus_on_tab(0)
+		#
+		self.complete("Add points")
+		#
+		return
+
+	# -----------------------------------------------------------------------------
+
 	def alike_command(self):
 		""" The Alike command - creates a plot with a line joining points with high similarity.
 		The Alike command is used to identify pairs of points with high similarity.
@@ -1660,10 +2073,11 @@ class Status(QMainWindow):
 	# ----------------------------------------------------------------------------------------------------------
 
 	def compare_command(self):
-		""" compare command - has not yet been implemented. It will be used to perform
-			target rotation to orient the target rotation to the closest approximation
-			of the active configuration.  It assumes the target has the same number of
-			points and dimensions as the active configuration.
+		""" compare command - performs Procrustes rotation to orient the target to the
+			closest approximation of the active configuration. Any number of dimensions
+			is supported and additional targets may be compared in the same pass.
+			It assumes the targets have the same number of points and dimensions as the
+			active configuration.
 		"""
 		#
 		# Potentially (alternatively) the role of the target may be the configuration
@@ -1708,29 +2122,74 @@ class Status(QMainWindow):
 			self.incomplete("Compare")
 			return
 
-		if self.active.ndim > 2:
-			self.active.error(
-				"Number of dimensions is larger than two.",
-				"Current version of Compare command is \nlimited to two dimensions."
-			)
 		#
-		# Create numpy arrays from point coords
+		# Ask which kind of transformation may be applied to the targets
 		#
-		active_in = np.array(self.active.point_coords)
-		target_in = np.array(self.target.point_coords)
+		title = "Compare configurations"
+		options_title = "Transformation of target"
+		options = ["Orthogonal (rotation only)", "Similarity (rotation and scaling)", "Oblique (any linear)"]
+		dialog = ChoseOptionDialog(title, options_title, options)
+		result = dialog.exec()
+		if result != QDialog.Accepted:
+			self.incomplete("Compare")
+			return
+		match dialog.selected_option:
+			case 0:
+				variant = "orthogonal"
+			case 1:
+				variant = "similarity"
+			case 2:
+				variant = "oblique"
+			case _:
+				self.incomplete("Compare")
+				return
+		#
+		# Optionally add further targets so they are all aligned in one pass
+		#
+		target_names = ["Target"]
+		targets_in = [np.array(self.target.point_coords)]
+		ui_files = QFileDialog.getOpenFileNames(
+			caption="Open additional targets (Cancel to use only the target)", filter="*.txt")
+		for file in ui_files[0]:
+			another_target = Configuration()
+			problem_reading_file = another_target.read_configuration_function(file)
+			if problem_reading_file:
+				self.incomplete("Compare")
+				return
+			if not (another_target.ndim == self.active.ndim and another_target.npoint == self.active.npoint):
+				self.active.error(
+					"Number of points or dimensions in " + os.path.basename(file) + " do not match.",
+					"Choose configurations with the same \nnumber of points and dimensions."
+				)
+				self.incomplete("Compare")
+				return
+			target_names.append(os.path.basename(file))
+			targets_in.append(np.array(another_target.point_coords))
 		#
-		print(f"{active_in = }")
-		print(f"{target_in = }")
+		# Align every target to the active configuration with a single batched SVD
 		#
-		# Rotate Active
+		active_in = np.array(self.active.point_coords)
+		try:
+			active_out, targets_out, disparities = self.active.procrustes_function(
+				active_in, np.stack(targets_in), variant)
+		except ValueError as error:
+			self.active.error(str(error) + ".", "Choose configurations whose points differ.")
+			self.incomplete("Compare")
+			return
 		#
-		active_out, target_out, disparity = procrustes(active_in, target_in)
+		print(f"\n\t{variant.capitalize()} Procrustes disparity in {self.active.ndim} dimensions:")
+		for each_name, each_disparity in zip(target_names, disparities):
+			print(f"\t\t{each_name:<30} {each_disparity:8.4f}")
+		if len(target_names) > 1:
+			closest = int(np.argmin(disparities))
+			print(f"\n\tClosest target: {target_names[closest]}")
 		#
-		print(f"Disparity = {disparity:8.4f}")
-		# print(f"{active_out = }")
-		# print(f"{target_out = }")
-		self.active.point_coords = pd.DataFrame(active_out, columns=self.active.dim_labels, index=self.active.point_names)
-		self.target.point_coords = pd.DataFrame(target_out, columns=self.active.dim_labels, index=self.active.point_names)
+		# The active and first target become the aligned pair shown in the plot
+		#
+		self.active.point_coords = pd.DataFrame(
+			active_out[0], columns=self.active.dim_labels, index=self.active.point_names)
+		self.target.point_coords = pd.DataFrame(
+			targets_out[0], columns=self.active.dim_labels, index=self.active.point_names)
 
 		print(f"Active configuration:")
 		print(self.active.point_coords)
@@ -1762,6 +2221,8 @@ class Status(QMainWindow):
 		self.active.command_exit_code[-1] = 0
 		self.spaces_statusbar.showMessage(f"Completed {command} command")
 		#
+		self.record_cost(command)
+		#
 
 		print(f"DEBUG -- in complete() {self.active.commands_used = }")
 		print(f"DEBUG -- in complete() {self.active.command_exit_code = }")
@@ -1793,7 +2254,6 @@ class Status(QMainWindow):
 		self.active.point_labels.clear()
 		self.active.point_names.clear()
 		self.active.point_coords = pd.DataFrame()
-		self.active.bisector.case = "Unknown"
 		self.active.distances.clear()
 		self.active.show_bisector = False
 		self.active.show_connector = False
@@ -2103,6 +2563,23 @@ class Status(QMainWindow):
 
 	# -------------------------------------------------------------------------------------
 
+	def cost_strings(self, index):
+		""" cost strings - formats the recorded cost of a command for the History command.
+		"""
+		if index >= len(self.active.command_costs):
+			return ["", "", "", ""]
+		cost = self.active.command_costs[index]
+		if "wall_seconds" not in cost:
+			return ["", "", "", f"{cost.get('undo_bytes', 0) / 2**20:.2f}"]
+		return [
+			f"{cost['wall_seconds']:.3f}",
+			f"{cost['cpu_seconds']:.3f}",
+			f"{cost['peak_rss_delta_bytes'] / 2**20:.1f}",
+			f"{cost['undo_bytes'] / 2**20:.2f}"
+		]
+
+	# ---------------------------------------------------------------------------
+
 	def create_command(self):
 		""" The Create command is used to build the active configuration.
 		"""
@@ -2621,6 +3098,69 @@ class Status(QMainWindow):
 
 	# -----------------------------------------------------------------------------------------------
 
+	def crosstabs_command(self):
+		""" The Crosstabs command shows weighted segment shares within categories of
+			individual variables.
+		"""
+		#
+		# Record use of Crosstabs command
+		#
+		self.start("Crosstabs")
+		#
+		# Explain what command does (if necessary)
+		#
+		self.active.explain("Crosstabs")
+		#
+		# Handle improper order of commands
+		#
+		problem_detected = self.dependencies("Crosstabs")
+		#
+		if problem_detected:
+			self.incomplete("Crosstabs")
+			return
+		#
+		# Get categorical variables and weight from user
+		#
+		title = "Break segments down by"
+		items = [str(each_var) for each_var in self.active.ind_vars.columns[1:]]
+		dialog = SelectItemsDialog(title, items)
+		if dialog.exec() != QDialog.Accepted:
+			self.incomplete("Crosstabs")
+			return
+		category_vars = dialog.selected_items()
+		del dialog
+		if len(category_vars) == 0:
+			self.active.error("No variables selected.",
+				"Select one or more variables to break segments down by.")
+			self.incomplete("Crosstabs")
+			return
+		weights = ["None"] + [
+			str(each_var) for each_var in self.active.ind_vars.select_dtypes("number").columns
+			if each_var not in category_vars]
+		weight_var, ok = QInputDialog.getItem(
+			self, "Crosstabs", "Weight individuals by", weights, current=0, editable=False)
+		if not ok:
+			self.incomplete("Crosstabs")
+			return
+		if weight_var == "None":
+			weight_var = None
+		#
+		if not self.active.have_segments():
+			self.active.assign_to_segments()
+		#
+		self.active.crosstab_vars = category_vars
+		self.active.crosstab_weight = weight_var
+		self.active.segment_crosstabs()
+		self.active.print_crosstabs()
+		#
+		self.set_focus_on_tab(4)
+		#
+		self.complete("Crosstabs")
+		#
+		return
+
+	# ---------------------------------------------------------------------------------------------------
+
 	def deactivate_command(self):
 		""" The Deactivate command is used to abandon the active
 			configuration, or existing similarities or correlations.
@@ -2715,6 +3255,7 @@ class Status(QMainWindow):
 					self.active.similarities_as_dict = dict()
 					self.active.similarities_as_list.clear()
 					self.active.similarities_as_square.clear()
+					self.active.similarities_duplicated = False
 					self.active.sorted_similarities = dict()
 					print("\n\tSimilarities have been abandoned.")
 				if items[checked_item] == "Reference points":
@@ -2736,6 +3277,7 @@ class Status(QMainWindow):
 				if items[checked_item] == "Evaluations":
 					print(f"DEBUG -- time to deactivate evaluations")
 					self.active.evaluations = pd.DataFrame()
+					self.active.factor_cache = dict()
 					print("\n\tEvaluations have been abandoned.")
 				if items[checked_item] == "Individual data":
 					print(f"DEBUG -- time to deactivate individual datas")
@@ -2760,10 +3302,10 @@ class Status(QMainWindow):
 		lower_cmd = command.lower()
 		#
 		if lower_cmd in [
-			"alike", "base", "bisector", "center", "cluster", "compare", "contest",
-			"convertible", "core", "differences", "directions", "distances", "first dimension",
+			"add points", "alike", "base", "bisector", "center", "cluster", "compare", "contest",
+			"convertible", "core", "crosstabs", "differences", "directions", "distances", "first dimension",
 			"grouped data", "invert", "joint", "likely supporters", "battleground",
-			"move", "paired", "plane", "plot", "print configuration", "ranks", "reference", "rescale",
+			"matchups", "move", "nearest", "paired", "plane", "plot", "print configuration", "ranks", "reference", "rescale",
 			"rotate", "save configuration", "scores", "second dimension", "segments",
 			"shepard", "stress", "varimax", "vectors", "view configuration",
 			"view grouped data"
@@ -2773,14 +3315,14 @@ class Status(QMainWindow):
 			if problem_detected:
 				n_problems += 1
 		if lower_cmd in [
-			"alike", "mds", "paired", "print similarities", "ranks", "scree",
+			"alike", "mds", "paired", "print similarities", "ranks", "save similarities", "scree",
 			"shepard", "stress", "view similarities"
 		]:
 			problem_detected = self.active.needs_similarities(command)
 			if problem_detected:
 				n_problems += 1
 		if lower_cmd in [
-			"base", "bisector", "contest", "convertible", "core", "first dimension",
+			"base", "bisector", "contest", "convertible", "core", "crosstabs", "first dimension",
 			"likely supporters", "battleground", "second dimension", "segments"
 		]:
 			problem_detected = self.active.needs_reference_points(command)
@@ -2790,7 +3332,7 @@ class Status(QMainWindow):
 			problem_detected = self.active.needs_correlations(command)
 			if problem_detected:
 				n_problems += 1
-		if lower_cmd in ["joint", "segments"]:
+		if lower_cmd in ["crosstabs", "joint", "matchups", "nearest", "segments"]:
 			problem_detected = self.active.needs_individual_data(command)
 			if problem_detected:
 				n_problems += 1
@@ -2802,7 +3344,7 @@ class Status(QMainWindow):
 			problem_detected = self.active.needs_ranks(command)
 			if problem_detected:
 				n_problems += 1
-		if lower_cmd in ["factor", "principal components", "print evaluations", "line of sight"]:
+		if lower_cmd in ["factor", "print evaluations", "line of sight", "view evaluations"]:
 			problem_detected = self.active.needs_evaluations(command)
 			if problem_detected:
 				n_problems += 1
@@ -3005,6 +3547,7 @@ class Status(QMainWindow):
 		# Set variables needed
 		#
 		self.active.evaluations = pd.DataFrame()
+		self.active.factor_cache = dict()
 		self.active.point_coords = pd.DataFrame()
 		all_names = []
 		#
@@ -3024,6 +3567,7 @@ class Status(QMainWindow):
 
 		#
 		self.active.evaluations = pd.read_csv(file)
+		self.active.factor_cache = dict()
 		#
 		self.active.evaluate()
 		#
@@ -3161,7 +3705,6 @@ class Status(QMainWindow):
 			self.active.point_labels.append(self.active.point_names[each_point][0:4])
 		self.active.rival_a = -1
 		self.active.rival_b = -1
-		self.active.bisector.case = "Unknown"
 		self.active.bisector.direction = "Unknown"
 		self.active.show_bisector = False
 		self.active.show_connector = False
@@ -3229,6 +3772,7 @@ class Status(QMainWindow):
 		# Set variables needed
 		#
 		self.active.fa = pd.DataFrame()
+		self.active.parallel_analysis_results = pd.DataFrame()
 		self.active.loadings = pd.DataFrame()
 		self.active.eigen = pd.DataFrame()
 		self.active.eigen_common = pd.DataFrame()
@@ -3248,9 +3792,27 @@ class Status(QMainWindow):
 		self.active.point_coords = pd.DataFrame()
 		self.active.distances = []
 		#
+		# Offer parallel analysis to suggest how many factors to extract
+		#
+		default = 1
+		options = ["Yes", "No"]
+		dialog = ChoseOptionDialog("Factor analysis", "Suggest number of factors by parallel analysis?", options)
+		if dialog.exec() != QDialog.Accepted:
+			self.incomplete("Factor")
+			return
+		if dialog.selected_option == 0:
+			if self.active.evaluations.shape[0] <= self.active.evaluations.shape[1]:
+				self.active.error("Parallel analysis needs more evaluators than items evaluated.",
+					"Enter the number of factors to extract.")
+			else:
+				suggested = self.active.parallel_analysis()
+				if suggested > 0:
+					default = suggested
+				print("\nParallel analysis: \n", self.active.parallel_analysis_results)
+				print(f"\n\tSuggested number of factors: {default}")
+		#
 		title = "Factor analysis"
 		label = "Number of factors to extract:"
-		default = 1
 		min = 1
 		max = self.active.nreferent
 		an_integer = True
@@ -3281,6 +3843,12 @@ class Status(QMainWindow):
 			self.active.hor_dim = 0
 			self.active.vert_dim = 1
 		#
+		# Fit neighbouring numbers of factors alongside so trying them again is immediate
+		#
+		self.active.factor_solutions([
+			n_factors for n_factors in (self.active.ndim - 1, self.active.ndim, self.active.ndim + 1)
+			if 1 <= n_factors < self.active.nreferent])
+		#
 		# factors and scores performs the actual factor analysis
 		#
 		# print(f"DEBUG -- about to call factor_and_scores {self.active.item_names = }")
@@ -3307,6 +3875,9 @@ class Status(QMainWindow):
 		xvals = range(1, self.active.evaluations.shape[1]+1)
 		ax.scatter(xvals, self.active.eigen)
 		ax.plot(xvals, self.active.eigen)
+		if not self.active.parallel_analysis_results.empty:
+			ax.plot(xvals, self.active.parallel_analysis_results.iloc[:, 2], "r--", label="Parallel analysis")
+			ax.legend()
 		ax.set_title('Scree Plot')
 		ax.set_xlabel('Factors')
 		ax.set_ylabel('Eigenvalue')
@@ -3319,14 +3890,9 @@ class Status(QMainWindow):
 		print(self.active.factor_variance)
 		print("\nUniquenesses: \n")
 		print(self.active.uniquenesses)
-		print("\nFactor Scores: \n")
+		print(f"\nFactor Scores of first {len(self.active.factor_scores)} evaluators: \n")
 		print(self.active.factor_scores)
-		#
-		# write out the factor scores
-		#
-		# print(f"DEBUG -- {self.active.point_labels = }")
-		#
-		self.active.factor_scores.to_csv("factor_scores.csv")
+		print("\n\tUse Save factor scores to write the scores of every evaluator")
 		#
 		self.complete("Factor")
 		#
@@ -3448,9 +4014,51 @@ class Status(QMainWindow):
 		self.active.point_codes_grpd.clear()
 		self.active.point_names_grpd.clear()
 		self.active.point_coords_grpd = pd.DataFrame()
+		self.active.ci_grpd = pd.DataFrame()
+		self.active.n_grpd = np.array([], dtype=int)
 		#
-		ui_file = QFileDialog.getOpenFileName(caption="Open grouped data", filter="*.txt")
-		file = ui_file[0]
+		# With individual data, groups can be computed rather than read
+		#
+		from_individuals = False
+		if not self.active.ind_vars.empty:
+			dialog = ChoseOptionDialog("Grouped", "Coordinates of groups from:", ["Grouped file", "Individual data"])
+			if dialog.exec() != QDialog.Accepted or dialog.selected_option is None:
+				self.incomplete("Grouped")
+				return
+			from_individuals = dialog.selected_option == 1
+		#
+		if from_individuals:
+			variables = [
+				each_var for each_var in self.active.var_names
+				if each_var not in (self.active.hor_axis_name, self.active.vert_axis_name)]
+			grouping_var, ok = QInputDialog.getItem(
+				self, "Grouped", "Group individuals by", variables, current=0, editable=False)
+			if not ok:
+				self.incomplete("Grouped")
+				return
+			options = ["Mean", "Median", "Weighted mean"]
+			dialog = ChoseOptionDialog("Grouped", "Locate each group at:", options)
+			if dialog.exec() != QDialog.Accepted or dialog.selected_option is None:
+				self.incomplete("Grouped")
+				return
+			statistic = options[dialog.selected_option]
+			weight_var = None
+			if statistic == "Weighted mean":
+				weight_var, ok = QInputDialog.getItem(
+					self, "Grouped", "Weight individuals by",
+					list(self.active.ind_vars.select_dtypes("number").columns), current=0, editable=False)
+				if not ok:
+					self.incomplete("Grouped")
+					return
+			dialog = SetValueDialog(
+				"Grouped", "Bootstrap replicates for 95% intervals (0 for none)", 0, 10000, True, 0)
+			if dialog.exec() != QDialog.Accepted:
+				self.incomplete("Grouped")
+				return
+			n_bootstrap = dialog.getValue()
+		else:
+			ui_file = QFileDialog.getOpenFileName(caption="Open grouped data", filter="*.txt")
+			file = ui_file[0]
 
 		#
 		# Ask user whether to show reference points
@@ -3504,12 +4112,17 @@ class Status(QMainWindow):
 				self.active.show_reference_points = False
 				self.active.show_bisector = False
 		#
-		problem_reading_file = self.active.read_grouped_data(file)
-		#
-		if problem_reading_file:
-			self.active.error("Problem reading grouped file.",
-							"Review file name and contents")
-			return
+		if from_individuals:
+			self.active.group_individuals(grouping_var, statistic, weight_var, n_bootstrap)
+			print(f"\n\tGroups were defined using {self.active.grouping_var} variable.\n")
+			print(pd.Series(self.active.n_grpd, index=self.active.point_names_grpd, name="Individuals"))
+		else:
+			problem_reading_file = self.active.read_grouped_data(file)
+			#
+			if problem_reading_file:
+				self.active.error("Problem reading grouped file.",
+								"Review file name and contents")
+				return
 		#
 		# Print grouped
 		#
@@ -3591,7 +4204,7 @@ class Status(QMainWindow):
 	# Set variables needed
 	#
 		line = "\n\t"
-		print("\n\tCommands used")
+		print("\n\tCommands used\t\tWall s\tCPU s\tPeak RSS + MB\tUndo MB")
 		range_commands_used = range(1, len(self.active.commands_used))
 		for i in range_commands_used:
 			line = line + self.active.commands_used[i] + "\t"
@@ -3601,12 +4214,15 @@ class Status(QMainWindow):
 				line = line + "Failed"
 			else:
 				line = line + "In process"
+			line = line + "\t" + "\t".join(self.cost_strings(i))
 			print(line)
 			line = "\t"
 	#
 		self.set_focus_on_tab(4)
 
-		table = QTableWidget(len(self.active.commands_used), 2)
+		table = QTableWidget(len(self.active.commands_used), 6)
+		table.setHorizontalHeaderLabels(
+			["Command", "Status", "Wall s", "CPU s", "Peak RSS + MB", "Undo MB"])
 		for i in range(len(self.active.commands_used)):
 			table.setItem(i, 0, QTableWidgetItem(self.active.commands_used[i]))
 			status = self.active.command_exit_code[i]
@@ -3617,6 +4233,8 @@ class Status(QMainWindow):
 			else:
 				status_str = "In process"
 			table.setItem(i, 1, QTableWidgetItem(status_str))
+			for each_column, each_string in enumerate(self.cost_strings(i)):
+				table.setItem(i, 2 + each_column, QTableWidgetItem(each_string))
 
 		# Write the table to the "output" tab, tab index 1, replacing anything now on that tab.
 
@@ -3656,6 +4274,8 @@ class Status(QMainWindow):
 		self.active.command_exit_code[-1] = 1
 		self.spaces_statusbar.showMessage(f"Unable to complete {command} command")
 		#
+		self.record_cost(command)
+		#
 		# eliminate last entry to undo stack
 		#
 		if not len(self.undo_stack) == 1:
@@ -3696,6 +4316,9 @@ class Status(QMainWindow):
 		self.active.vert_axis_name = "Unknown"
 		file = ""
 		self.active.ind_vars = pd.DataFrame()
+		self.active.segment_cache = dict()
+		self.active.crosstab_vars = []
+		self.active.crosstab_codes = dict()
 		#
 		var_docs = []
 		problem_reading_file = False
@@ -3829,10 +4452,7 @@ class Status(QMainWindow):
 		#
 		self.active.max_and_min("Invert")
 		if self.active.ndim > 1:
-			fig = self.active.plot_configuration()
-			self.add_plot(fig)
-			self.show()
-			self.set_focus_on_tab(0)
+			self.show_live_configuration()
 		#
 		# Update active configuration by returning new values
 		#
@@ -4099,6 +4719,69 @@ class Status(QMainWindow):
 
 	# ----------------------------------------------------------------------------------------------
 
+	def matchups_command(self):
+		""" The Matchups command estimates the segments of every pair of points as rivals.
+		"""
+		#
+		# Record use of Matchups command
+		#
+		self.start("Matchups")
+		#
+		# Explain what command does (if necessary)
+		#
+		self.active.explain("Matchups")
+		#
+		# Handle improper order of commands
+		#
+		problem_detected = self.dependencies("Matchups")
+		#
+		if problem_detected:
+			self.incomplete("Matchups")
+			return
+		#
+		if self.active.npoint < 2:
+			self.active.error("Matchups need at least two points.",
+				"Use a configuration with more points.")
+			self.incomplete("Matchups")
+			return
+		#
+		title = "Matchups"
+		options_title = "Most competitive pairs first by"
+		options = ["Closest likely margin", "Largest battleground"]
+		dialog = ChoseOptionDialog(title, options_title, options)
+		result = dialog.exec()
+		if result != QDialog.Accepted or dialog.selected_option is None:
+			self.incomplete("Matchups")
+			return
+		#
+		self.active.matchup_sweep()
+		if len(self.active.coincident_pairs) > 0:
+			print(
+				f"\n\t{len(self.active.coincident_pairs)} pairs of points at the same position were left out: " +
+				", ".join(f"{a_label}-{b_label}" for a_label, b_label in self.active.coincident_pairs))
+		#
+		if dialog.selected_option == 0:
+			ordered = self.active.matchups.sort_values("Margin", kind="stable")
+		else:
+			ordered = self.active.matchups.sort_values("Battleground", ascending=False, kind="stable")
+		#
+		print(f"\n\tMatchups of {len(ordered)} pairs, most competitive first:\n")
+		print(ordered.head(self.active.matchups_shown).round(1).to_string(index=False))
+		#
+		fig = self.active.plot_matchups()
+		self.add_plot(fig)
+		self.show()
+		self.set_focus_on_tab(4)
+		#
+		table = TableDialog("Matchups", ordered.set_index(["Left", "Right"]), decimals=1)
+		table.exec()
+		#
+		self.complete("Matchups")
+		#
+		return
+
+	# ---------------------------------------------------------------------------------------------------
+
 	def mds_command(self, metric_switch):
 		"""The MDS command performs non-metric multidimensional scaling on the active configuration.
 			An initial configuration and similarities have to have been established.
@@ -4210,39 +4893,31 @@ class Status(QMainWindow):
 			self.incomplete("Move")
 			return
 		#
-		self.active.bisector.case = "Unknown"
 		#
 		# Get parameters of configuration
 		#
-		# Ask user which dimension they want to move
+		# Ask user how far to move along each dimension, moving the live plot as the sliders move
 		#
-
-		app = QMainWindow()
-		title = "Select dimension and value for move"
-		value_title = "Value to add to all points on this dimension"
-		options = self.active.dim_names
-		dialog = MoveDialog(title, value_title, options)
-		result = dialog.exec()
-
-		# print(f"DEBUG -- {dialog.ok_button = }")
-
-		if result == QDialog.Accepted:
-			selected_option = dialog.selected_option
-			decimal_value = dialog.getDecimalValue()
-
-			# print(f"Accepted: Selected option: {selected_option}, Decimal value: {decimal_value}")
-		elif result == QDialog.Rejected:
-			# print(f"Rejected")
-			self.incomplete("Move")
-			return
-
-		if decimal_value == 0.0:
+		original = self.active.point_coords.copy()
+		self.active.max_and_min("Move")
+		self.show_live_configuration()
+		reach = max(self.active.hor_max, self.active.vert_max)
+
+		def preview(values):
+			self.active.point_coords = original.copy()
+			for each_dim, value in enumerate(values):
+				if value != 0.0:
+					self.active.move(each_dim, value)
+			self.update_live_plot()
+
+		dialog = LiveAdjustDialog(
+			"Value to add to all points on each dimension",
+			[(each_name, -reach, reach) for each_name in self.active.dim_names], preview, steps=100)
+		if dialog.exec() != QDialog.Accepted or not any(dialog.values()):
+			self.active.point_coords = original
+			self.update_live_plot()
 			self.incomplete("Move")
 			return
-
-		self.active.move(selected_option, decimal_value)
-		#
-		# Update active configuration by returning new values
 		#
 		# Print moved active configuration
 		#
@@ -4251,11 +4926,7 @@ class Status(QMainWindow):
 		# Show plot of active configuration
 		#
 		self.active.max_and_min("Move")
-		if self.active.ndim > 1:
-			fig = self.active.plot_configuration()
-			self.add_plot(fig)
-			self.show()
-			self.set_focus_on_tab(0)
+		self.show_live_configuration()
 		#
 		# Update active configuration by returning new values
 		#
@@ -4265,6 +4936,124 @@ class Status(QMainWindow):
 
 	# -----------------------------------------------------------------------------
 
+	def nearest_command(self):
+		""" The Nearest command assigns individuals to the nearest of several reference points.
+		"""
+		#
+		# Record use of Nearest command
+		#
+		self.start("Nearest")
+		#
+		# Explain what command does (if necessary)
+		#
+		self.active.explain("Nearest")
+		#
+		# Handle improper order of commands
+		#
+		problem_detected = self.dependencies("Nearest")
+		#
+		if problem_detected:
+			self.incomplete("Nearest")
+			return
+		#
+		title = "Select reference points"
+		items = self.active.point_names
+		dialog = SelectItemsDialog(title, items)
+		if dialog.exec() != QDialog.Accepted:
+			self.incomplete("Nearest")
+			return
+		selected_items = dialog.selected_items()
+		del dialog
+		if len(selected_items) < 2:
+			self.active.error("At least two reference points are needed.",
+				"Select two or more points.")
+			self.incomplete("Nearest")
+			return
+		refs = [self.active.point_names.index(each_item) for each_item in selected_items]
+		#
+		title = "Nearest"
+		options_title = "Regions to identify"
+		options = ["Nearest only", "With battleground", "With battleground and core"]
+		dialog = ChoseOptionDialog(title, options_title, options)
+		if dialog.exec() != QDialog.Accepted or dialog.selected_option is None:
+			self.incomplete("Nearest")
+			return
+		battleground = dialog.selected_option >= 1
+		core = dialog.selected_option == 2
+		#
+		self.active.nearest_segments(refs, battleground, core)
+		#
+		print("\n\tPercent of individuals by nearest reference point:\n")
+		print(self.active.nearest_pcts.round(1).to_string())
+		#
+		self.active.max_and_min("Nearest")
+		fig = self.active.plot_nearest()
+		self.add_plot(fig)
+		self.show()
+		self.set_focus_on_tab(0)
+		#
+		self.complete("Nearest")
+		#
+		return
+
+	# ---------------------------------------------------------------------------------------------------
+
+	def open_session_command(self):
+		""" The Open session command restores the active and target configurations, with
+			everything established for them, from a session file.
+		"""
+		#
+		# Record use of Open session command
+		#
+		self.start("Open session")
+		#
+		# Explain what command does (if necessary)
+		#
+		self.active.explain("Open session")
+		#
+		ui_file = QFileDialog.getOpenFileName(caption="Open session", filter="*.spaces")
+		file = ui_file[0]
+		if file == "":
+			self.active.error("No file selected",
+				"To open a session select file in dialog.")
+			self.incomplete("Open session")
+			return
+		#
+		started = time.perf_counter()
+		try:
+			configurations = read_session_file(file)
+		except (OSError, ValueError, KeyError) as error:
+			self.active.error("Problem reading session file.",
+				str(error))
+			self.incomplete("Open session")
+			return
+		#
+		# The restored active carries the history of the saved session, continue it
+		#
+		self.active = configurations["active"]
+		self.target = configurations["target"]
+		self.active.commands_used.append("Open session")
+		self.active.command_exit_code.append(-1)
+		self.active.command_costs.append({"undo_bytes": 0})
+		#
+		print(f"\n\tSession restored from {file} in {time.perf_counter() - started:.3f} seconds")
+		print("\n\tActive configuration has", self.active.ndim, "dimensions and", self.active.npoint, "points")
+		#
+		if self.active.have_active_configuration() and self.active.ndim > 1:
+			self.active.max_and_min("Open session")
+			fig = self.active.plot_configuration()
+			self.add_plot(fig)
+			self.show()
+			self.set_focus_on_tab(0)
+		else:
+			self.set_focus_on_tab(4)
+		#
+		self.complete("Open session")
+		#
+		return
+
+	# ---------------------------------------------------------------------------
+
 	def paired_command(self):
 		""" paired function - The paired command is used to get the interpoint distance and/or similarity
 			for pairs of points.
@@ -4335,6 +5124,7 @@ class Status(QMainWindow):
 		print("\tSecond point: ", self.active.point_labels[second_index], self.active.point_names[second_index])
 		key = str(self.active.point_labels[first_index] + "_" + self.active.point_labels[second_index])
 		#
+		self.active.require_duplicated_similarities()
 		print("\tSimilarity: ", self.active.similarities_as_square[first_index][second_index])
 		print("\tDistance: ", self.active.distances_as_dict[key])
 		# print(f"DEBUG -- {self.active.distances_as_list = }")
@@ -4348,6 +5138,22 @@ class Status(QMainWindow):
 
 	# ----------------------------------------------------------------------------
 
+	def peak_rss(self):
+		""" peak rss - returns the high-water mark of the resident set size in bytes,
+			or zero where the platform does not report it.
+		"""
+		if resource is None:
+			return 0
+		peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		#
+		# Linux reports kilobytes, macOS reports bytes
+		#
+		if sys.platform != "darwin":
+			peak = peak * 1024
+		return peak
+
+	# ---------------------------------------------------------------------------------
+
 	def plane_command(self):
 		""" The Plane command allows the user to specify which dimensions
 			to use for the horizontal and vertical axes.
@@ -4470,10 +5276,7 @@ class Status(QMainWindow):
 		#
 		self.active.max_and_min("Plane")
 		if self.active.ndim > 1:
-			fig = self.active.plot_configuration()
-			self.add_plot(fig)
-			self.show()
-			self.set_focus_on_tab(0)
+			self.show_live_configuration()
 		#
 		self.complete("Plane")
 		#
@@ -4551,30 +5354,80 @@ class Status(QMainWindow):
 		self.active.point_names = []
 		self.active.point_labels = []
 		#
+		# Without evaluations in memory, stream them from a file in chunks
+		#
+		options = ["Exact", "Randomized", "Chunked covariance"]
+		if self.active.have_evaluations():
+			dialog = ChoseOptionDialog("Principal components", "Method:", options)
+			if dialog.exec() != QDialog.Accepted or dialog.selected_option is None:
+				self.incomplete("Principal components")
+				return
+			method = options[dialog.selected_option]
+			item_names = list(self.active.evaluations.columns)
+		else:
+			file = QFileDialog.getOpenFileName(caption="Stream evaluations", filter="*.csv")[0]
+			if len(file) == 0:
+				self.active.error("Empty response.",
+					"To stream evaluations select file in dialog.")
+				self.incomplete("Principal components")
+				return
+			method = options[2]
+			item_names = list(pd.read_csv(file, nrows=0).columns)
+			self.active.item_names = item_names
+		#
+		dialog = SetValueDialog(
+			"Principal components", "Number of components:", 1, len(item_names), True, min(2, len(item_names)))
+		if dialog.exec() != QDialog.Accepted:
+			self.incomplete("Principal components")
+			return
+		n_components = dialog.getValue()
+		#
 		# Perform principal components analysis
 		#
-		X_pca = self.active.evaluations
-
-		pca_transformer = PCA(n_components=2, copy=True, random_state=0)
-		print("\n\t", pca_transformer)
-		X_pca_transformed = pca_transformer.fit_transform(X_pca)
-		print("X_pca_transformed.shape: ", X_pca_transformed.shape)
-
 		pd.set_option('display.max_columns', None)
 		pd.set_option('display.precision', 2)
 		pd.set_option('display.max_colwidth', 300)
-		components = pd.DataFrame(pca_transformer.components_,
-			index=pca_transformer.get_feature_names_out(), columns=self.active.item_names)
-
-		x_pca_trans = pd.DataFrame(X_pca_transformed, columns=pca_transformer.get_feature_names_out())
-		print("X_pca_Trans: \n", x_pca_trans)
-		print("pca_transformer.get_params(): \n", pca_transformer.get_params())
-		print("pca_transformer.get_feature_names_out(): ", pca_transformer.get_feature_names_out())
-		#  print("Get_covariance: ", transformer.get_covariance())
-		self.active.pca_covar = pd.DataFrame(pca_transformer.get_covariance(),
-					columns=self.active.item_names, index=self.active.item_names)
+		#
+		if method == "Chunked covariance":
+			if self.active.have_evaluations():
+				rows = self.active.pca_chunk_rows
+				chunks = (
+					self.active.evaluations.iloc[start:start + rows]
+					for start in range(0, self.active.evaluations.shape[0], rows))
+			else:
+				chunks = pd.read_csv(file, chunksize=self.active.pca_chunk_rows)
+			components = self.active.principal_components_chunked(chunks, n_components, item_names)
+			if components is None:
+				self.incomplete("Principal components")
+				return
+		else:
+			X_pca = self.active.evaluations
+
+			pca_transformer = PCA(
+				n_components=n_components, copy=True, random_state=0,
+				svd_solver="randomized" if method == "Randomized" else "full")
+			print("\n\t", pca_transformer)
+			X_pca_transformed = pca_transformer.fit_transform(X_pca)
+			print("X_pca_transformed.shape: ", X_pca_transformed.shape)
+
+			components = pd.DataFrame(pca_transformer.components_,
+				index=pca_transformer.get_feature_names_out(), columns=item_names)
+
+			x_pca_trans = pd.DataFrame(X_pca_transformed, columns=pca_transformer.get_feature_names_out())
+			print("X_pca_Trans: \n", x_pca_trans)
+			print("pca_transformer.get_params(): \n", pca_transformer.get_params())
+			print("pca_transformer.get_feature_names_out(): ", pca_transformer.get_feature_names_out())
+			#  print("Get_covariance: ", transformer.get_covariance())
+			self.active.pca_covar = pd.DataFrame(pca_transformer.get_covariance(),
+						columns=item_names, index=item_names)
+			self.active.pca_explained = pd.DataFrame({
+				"Variance": pca_transformer.explained_variance_,
+				"Proportion": pca_transformer.explained_variance_ratio_
+			}, index=components.index)
+			self.active.pca_explained["Cumulative"] = self.active.pca_explained["Proportion"].cumsum()
 
 		print("PCA Covariance: \n", self.active.pca_covar)
+		print("\nExplained variance: \n", self.active.pca_explained)
 
 		transpose = components.transpose()
 		print("\nTranspose: \n", transpose)
@@ -4601,7 +5454,6 @@ class Status(QMainWindow):
 			# print(f"DEBUG -- {each_point = }")
 			self.active.point_names.append(trans.index[each_point])
 			self.active.point_labels.append(self.active.point_names[each_point][0:4])
-		self.active.bisector.case = "Unknown"
 		self.active.distances.clear()
 		self.active.point_coords = pd.DataFrame(trans)
 		print("\nPoint_coords: \n", self.active.point_coords)
@@ -4614,6 +5466,10 @@ class Status(QMainWindow):
 			self.show()
 			self.set_focus_on_tab(0)
 		#
+		fig = self.active.plot_explained_variance()
+		self.add_plot(fig)
+		self.show()
+		#
 		# Display scree diagram showing eigenvalues by dimensionality
 		#
 		# Ask user how many dimensions to be retained
@@ -4854,6 +5710,33 @@ class Status(QMainWindow):
 		return None
 	# ---------------------------------------------------------------------------
 
+	def profile_command(self):
+		""" The Profile command attaches the profiler to the next command. When that
+			command finishes the most expensive functions are listed.
+		"""
+		#
+		# Record use of Profile command
+		#
+		self.start("Profile")
+		#
+		# Explain what command does (if necessary)
+		#
+		self.active.explain("Profile")
+		#
+		self.profile_next_command = not self.profile_next_command
+		if self.profile_next_command:
+			print("\n\tThe next command will be profiled.")
+		else:
+			print("\n\tProfiling has been cancelled.")
+		#
+		self.set_focus_on_tab(4)
+		#
+		self.complete("Profile")
+		#
+		return
+
+	# ---------------------------------------------------------------------------------------------------------
+
 	def ranks_command(self):
 		""" The Ranks command computes the ranks of the similarities and distances.
 			It creates a plot showing the rank of the similarity against the rank of the
@@ -4889,6 +5772,32 @@ class Status(QMainWindow):
 
 	# ---------------------------------------------------------------------------------------------------------
 
+	def record_cost(self, command):
+		""" record cost - fills in the cost of the command begun by start: wall time,
+			CPU time, growth of the peak resident set size and the size of the undo
+			snapshot. Stops the profiler if it was attached to this command.
+		"""
+		#
+		if self.profiler is not None:
+			self.profiler.disable()
+			print(f"\n\tProfile of {command} command:")
+			pstats.Stats(self.profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(25)
+			self.profiler = None
+			self.profile_next_command = False
+		#
+		if len(self.command_started) == 0:
+			return
+		cost = self.active.command_costs[-1]
+		cost["start_seconds"] = self.command_started["wall"] - self.session_started
+		cost["wall_seconds"] = time.perf_counter() - self.command_started["wall"]
+		cost["cpu_seconds"] = time.process_time() - self.command_started["cpu"]
+		cost["peak_rss_delta_bytes"] = self.peak_rss() - self.command_started["peak_rss"]
+		self.command_started = dict()
+		#
+		return
+
+	# ---------------------------------------------------------------------------------------------------------
+
 	def redo_command(self):
 		""" The Redo command has yet to be implemented.
 		"""
@@ -4964,7 +5873,6 @@ class Status(QMainWindow):
 		self.active.bisector.start_y = 0.0
 		self.active.bisector.intercept = 0.0
 		self.active.bisector.direction = "Unknown"
-		self.active.bisector.case = "Unknown"
 		#
 		self.active.print_active_function()
 		#
@@ -5076,7 +5984,6 @@ class Status(QMainWindow):
 		#
 		# Set needed variables
 		#
-		self.active.bisector.case = "Unknown"
 		#
 		# Ask user which dimension they want to rescale
 		#
@@ -5148,10 +6055,7 @@ class Status(QMainWindow):
 		#
 		self.active.max_and_min("Rescale")
 		if self.active.ndim > 1:
-			fig = self.active.plot_configuration()
-			self.add_plot(fig)
-			self.show()
-			self.set_focus_on_tab(0)
+			self.show_live_configuration()
 		#
 		self.complete("Rescale")
 		#
@@ -5170,7 +6074,6 @@ class Status(QMainWindow):
 		#
 		# Define needed variables
 		#
-		self.active.bisector.case = "Unknown"
 		#
 		# Explain what command does (if necessary)
 		#
@@ -5184,42 +6087,24 @@ class Status(QMainWindow):
 			self.incomplete("Rotate")
 			return
 		#
-		# Get degrees to rotate configuration
+		# Get degrees to rotate configuration, rotating the live plot as the slider moves
 		#
-		title = "Degree to rotate configuration"
-		label = f"Positive is counter-clockwise\nNegative is clockwise"
-		min = -360
-		max = 360
-		default = 0
-		an_integer = True
-
-		app = QMainWindow()
-
-		# Create an instance of the SetValueDialog class
-		dialog = SetValueDialog(title, label, min, max, an_integer, default)
-
-		# Show the dialog and retrieve the selected value
-		result = dialog.exec()
-		if result == QDialog.Accepted:
-			deg = dialog.getValue()
-			# print(f"DEBUG -- Selected value: {deg}")
-		else:
-			# print("DEBUG -- Dialog canceled or closed")
-			self.incomplete("Rotate")
-			return
-
-		if deg == 0:
+		original = self.active.point_coords.copy()
+		self.active.max_and_min("Rotate")
+		self.show_live_configuration()
+
+		def preview(values):
+			# Positive is counter-clockwise, negative is clockwise
+			self.active.point_coords = original.copy()
+			self.active.rotate(math.radians(values[0]))
+			self.update_live_plot()
+
+		dialog = LiveAdjustDialog("Degrees to rotate configuration", [("Degrees", -180, 180)], preview)
+		if dialog.exec() != QDialog.Accepted or dialog.values()[0] == 0:
+			self.active.point_coords = original
+			self.update_live_plot()
 			self.incomplete("Rotate")
 			return
-
-		#
-		# Convert degrees to radians
-		#
-		radians = math.radians(float(deg))
-		#
-		# Rotate current plane of active configuration by user supplied value transformed to radians
-		#
-		self.active.rotate(radians)
 		#
 		# Print rotated active configuration
 		#
@@ -5228,11 +6113,7 @@ class Status(QMainWindow):
 		# Show plot of active configuration
 		#
 		self.active.max_and_min("Rotate")
-		if self.active.ndim > 1:
-			fig = self.active.plot_configuration()
-			self.add_plot(fig)
-			self.show()
-			self.set_focus_on_tab(0)
+		self.show_live_configuration()
 		#
 		self.complete("Rotate")
 		#
@@ -5330,7 +6211,8 @@ class Status(QMainWindow):
 		#
 		# Write file
 		#
-		problem_writing_file = self.active.write(file_name)
+		problem_writing_file = self.active.write(
+			file_name, binary=self.active.npoint >= self.active.binary_companion_points)
 
 		#
 		if problem_writing_file:
@@ -5352,6 +6234,174 @@ class Status(QMainWindow):
 
 	# ---------------------------------------------------------------------------
 
+	def save_factor_scores_command(self):
+		"""The Save factor scores command writes the factor scores of every evaluator
+			to a file, in the background.
+		"""
+		#
+		# Record use of Save factor scores command
+		#
+		self.start("Save factor scores")
+		#
+		# Explain what command does (if needed)
+		#
+		self.active.explain("Save factor scores")
+		#
+		if not isinstance(self.active.fa, FactorAnalyzer):
+			self.active.error("No factor analysis has been performed.",
+				"Use Factor command before Save factor scores.")
+			self.incomplete("Save factor scores")
+			return None
+		if self.export_thread is not None and self.export_thread.isRunning():
+			self.active.error("Factor scores are still being written.",
+				"Wait for the current export to finish.")
+			self.incomplete("Save factor scores")
+			return None
+		#
+		# Formats offered, with their file extensions
+		#
+		formats = {"Compressed CSV": ("csv", ".csv.gz"), "NumPy array": ("npy", ".npy")}
+		if pq is not None:
+			formats["Parquet"] = ("parquet", ".parquet")
+		options = list(formats)
+		dialog = ChoseOptionDialog("Save factor scores", "Format:", options)
+		if dialog.exec() != QDialog.Accepted or dialog.selected_option is None:
+			self.incomplete("Save factor scores")
+			return None
+		file_format, extension = formats[options[dialog.selected_option]]
+		#
+		file_name, _ = QFileDialog.getSaveFileName(caption="Save factor scores", filter=f"*{extension}")
+		if len(file_name) == 0:
+			self.active.error("Empty response.",
+				"")
+			self.incomplete("Save factor scores")
+			return None
+		if not file_name.endswith(extension):
+			file_name = file_name + extension
+		#
+		# Score and write in a worker thread, reporting back through signals
+		#
+		self.export_worker = ScoresExportWorker(
+			self.active.fa, self.active.evaluations, file_name, file_format,
+			self.active.factor_score_chunk_rows, list(self.active.dim_names))
+		self.export_thread = QThread()
+		self.export_worker.moveToThread(self.export_thread)
+		self.export_thread.started.connect(self.export_worker.run)
+		self.export_worker.finished.connect(self.factor_scores_written)
+		self.export_worker.failed.connect(self.factor_scores_failed)
+		self.export_worker.finished.connect(self.export_thread.quit)
+		self.export_worker.failed.connect(self.export_thread.quit)
+		self.export_thread.start()
+		#
+		print(f"\n\tWriting factor scores to {file_name} in the background")
+		#
+		self.set_focus_on_tab(4)
+		#
+		self.complete("Save factor scores")
+		#
+		return None
+
+	# ---------------------------------------------------------------------------
+
+	def factor_scores_written(self, message):
+		print(f"\n\t{message}")
+
+	# ---------------------------------------------------------------------------
+
+	def factor_scores_failed(self, message):
+		self.active.error("Problem writing factor scores.",
+			message)
+
+	# ---------------------------------------------------------------------------
+
+	def save_session_command(self):
+		"""The Save session command writes the active and target configurations, with
+			everything established for them, to a session file.
+		"""
+		#
+		# Record use of Save session command
+		#
+		self.start("Save session")
+		#
+		# Explain what command does (if needed)
+		#
+		self.active.explain("Save session")
+		#
+		file_name, _ = QFileDialog.getSaveFileName(caption="Save session", filter="*.spaces")
+		if len(file_name) == 0:
+			self.active.error("Empty response.",
+				"")
+			self.incomplete("Save session")
+			return None
+		#
+		started = time.perf_counter()
+		try:
+			n_bytes = write_session_file(file_name, {"active": self.active, "target": self.target})
+		except Exception as error:
+			self.active.error("Problem writing file.",
+				f"{type(error).__name__}: {error}")
+			self.incomplete("Save session")
+			return None
+		#
+		print(
+			f"\n\tThe session ({n_bytes / 2**20:.1f} MB) has been written to: {file_name} " +
+			f"in {time.perf_counter() - started:.3f} seconds")
+		#
+		self.set_focus_on_tab(4)
+		#
+		self.complete("Save session")
+		#
+		return None
+
+	# ---------------------------------------------------------------------------
+
+	def save_similarities_command(self):
+		""" The Save similarities command writes the similarities to a file in lower triangular form.
+		"""
+		#
+		# Record use of Save similarities command
+		#
+		self.start("Save similarities")
+		#
+		# Explain what command does (if necessary)
+		#
+		self.active.explain("Save similarities")
+		#
+		# Handle improper order of commands
+		#
+		problem_detected = self.dependencies("Save similarities")
+		#
+		if problem_detected:
+			self.incomplete("Save similarities")
+			return
+		#
+		file_name, _ = QFileDialog.getSaveFileName(caption="Save similarities")
+		if len(file_name) == 0:
+			self.active.error("Empty response.",
+				"")
+			self.incomplete("Save similarities")
+			return None
+		#
+		# Stream the triangle to the file a block of rows at a time
+		#
+		problem_writing_file = self.active.write_lower_triangle(
+			file_name, self.active.item_labels, self.active.item_names, self.active.similarities)
+		if problem_writing_file:
+			self.active.error("Problem writing file.",
+				"Check whether file can be written")
+			self.incomplete("Save similarities")
+			return None
+		#
+		print("\n\tThe similarities have been written to: ", file_name)
+		#
+		self.set_focus_on_tab(4)
+		#
+		self.complete("Save similarities")
+		#
+		return None
+
+	# ---------------------------------------------------------------------------
+
 	def save_target_command(self):
 		"""The Save target command is used to write a copy of the target
 			configuration to a file.
@@ -5924,6 +6974,16 @@ class Status(QMainWindow):
 
 			print(f"DEBUG -- {self.active.tolerance = }")
 			print(f"DEBUG -- {self.active.core_tolerance =}")
+			#
+			# Rebuild the lines from the new tolerances, only the segments they change are recomputed
+			#
+			if self.active.have_reference_points():
+				self.active.bisector_function(self.active.rival_a, self.active.rival_b)
+				self.active.set_line_case()
+				self.active.ends_of_bisector_function()
+				if self.active.have_individual_data():
+					self.active.assign_to_segments()
+					self.active.print_segments(4, 1)
 			#app.exec()
 
 		elif settings_group == "display":
@@ -6104,8 +7164,22 @@ class Status(QMainWindow):
 			# print(f"Rejected")
 			self.incomplete("Shepard")
 			return
+		#
+		# With many dyads offer a density plot which draws in a fraction of the time
+		#
+		density = False
+		if self.active.ndyad > self.active.shepard_raster_dyads:
+			title = "Shepard diagram"
+			options_title = f"There are {self.active.ndyad} pairs. Show them as:"
+			options = ["Density", "Individual pairs"]
+			dialog = ChoseOptionDialog(title, options_title, options)
+			result = dialog.exec()
+			if result != QDialog.Accepted:
+				self.incomplete("Shepard")
+				return
+			density = dialog.selected_option == 0
 
-		fig = self.active.plot_shep(axis)
+		fig = self.active.plot_shep(axis, density)
 		self.add_plot(fig)
 		self.show()
 		self.set_focus_on_tab(0)
@@ -6138,6 +7212,7 @@ class Status(QMainWindow):
 		self.active.similarities_as_dict = dict()
 		self.active.similarities_as_list.clear()
 		self.active.similarities_as_square.clear()
+		self.active.similarities_duplicated = False
 		self.active.sorted_similarities = dict()
 		self.active.a_item.clear()
 		self.active.b_item.clear()
@@ -6245,6 +7320,14 @@ class Status(QMainWindow):
 	def start(self, command):
 		#testing commit by editing this file
 		#
+		# Note the clocks and memory high-water mark before any work, including the undo copy
+		#
+		self.command_started = {
+			"wall": time.perf_counter(),
+			"cpu": time.process_time(),
+			"peak_rss": self.peak_rss()
+		}
+		#
 		# Update status bar
 		#
 		self.spaces_statusbar.showMessage(f"Starting {command} command")
@@ -6253,6 +7336,7 @@ class Status(QMainWindow):
 		#
 		self.active.commands_used.append(command)
 		self.active.command_exit_code.append(-1)			# -1 indicates command is in process
+		self.active.command_costs.append({"undo_bytes": 0})
 		#
 		# self.spaces_win.statusbar.showMessage(f"{command} started")
 		# print(f"DEBUG -- {self.active.commands_used = }")
@@ -6264,15 +7348,22 @@ class Status(QMainWindow):
 			"About", "Base", "Battleground", "Bisector", "Contest", "Convertibles", "Core supporters",
 			"Deactivate", "Differences", "Distances", "Exit", "Help", "History",
 			"Joint", "Likely supporters",
-			"Paired", "Ranks", "Sample designer", "Save configuration",
-			"Save target", "Shepard", "Status",
-			"Stress", "Terse", "Undo", "Verbose", "View configuration", "View grouped data",
-			"View correlations", "View similarities", "View target")
+			"Paired", "Profile", "Ranks", "Sample designer", "Save configuration",
+			"Save factor scores", "Save session", "Save similarities", "Save target", "Shepard", "Status",
+			"Stress", "Terse", "Trace", "Undo", "Verbose", "View configuration", "View grouped data",
+			"View correlations", "View evaluations", "View similarities", "View target")
 		# if self.active.have_active_configuration() \
 			# and command not in passive_commands:
 		if command not in passive_commands:
 			self.undo_stack.append(copy.deepcopy(self.active))
 			self.undo_stack_source.append(command)
+			self.active.command_costs[-1]["undo_bytes"] = self.undo_stack[-1].memory_footprint()
+		#
+		# Attach the profiler when it has been requested for this command
+		#
+		if self.profile_next_command and self.profiler is None and command != "Profile":
+			self.profiler = cProfile.Profile()
+			self.profiler.enable()
 		# range_undo = range(len(self.undo_stack))
 		# for each_object in range_undo:
 			# print(f"DEBUG -- {each_object = } {self.undo_stack[each_object] = }")
@@ -6337,7 +7428,8 @@ class Status(QMainWindow):
 	def stress_command(self):
 		""" The Stress command assesses point contribution to lack of fit.
 			The Stress command is used to identify points with high contribution to the lack
-			of fit. The user will be shown all the pairs that include a point in a plot
+			of fit. Each point's share of stress is shown in a table and a heatmap. The user
+			will be shown all the pairs that include a point in a plot
 			showing rank of similarity and rank of distance between the points.
 		"""
 		# print("DEBUG -- at top of stress_command")
@@ -6374,8 +7466,21 @@ class Status(QMainWindow):
 		sorted_dyads = self.active.df.sort_values(by='Squared_Difference', ascending=False)
 		worst_fit = sorted_dyads[["A", "B", "Similarity_Rank", "Distance_Rank", "Pct_of_Stress"]]
 		print(worst_fit.head(n=20))
-
-		# self.active.df.head(20).style.format({"A", "B", "Similarity_Rank", "Distance_Rank", "Pct_of_Stress": "{:20, 6.2f}"})
+		#
+		# Share of stress of every point at once
+		#
+		contributions = self.active.stress_decomposition()
+		print(f"\n\tKruskal stress-1: {self.active.kruskal_stress:.4f}")
+		print("\n\tContribution of each point to stress: \n")
+		print(contributions.to_string(float_format=lambda value: f"{value:8.2f}"))
+		#
+		fig = self.active.plot_stress_heatmap()
+		self.add_plot(fig)
+		self.show()
+		self.set_focus_on_tab(0)
+		#
+		dialog = TableDialog("Contribution to stress", contributions)
+		dialog.exec()
 
 		a_point = "None"
 		#
@@ -6394,6 +7499,12 @@ class Status(QMainWindow):
 			editable=False
 		)
 		#
+		# Decomposition has been shown, drilling down to a point is optional
+		#
+		if not ok:
+			self.complete("Stress")
+			return None
+		#
 		# get index of point
 		#
 		for each_point in self.active.range_points:
@@ -6498,6 +7609,67 @@ class Status(QMainWindow):
 
 	# ---------------------------------------------------------------------------
 
+	def trace_command(self):
+		""" The Trace command exports the cost of each command used in this session
+			as a Chrome trace file which can be opened in chrome://tracing or Perfetto.
+		"""
+		#
+		# Record use of Trace command
+		#
+		self.start("Trace")
+		#
+		# Explain what command does (if necessary)
+		#
+		self.active.explain("Trace")
+		#
+		file_name, _ = QFileDialog.getSaveFileName(caption="Save command trace", filter="*.json")
+		if len(file_name) == 0:
+			self.active.error("Empty response.",
+				"")
+			self.incomplete("Trace")
+			return
+		#
+		# One complete event per finished command, times in microseconds
+		#
+		events = []
+		for each_command, each_code, each_cost in zip(
+				self.active.commands_used, self.active.command_exit_code, self.active.command_costs):
+			if "wall_seconds" not in each_cost:
+				continue
+			events.append({
+				"name": each_command,
+				"cat": "command",
+				"ph": "X",
+				"ts": each_cost["start_seconds"] * 1e6,
+				"dur": each_cost["wall_seconds"] * 1e6,
+				"pid": os.getpid(),
+				"tid": 1,
+				"args": {
+					"exit_code": each_code,
+					"cpu_seconds": each_cost["cpu_seconds"],
+					"peak_rss_delta_bytes": each_cost["peak_rss_delta_bytes"],
+					"undo_bytes": each_cost["undo_bytes"]
+				}
+			})
+		try:
+			with open(file_name, "w") as file_handle:
+				json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file_handle, indent=1)
+		except OSError:
+			self.active.error("Problem writing file.",
+				file_name)
+			self.incomplete("Trace")
+			return
+		#
+		print(f"\n\tTrace of {len(events)} commands has been written to: ", file_name)
+		#
+		self.set_focus_on_tab(4)
+		#
+		self.complete("Trace")
+		#
+		return
+
+	# ---------------------------------------------------------------------------
+
 	def terse_command(self):
 		"""The Terse command toggles the include_explanation indicator to False.
 		"""
@@ -6732,9 +7904,10 @@ class Status(QMainWindow):
 		#
 		print("\n\tConfiguration has", self.active.ndim, "dimensions and", self.active.npoint, "points\n")
 		#
-		# Display configuration in printed form
+		# Display configuration in printed form, or in a table viewer when it is large
 		#
-		self.active.print_active_function()
+		if self.active.npoint <= self.active.print_rows_limit:
+			self.active.print_active_function()
 		#
 		# Show plot of active configuration
 		#
@@ -6747,6 +7920,12 @@ class Status(QMainWindow):
 			self.show()
 			self.set_focus_on_tab(0)
 		#
+		if self.active.npoint > self.active.print_rows_limit:
+			dialog = ArrayTableDialog(
+				"Configuration", self.active.point_coords.to_numpy(dtype=float),
+				self.active.point_coords.index, self.active.point_coords.columns, self.decimals)
+			dialog.exec()
+		#
 		self.complete("View configuration")
 		#
 		return
@@ -6824,8 +8003,14 @@ class Status(QMainWindow):
 		# Display correlations in printed form
 		#
 		# self.active.print_correlations_function()
-		self.active.print_lower_triangle(self.decimals, self.active.item_labels, self.active.item_names,
-			self.active.nreferent, self.active.correlations, self.width)
+		if self.active.nreferent <= self.active.print_rows_limit:
+			self.active.print_lower_triangle(self.decimals, self.active.item_labels, self.active.item_names,
+				self.active.nreferent, self.active.correlations, self.width)
+		else:
+			dialog = ArrayTableDialog(
+				"Correlations", self.active.correlations,
+				self.active.item_labels, self.active.item_labels, self.decimals, heatmap=True, diagonal=1.0)
+			dialog.exec()
 		#
 		self.set_focus_on_tab(4)
 		#
@@ -6835,6 +8020,47 @@ class Status(QMainWindow):
 	#
 	# -----------------------------------------------------------------------------
 
+	def view_evaluations_command(self):
+		""" The View evaluations command displays the active evaluations.
+		"""
+		#
+		# Record use of View evaluations command
+		#
+		self.start("View evaluations")
+		#
+		# Explain what command does (if necessary)
+		#
+		self.active.explain("View evaluations")
+		#
+		# Handle improper order of commands
+		#
+		problem_detected = self.dependencies("View evaluations")
+		#
+		if problem_detected:
+			self.incomplete("View evaluations")
+			return
+		#
+		(n_evaluators, n_items) = self.active.evaluations.shape
+		print(f"\n\tEvaluations of {n_items} items by {n_evaluators} evaluators")
+		#
+		# Display evaluations in printed form, or in a table viewer when there are many evaluators
+		#
+		if n_evaluators <= self.active.print_rows_limit:
+			print(self.active.evaluations)
+		else:
+			dialog = ArrayTableDialog(
+				"Evaluations", self.active.evaluations.to_numpy(dtype=float),
+				self.active.evaluations.index, self.active.evaluations.columns, self.decimals)
+			dialog.exec()
+		#
+		self.set_focus_on_tab(4)
+		#
+		self.complete("View evaluations")
+		#
+		return
+	#
+	# -----------------------------------------------------------------------------
+
 	def view_grouped_command(self):
 		#
 		# Record use of View grouped command
@@ -6902,10 +8128,16 @@ class Status(QMainWindow):
 		#
 		print("\n\tThe", self.active.value_type, "matrix has", self.active.nreferent, "items")
 		#
-		# Call print_lower_triangle	to print similarities
+		# Call print_lower_triangle	to print similarities, or show them in a table viewer when there are many
 		#
-		self.active.print_lower_triangle(
-			decimals, self.active.item_labels, self.active.item_names, self.active.nreferent, self.active.similarities, width)
+		if self.active.nreferent <= self.active.print_rows_limit:
+			self.active.print_lower_triangle(
+				decimals, self.active.item_labels, self.active.item_names, self.active.nreferent, self.active.similarities, width)
+		else:
+			dialog = ArrayTableDialog(
+				"Similarities", self.active.similarities,
+				self.active.item_labels, self.active.item_labels, decimals, heatmap=True, diagonal=np.nan)
+			dialog.exec()
 
 		# WARNING - DO NOT ALPHABETIZE ARGUMENT LIST, Order needed because this uses reusable function
 		#
@@ -6936,20 +8168,10 @@ class Line:
 		self.intercept: float = 0.0
 		self.direction = "Unknown"
 		#
-		self.goes_through_top = "Unknown"
-		self.goes_through_bottom = "Unknown"
-		self.goes_through_left_side = "Unknown"
-		self.goes_through_right_side = "Unknown"
-		self.case = "Unknown"
-		#
 		self.start_x: float = 0.0
 		self.start_y: float = 0.0
 		self.end_x: float = 0.0
 		self.end_y: float = 0.0
-		self.y_at_max_x: float = 0.0
-		self.y_at_min_x: float = 0.0
-		self.x_at_max_y: float = 0.0
-		self.x_at_min_y: float = 0.0
 
 
 class Polygon:
@@ -6991,10 +8213,19 @@ class Configuration:
 		self.second_down = Polygon()
 		self.commands_used: List[str] = ["Initialize"]  # Seeding commands_used and command_exit_code needed to avoid problem when active is deactivated
 		self.command_exit_code: List[int] = [0]
+		self.command_costs: List[Dict] = [dict()]		# wall, cpu, peak rss and undo snapshot size of each command
 		self.dim1 = pd.DataFrame()
 		self.dim2 = pd.DataFrame()
 		self.avg_eval = pd.DataFrame()
 		self.evaluations = pd.DataFrame()
+		self.factor_cache: Dict = dict()		# correlations of evaluations and factor solutions by number of factors
+		self.parallel_analysis_matrices: int = 1000		# random correlation matrices drawn by parallel analysis
+		self.parallel_analysis_results = pd.DataFrame()
+		self.factor_score_chunk_rows: int = 100000		# evaluators scored at a time by Save factor scores
+		self.factor_score_preview_rows: int = 20		# evaluators whose scores the Factor command shows
+		self.print_rows_limit: int = 50		# rows View commands print before opening a table viewer instead
+		self.pca_chunk_rows: int = 100000		# evaluations per chunk when principal components accumulate covariance
+		self.pca_explained = pd.DataFrame()
 
 		# from Refs class:
 		# Refs class contains several variables which are totally dependent on which items are selected as referents
@@ -7006,6 +8237,28 @@ class Configuration:
 		# segments
 		#
 		self.seg = pd.DataFrame()
+		self.segment_cache: Dict = dict()		# segment codes of each family keyed by the inputs they depend on
+		self.segment_dims: List[int] = [0, 1]		# dimensions segments are assigned in, plotted pair first
+		self.segment_normal = np.array([1.0, 0.0])		# unit connector direction in those, from left rival to right
+		self.region_levels: Dict = dict()		# projections of the west edge, bisector and east edge
+		self.region_normal = np.array([1.0, 0.0])		# the same direction within the plotted plane
+		self.region_plane_levels: Dict = dict()		# the levels within the plotted plane through the midpoint
+		self.matchup_chunk_cells: int = 4000000		# individuals times pairs tested at a time by Matchups
+		self.matchups_shown: int = 20		# pairs printed by Matchups
+		self.matchups = pd.DataFrame()
+		self.matchup_matrix = pd.DataFrame()
+		self.coincident_pairs = []		# pairs of points at the same position, left out of Matchups
+		self.crosstab_vars: List[str] = []		# individual variables segments are broken down by
+		self.crosstab_weight = None
+		self.crosstab_codes: Dict = dict()		# integer codes and categories of each variable
+		self.crosstabs: Dict = dict()
+		self.nearest_chunk_rows: int = 100000		# individuals assigned at a time by Nearest
+		self.nearest_refs: List[int] = []
+		self.nearest_battleground = False
+		self.nearest_core = False
+		self.nearest_core_radii = np.array([])
+		self.nearest_seg = pd.DataFrame()
+		self.nearest_pcts = pd.DataFrame()
 		#
 		self.core_radius: float = 0.0
 		# self.core_tolerance: float = 0.3
@@ -7032,6 +8285,8 @@ class Configuration:
 		self.dim1_div: float = 0.0
 		self.dim2_div: float = 0.0
 		self.tolerance: float = .25 	# Defines a battleground sector as a percent of connector on each side of bisector
+		self.binary_companion_points: int = 10000	# From this many points Save configuration also writes a .npy copy
+		self.shepard_raster_dyads: int = 50000	# Above this many dyads Shepard offers a density plot
 		self.vector_head_width: float = .05
 		self.vector_width: float = .01
 		#
@@ -7065,10 +8320,12 @@ class Configuration:
 		# from Groups
 		#
 		# Groups class defines the characteristics of a set of groups
+		self.ci_grpd = pd.DataFrame()		# bootstrap intervals when groups are computed from individuals
 		self.dim_labels_grpd: List[str] = []
 		self.dim_names_grpd: List[str] = []
 		self.file_handle: str = ""		# the handle of the grouped configuration file
 		self.grouping_var: str = ""
+		self.n_grpd = np.array([], dtype=int)		# individuals in each group computed from individuals
 		self.ndim_grpd: int = 0
 		self.npoint_grpd: int = 0
 		self.point_codes_grpd: List = []
@@ -7110,6 +8367,12 @@ class Configuration:
 		self.ndyad: int = 0
 		self.nreferent: int = 0
 		self.df = pd.DataFrame()  # Pandas data frame used for advanced computations on dyads
+		self.dyad_a_index = np.array([], dtype=int)	# item index of A in each row of df
+		self.dyad_b_index = np.array([], dtype=int)	# item index of B in each row of df
+		self.kruskal_stress: float = 0.0
+		self.stress_contributions = pd.DataFrame()
+		self.configuration_artists: Dict = dict()		# artists of the latest configuration plot, moved by the live plot
+		self.stress_matrix = np.array([])
 		self.ev = pd.DataFrame()  # Pandas data framer used for evaluations
 		self.range_items = []
 		self.range_items_less_one = []
@@ -7129,10 +8392,20 @@ class Configuration:
 		self.a_y_alike: List = []
 		self.b_x_alike: List = []
 		self.b_y_alike: List = []
+		self.alike_cut_point = 0
+		self.sorted_similarity_values = np.array([])
+		self.sorted_similarity_smaller = np.array([], dtype=int)
+		self.sorted_similarity_larger = np.array([], dtype=int)
+		self.similarities_duplicated = False		# whether the list, dictionary, sorted and square forms are current
 		self.best_stress: int = -1
 		self.n_comp: int = 0
 		self.use_metric = False
 		self.min_stress: List = []
+		self.mds_landmark_above: int = 2000		# stimuli beyond which MDS scales landmarks and places the rest
+		self.mds_landmarks: int = 300		# landmark stimuli scaled by landmark MDS
+		self.mds_refine_neighbors: int = 10		# nearest landmarks each point is refined against
+		self.mds_refine_iterations: int = 20		# stress majorization passes after placement, 0 for none
+		self.add_points_iterations: int = 30		# stress majorization passes placing points added by Add points
 
 		#
 		# -------------------------------------------------
@@ -7182,228 +8455,46 @@ class Configuration:
 		# print(f"DEBUG - at top of assign {self.east.start_y = }")
 		# print(f"DEBUG - at top of assign {self.west.start_y = }")
 		#
-		self.seg = pd.DataFrame(columns=[
-			"Dim1_score", "Dim2_score",
-			"Base", "Convertible", "Core", "Likely", "Battle_ground", "Only_Dim1", "Only_Dim2"])
-		pd.set_option('display.max_columns', 10)
-		#
-		# self.seg.pop()
-		#"Dim2_score",
-		#	"Dim1_score", "Base", "Convertible", "Core", "Likely", "Battle_ground", "Only_Dim1", "Only_Dim2")
-		# print(f"DEBUG in assign - \n {self.seg = }")
-		self.seg["Dim1_score"] = self.dim1
-		self.seg["Dim2_score"] = self.dim2
-		# print(f"DEBUG2 in assign - \n {self.seg = }")
-		#
-		# Determine base left and base right  segments -------------------------------------
-		#
-		for each_indiv in self.range_n_individ:
-			west_connector_cross_x = (
-					self.seg.loc[each_indiv, "Dim2_score"]
-					- self.west.intercept) \
-					/ self.west.slope
-			east_connector_cross_x = (
-					self.seg.loc[each_indiv, "Dim2_score"]
-					- self.east.intercept) \
-					/ self.east.slope
-			if self.bisector.direction == "Flat":
-				if self.seg.loc[each_indiv, "Dim2_score"] < self.west.start_y:
-					self.seg.loc[each_indiv, "Base"] = 1
-				elif self.east.start_y > self.seg.loc[each_indiv, "Dim2_score"] > self.west.start_y:
-					self.seg.loc[each_indiv, "Base"] = 2
-				else:
-					self.seg.loc[each_indiv, "Base"] = 3
-			#
-			if self.bisector.direction == "Vertical":
-				if self.seg.loc[each_indiv, "Dim1_score"] < self.west.start_x:
-					self.seg.loc[each_indiv, "Base"] = 1
-				elif self.seg.loc[each_indiv, "Dim1_score"] > self.east.start_x:
-					self.seg.loc[each_indiv, "Base"] = 3
-				else:
-					self.seg.loc[each_indiv, "Base"] = 2
-			#
-			elif self.bisector.direction == "Upward slope":
-				if self.seg.loc[each_indiv, "Dim1_score"] < west_connector_cross_x:
-					self.seg.loc[each_indiv, "Base"] = 1
-				elif east_connector_cross_x > self.seg.loc[each_indiv, "Dim1_score"] > west_connector_cross_x:
-					self.seg.loc[each_indiv, "Base"] = 2
-				else:
-					self.seg.loc[each_indiv, "Base"] = 3
-			#
-			elif self.bisector.direction == "Downward slope":
-				if self.seg.loc[each_indiv, "Dim1_score"] < west_connector_cross_x:  # switched side
-					self.seg.loc[each_indiv, "Base"] = 1
-				elif east_connector_cross_x > self.seg.loc[each_indiv, "Dim1_score"] > west_connector_cross_x:  # switched side twice
-					self.seg.loc[each_indiv, "Base"] = 2
-				else:
-					self.seg.loc[each_indiv, "Base"] = 3
-		#
-		# Determine convertible_to_left and convertible_to_right  segments --------------------------
-		#
-		for each_indiv in self.range_n_individ:
-			bisector_x = (
-				self.seg.loc[each_indiv, "Dim2_score"]
-				- self.bisector.intercept) \
-				/ self.bisector.slope
-			west_connector_cross_x = (
-				self.seg.loc[each_indiv, "Dim2_score"]
-				- self.west.intercept) \
-				/ self.west.slope
-			east_connector_cross_x = (
-				self.seg.loc[each_indiv, "Dim2_score"]
-				- self.east.intercept) \
-				/ self.east.slope
-			#
-			if self.bisector.direction == "Flat":
-				if self.bisector.start_y < self.seg.loc[each_indiv, "Dim2_score"] < self.east.start_y:
-					self.seg.loc[each_indiv, "Convertible"] = 1
-
-				elif self.bisector.start_y > self.seg.loc[each_indiv, "Dim2_score"] > self.west.start_y:
-					self.seg.loc[each_indiv, "Convertible"] = 2
-					# if each_indiv < 100:
-						# print(f"DEBUG -- conv Dim2: {self.seg.loc[each_indiv, 'Dim2_score']}")
-
-				else:
-					self.seg.loc[each_indiv, "Convertible"] = 3
-			elif self.bisector.direction == "Vertical":
-				if self.bisector.start_x < self.seg.loc[each_indiv, "Dim1_score"] < self.east.start_x:
-					self.seg.loc[each_indiv, "Convertible"] = 1
-				elif self.bisector.start_x > self.seg.loc[each_indiv, "Dim1_score"] > self.west.start_x:
-					self.seg.loc[each_indiv, "Convertible"] = 2
-				else:
-					self.seg.loc[each_indiv, "Convertible"] = 3
-			#
-			elif self.bisector.direction == "Upward slope":
-				if bisector_x < self.seg.loc[each_indiv, "Dim1_score"] < east_connector_cross_x:
-					self.seg.loc[each_indiv, "Convertible"] = 1
-				elif bisector_x > self.seg.loc[each_indiv, "Dim1_score"] > west_connector_cross_x:
-					self.seg.loc[each_indiv, "Convertible"] = 2
-				else:
-					self.seg.loc[each_indiv, "Convertible"] = 3
-			elif self.bisector.direction == "Downward slope":
-				if bisector_x < self.seg.loc[each_indiv, "Dim1_score"] < east_connector_cross_x:  # switched side
-					self.seg.loc[each_indiv, "Convertible"] = 1
-				elif bisector_x > self.seg.loc[each_indiv, "Dim1_score"] > west_connector_cross_x:  # switched side
-					self.seg.loc[each_indiv, "Convertible"] = 2
-				else:
-					self.seg.loc[each_indiv, "Convertible"] = 3
-
-		#
-		# Determine Core left and core right  segments -------------------------------------------
-		#
-		if self.bisector.direction == "Flat":
-			# here if the bisector is flat
-			if self.point_coords.iloc[self.rival_a][self.vert_dim] \
-					> self.point_coords.iloc[self.rival_b][self.vert_dim]:
-				# here if rival a is higher vertically than rival b
-				left_x = self.point_coords.iloc[self.rival_a][self.hor_dim]
-				left_y = self.point_coords.iloc[self.rival_a][self.vert_dim]
-				right_x = self.point_coords.iloc[self.rival_b][self.hor_dim]
-				right_y = self.point_coords.iloc[self.rival_b][self.vert_dim]
-			else:
-				# here if rival a is NOT higher vertically than rival b
-				left_x = self.point_coords.iloc[self.rival_b][self.hor_dim]
-				left_y = self.point_coords.iloc[self.rival_b][self.vert_dim]
-				right_x = self.point_coords.iloc[self.rival_a][self.hor_dim]
-				right_y = self.point_coords.iloc[self.rival_a][self.vert_dim]
-		# here if bisector is NOT Flat
-		elif self.point_coords.iloc[self.rival_a][self.hor_dim] \
-				< self.point_coords.iloc[self.rival_b][self.hor_dim]:
-			# here if rival a is more westward than rival b
-			left_x = self.point_coords.iloc[self.rival_a][self.hor_dim]
-			left_y = self.point_coords.iloc[self.rival_a][self.vert_dim]
-			right_x = self.point_coords.iloc[self.rival_b][self.hor_dim]
-			right_y = self.point_coords.iloc[self.rival_b][self.vert_dim]
-		else:
-			# here is rival a is NOT more westward than rival b
-			left_x = self.point_coords.iloc[self.rival_b][self.hor_dim]
-			left_y = self.point_coords.iloc[self.rival_b][self.vert_dim]
-			right_x = self.point_coords.iloc[self.rival_a][self.hor_dim]
-			right_y = self.point_coords.iloc[self.rival_a][self.vert_dim]
-		#
-		for each_indiv in self.range_n_individ:
-			target_x = self.seg.loc[each_indiv, "Dim1_score"]
-			target_y = self.seg.loc[each_indiv, "Dim2_score"]
-			dist_to_left = self.distance_between_points(
-				left_x, left_y, target_x, target_y)
-			dist_to_right = self.distance_between_points(
-				right_x, right_y, target_x, target_y)
-			#
-			if dist_to_left < self.core_radius:
-				self.seg.loc[each_indiv, "Core"] = 1
-				# n_core_1 += 1
-			elif dist_to_right < self.core_radius:
-				self.seg.loc[each_indiv, "Core"] = 3
-				# n_core_3 += 1
-			else:
-				self.seg.loc[each_indiv, "Core"] = 2
-				# n_core_2 += 1
-	#
-	# Determine battleground and settled segments ----------------------------------------------
-	#
-		for each_indiv in self.range_n_individ:
-			west_connector_cross_x = (
-				self.seg.loc[each_indiv, "Dim2_score"]
-				- self.west.intercept) \
-				/ self.west.slope
-			east_connector_cross_x = (
-				self.seg.loc[each_indiv, "Dim2_score"]
-				- self.east.intercept) \
-				/ self.east.slope
-			if self.bisector.direction == "Flat":
-				if self.east.intercept < self.seg.loc[each_indiv, "Dim2_score"] < self.west.intercept:
-					self.seg.loc[each_indiv, "Battle_ground"] = 1
-				else:
-					self.seg.loc[each_indiv, "Battle_ground"] = 2
-			elif self.bisector.direction == "Vertical":
-				if self.east.start_x > self.seg.loc[each_indiv, "Dim1_score"] > self.west.start_x:
-					self.seg.loc[each_indiv, "Battle_ground"] = 1
-				else:
-					self.seg.loc[each_indiv, "Battle_ground"] = 2
-			elif self.bisector.direction == "Upward slope":
-				if east_connector_cross_x > self.seg.loc[each_indiv, "Dim1_score"] > west_connector_cross_x:
-					self.seg.loc[each_indiv, "Battle_ground"] = 1
-				else:
-					self.seg.loc[each_indiv, "Battle_ground"] = 2
-			elif self.bisector.direction == "Downward slope":
-				if east_connector_cross_x > self.seg.loc[each_indiv, "Dim1_score"] > west_connector_cross_x:  # switched side twice
-					self.seg.loc[each_indiv, "Battle_ground"] = 1
-				else:
-					self.seg.loc[each_indiv, "Battle_ground"] = 2
-	#
-	# Determine Only Dim1 and Dim2 segments ----------------------------------------------
-	#
-		for each_indiv in self.range_n_individ:
-			# Dim1
-			if self.seg.loc[each_indiv, "Dim1_score"] < self.dim1_div:
-				self.seg.loc[each_indiv, "Only_Dim1"] = 1
-			else:
-				self.seg.loc[each_indiv, "Only_Dim1"] = 2
-			# Dim2
-			if self.dim2.loc[each_indiv] > self.dim2_div:
-				self.seg.loc[each_indiv, "Only_Dim2"] = 1
-			else:
-				self.seg.loc[each_indiv, "Only_Dim2"] = 2
+		# Each family of segments is cached with the inputs it depends on, so after
+		# a change of reference points or tolerances only the affected families are
+		# recomputed.
+		#
+		# Scores are individuals by segment dimensions, the plotted pair first
+		#
+		scores = self.segment_scores(self.segment_dims)
+		# A digest of the scores themselves, so new or reordered data never reuses codes
+		scores_key = (
+			tuple(self.segment_dims), scores.shape,
+			hashlib.blake2b(np.ascontiguousarray(scores).tobytes(), digest_size=16).digest())
+		normal_key = tuple(self.segment_normal)
+		bisector_key = (normal_key, self.region_levels["Bisector"])
+		sides_key = (normal_key, self.region_levels["West"], self.region_levels["East"])
+		core_key = (
+			normal_key, self.core_radius,
+			tuple(self.point_coords.iloc[self.rival_a, self.segment_dims]),
+			tuple(self.point_coords.iloc[self.rival_b, self.segment_dims]))
+		families = {
+			"Base": (sides_key, self.base_segments),
+			"Convertible": (bisector_key + sides_key, self.convertible_segments),
+			"Core": (core_key, self.core_segments),
+			"Battle_ground": (sides_key, self.battleground_segments),
+			"Only_Dim": ((self.dim1_div, self.dim2_div), self.only_dim_segments),
+			"Likely": (bisector_key, self.likely_segments)
+		}
 		#
-		# Determine Likely  segments ----------------------------------------
+		columns = {"Dim1_score": scores[:, 0], "Dim2_score": scores[:, 1]}
+		for each_family, (each_key, each_function) in families.items():
+			key = (scores_key, each_key)
+			cached = self.segment_cache.get(each_family)
+			if cached is None or cached[0] != key:
+				cached = (key, each_function(scores))
+				self.segment_cache[each_family] = cached
+			columns.update(cached[1])
 		#
-		if self.bisector.direction == "Flat":
-			for each_indiv in self.range_n_individ:
-				if self.seg.loc[each_indiv, "Dim2_score"] \
-						< self.bisector.intercept:
-					self.seg.loc[each_indiv, "Likely"] = 1
-				else:
-					self.seg.loc[each_indiv, "Likely"] = 2
-		else:
-			for each_indiv in self.range_n_individ:
-				if self.seg.loc[each_indiv, "Dim1_score"] \
-						< (self.seg.loc[each_indiv, "Dim2_score"] - self.bisector.intercept) \
-						/ self.bisector.slope:
-					# likely left
-					self.seg.loc[each_indiv, "Likely"] = 1
-				else:
-					self.seg.loc[each_indiv, "Likely"] = 2
-
+		self.seg = pd.DataFrame(columns)[[
+			"Dim1_score", "Dim2_score",
+			"Base", "Convertible", "Core", "Likely", "Battle_ground", "Only_Dim1", "Only_Dim2"]]
+		pd.set_option('display.max_columns', 10)
 		#
 		# gets percent for codes appearing in series
 		# will not return 0.0 if code does not appear in series
@@ -7443,6 +8534,11 @@ class Configuration:
 		self.battleground_pcts.sort_index(inplace=True)
 		self.dim1_pcts.sort_index(inplace=True)
 		self.dim2_pcts.sort_index(inplace=True)
+		#
+		# Keep any crosstabs current with the new segments
+		#
+		if self.crosstab_vars:
+			self.segment_crosstabs()
 
 		# print(f"DEBUG -- {self.core_pcts = }")
 
@@ -7450,6 +8546,259 @@ class Configuration:
 
 	# ----------------------------------------------------------------------------------
 
+	def segment_crosstabs(self):
+		""" segment crosstabs - weighted percent of each category of each crosstab variable
+			in each segment of every family. Variables are coded to integers once and cached,
+			so after a change of segments all tables come from one bincount per variable.
+		"""
+		families = {
+			"Base": ["Base left", "Neither", "Base right"],
+			"Convertible": ["To left", "To right", "Settled"],
+			"Core": ["Core left", "Neither", "Core right"],
+			"Likely": ["Likely left", "Likely right"],
+			"Battle_ground": ["Battleground", "Settled"],
+			"Only_Dim1": ["Left only", "Right only"],
+			"Only_Dim2": ["Up only", "Down only"]
+		}
+		offsets = np.cumsum([0] + [len(each_codes) for each_codes in families.values()])
+		width = offsets[-1]
+		#
+		# Segment codes start at 1, shifted so each family has its own block of columns
+		#
+		columns = self.seg[list(families)].to_numpy(dtype=np.int64) - 1 + offsets[:-1]
+		if self.crosstab_weight is None:
+			weights = np.ones(len(columns))
+		else:
+			weights = np.nan_to_num(self.ind_vars[self.crosstab_weight].to_numpy(dtype=float))
+		weights = np.repeat(weights, len(families))
+		#
+		self.crosstabs = dict()
+		for each_var in self.crosstab_vars:
+			if each_var not in self.crosstab_codes:
+				self.crosstab_codes[each_var] = pd.factorize(self.ind_vars[each_var], sort=True)
+			codes, categories = self.crosstab_codes[each_var]
+			#
+			# Missing categories are coded -1 and left out
+			#
+			cells = (codes[:, np.newaxis] * width + columns).ravel()
+			counted = np.repeat(codes >= 0, len(families))
+			totals = np.bincount(
+				cells[counted], weights=weights[counted], minlength=len(categories) * width
+			).reshape(len(categories), width)
+			totals = np.vstack([totals, totals.sum(axis=0)])
+			index = [str(each_category) for each_category in categories] + ["All"]
+			for each_family, (first, last) in zip(families, zip(offsets[:-1], offsets[1:])):
+				block = totals[:, first:last]
+				weighted_n = block.sum(axis=1)
+				with np.errstate(invalid="ignore", divide="ignore"):
+					shares = block * 100.0 / weighted_n[:, np.newaxis]
+				table = pd.DataFrame(shares, index=index, columns=families[each_family])
+				table["Weighted_n"] = weighted_n
+				self.crosstabs[(each_var, each_family)] = table
+		#
+		return
+
+	# ----------------------------------------------------------------------------------
+
+	def base_segments(self, scores):
+		""" base segments - 1 base left, 2 neither, 3 base right.
+		"""
+		projection = self.region_projection(scores)
+		base = np.select(
+			[projection < self.region_levels["West"], projection > self.region_levels["East"]],
+			[1, 3], 2)
+		return {"Base": base}
+
+	# ----------------------------------------------------------------------------------
+
+	def convertible_segments(self, scores):
+		""" convertible segments - 1 convertible to left, 2 convertible to right, 3 settled.
+		"""
+		projection = self.region_projection(scores)
+		convertible = np.select(
+			[(self.region_levels["Bisector"] < projection) & (projection < self.region_levels["East"]),
+			(self.region_levels["West"] < projection) & (projection < self.region_levels["Bisector"])],
+			[1, 2], 3)
+		return {"Convertible": convertible}
+
+	# ----------------------------------------------------------------------------------
+
+	def core_segments(self, scores):
+		""" core segments - 1 core left, 2 neither, 3 core right, core being a (hyper)sphere.
+		"""
+		rival_a_xyz = self.point_coords.iloc[self.rival_a, self.segment_dims].to_numpy(dtype=float)
+		rival_b_xyz = self.point_coords.iloc[self.rival_b, self.segment_dims].to_numpy(dtype=float)
+		#
+		# The left rival is the one first along the connector direction, as for the other regions
+		#
+		a_is_left = self.segment_normal @ rival_a_xyz < self.segment_normal @ rival_b_xyz
+		left_xyz, right_xyz = (rival_a_xyz, rival_b_xyz) if a_is_left else (rival_b_xyz, rival_a_xyz)
+		#
+		squared_radius = self.core_radius ** 2
+		core = np.select(
+			[np.square(scores - left_xyz).sum(axis=1) < squared_radius,
+			np.square(scores - right_xyz).sum(axis=1) < squared_radius],
+			[1, 3], 2)
+		return {"Core": core}
+
+	# ----------------------------------------------------------------------------------
+
+	def battleground_segments(self, scores):
+		""" battleground segments - 1 battleground, 2 settled.
+		"""
+		projection = self.region_projection(scores)
+		inside = (self.region_levels["West"] < projection) & (projection < self.region_levels["East"])
+		return {"Battle_ground": np.where(inside, 1, 2)}
+
+	# ----------------------------------------------------------------------------------
+
+	def only_dim_segments(self, scores):
+		""" only dim segments - side of the divider on each plotted dimension, 1 or 2.
+		"""
+		return {
+			"Only_Dim1": np.where(scores[:, 0] < self.dim1_div, 1, 2),
+			"Only_Dim2": np.where(scores[:, 1] > self.dim2_div, 1, 2)
+		}
+
+	# ----------------------------------------------------------------------------------
+
+	def likely_segments(self, scores):
+		""" likely segments - side of the bisector, 1 likely left, 2 likely right.
+		"""
+		projection = self.region_projection(scores)
+		return {"Likely": np.where(projection < self.region_levels["Bisector"], 1, 2)}
+
+	# ----------------------------------------------------------------------------------
+
+	def region_geometry(self):
+		""" region geometry - the bisector and the west and east edges are hyperplanes
+			perpendicular to the connector in the dimensions segments are assigned in, so each
+			is a level of the projection onto the unit connector direction, pointing from the
+			left rival to the right. The battleground is the slab between the edges. Also sets
+			where each crosses the plotted plane through the midpoint, for drawing.
+		"""
+		self.segment_dims = self.segment_dimensions()
+		rival_a_xyz = self.point_coords.iloc[self.rival_a, self.segment_dims].to_numpy(dtype=float)
+		rival_b_xyz = self.point_coords.iloc[self.rival_b, self.segment_dims].to_numpy(dtype=float)
+		connector = rival_b_xyz - rival_a_xyz
+		length = np.linalg.norm(connector)
+		#
+		# Left is westward, or downward when the bisector is flat, then along later dimensions
+		#
+		(normal,), _ = lead_positive(connector / length)
+		middle = (rival_a_xyz + rival_b_xyz) / 2
+		half_width = self.tolerance * length
+		self.core_radius = self.core_tolerance * length
+		#
+		self.segment_normal = normal
+		self.region_levels = {
+			"West": float(normal @ middle) - half_width,
+			"Bisector": float(normal @ middle),
+			"East": float(normal @ middle) + half_width
+		}
+		#
+		# In the plotted plane through the midpoint, the other dimensions add a constant.
+		# Rivals apart only off that plane leave nothing to draw in it.
+		#
+		plane_length = np.hypot(normal[0], normal[1])
+		if plane_length == 0.0:
+			self.region_normal = np.array([1.0, 0.0])
+			plane_levels = {each_level: middle[0] for each_level in self.region_levels}
+		else:
+			self.region_normal = normal[:2] / plane_length
+			off_plane = float(normal[2:] @ middle[2:])
+			plane_levels = {
+				each_level: (each_value - off_plane) / plane_length
+				for each_level, each_value in self.region_levels.items()}
+		self.region_plane_levels = plane_levels
+		#
+		self.west_connector_cross_x, self.west_connector_cross_y = (middle - half_width * normal)[:2]
+		self.east_connector_cross_x, self.east_connector_cross_y = (middle + half_width * normal)[:2]
+		crossings = {
+			"West": (self.west_connector_cross_x, self.west_connector_cross_y),
+			"Bisector": (middle[0], middle[1]),
+			"East": (self.east_connector_cross_x, self.east_connector_cross_y)
+		}
+		#
+		# A line outside the plot collapses onto its crossing point
+		#
+		bounds = (self.hor_min, self.hor_max, self.vert_min, self.vert_max)
+		for each_line, each_level in ((self.west, "West"), (self.bisector, "Bisector"), (self.east, "East")):
+			ends = line_across_rectangle(self.region_normal, plane_levels[each_level], bounds)
+			if ends is None:
+				ends = (crossings[each_level], crossings[each_level])
+			(each_line.start_x, each_line.start_y), (each_line.end_x, each_line.end_y) = ends
+		#
+		return
+
+	# ----------------------------------------------------------------------------------
+
+	def region_projection(self, scores):
+		""" region projection - position of each individual along the connector direction,
+			the single number every half-space membership test compares with a level.
+		"""
+		return scores @ self.segment_normal
+
+	# ----------------------------------------------------------------------------------
+
+	def region_polygon(self, lower=None, upper=None):
+		""" region polygon - clips the plot rectangle to the band between two named levels,
+			"West", "Bisector" or "East". Either side of the band may be left open.
+		"""
+		vertices = np.array([
+			[self.hor_min, self.vert_min],
+			[self.hor_max, self.vert_min],
+			[self.hor_max, self.vert_max],
+			[self.hor_min, self.vert_max]
+		])
+		if lower is not None:
+			vertices = clip_to_half_plane(vertices, -self.region_normal, -self.region_plane_levels[lower])
+		if upper is not None:
+			vertices = clip_to_half_plane(vertices, self.region_normal, self.region_plane_levels[upper])
+		return vertices
+
+	# ----------------------------------------------------------------------------------
+
+	def segment_dimensions(self):
+		""" segment dimensions - dimensions segments are assigned in, the plotted pair first.
+			All ndim dimensions when the individual data has a column of scores on each,
+			as score_columns finds them, otherwise the plotted pair.
+		"""
+		plane = [self.hor_dim, self.vert_dim]
+		if self.ndim > 2 and None not in self.score_columns():
+			return plane + [each_dim for each_dim in range(self.ndim) if each_dim not in plane]
+		return plane
+
+	# ----------------------------------------------------------------------------------
+
+	def score_columns(self):
+		""" score columns - the column of the individual data holding scores on each
+			dimension, found by the dimension's label, its name or DimN, or None for a
+			dimension with no such column. All other columns are demographics.
+		"""
+		columns = [
+			each_column for each_column in self.ind_vars.columns[1:]
+			if pd.api.types.is_numeric_dtype(self.ind_vars[each_column])]
+		found = []
+		for each_dim in range(self.ndim):
+			candidates = [f"Dim{each_dim + 1}"]
+			if each_dim < min(len(self.dim_labels), len(self.dim_names)):
+				candidates = [self.dim_labels[each_dim], self.dim_names[each_dim]] + candidates
+			found.append(next((each_name for each_name in candidates if each_name in columns), None))
+		return found
+
+	# ----------------------------------------------------------------------------------
+
+	def segment_scores(self, dims):
+		""" segment scores - individuals by dims array of scores on the given dimensions.
+		"""
+		if len(dims) == 2:
+			return np.column_stack([np.asarray(self.dim1, dtype=float), np.asarray(self.dim2, dtype=float)])
+		columns = self.score_columns()
+		return self.ind_vars[[columns[each_dim] for each_dim in dims]].to_numpy(dtype=float)
+
+	# ----------------------------------------------------------------------------------
+
 	def bisector_function(self, rival_a, rival_b):
 		#
 		#  Determine midpoint of connector (line between reference points)
@@ -7546,33 +8895,6 @@ class Configuration:
 					- dim_avg[index_dim]
 # -----------------------------------------------------------------------------------------------------------
 
-	def choose_a_side_function(self):
-		"""The choose a side function - randomly chooses a side.
-		\nIf a line goes through a corner this randomly assigns it as going through one side.
-		\nArguments -
-		\nNone
-		\nReturned variables -
-		\nside_1:  "Yes" or "No" indicating the line will be considered	as going through side_1
-		\nside_2: "Yes" or "No" indicating whether the line will be considered as going through side_2
-		"""
-
-		#
-		# randomly set first to be true or false
-		#
-		first = random.choice([True, False])
-		#
-		if first:
-			side_1 = "Yes"
-			side_2 = "No"
-		else:
-			side_1 = "No"
-			side_2 = "Yes"
-
-		return side_1, side_2
-
-
-# -------------------------------------------------------------------------------------------------
-
 	def distance_between_points(self, point_1_x, point_1_y, point_2_x, point_2_y):
 		""" Distance between points function - calculates distance between two points.
 		"""
@@ -7593,44 +8915,59 @@ class Configuration:
 # ---------------------------------------------------------------------------------------
 
 	def dividers(self):
-		### the point on each dimension that separates rivals on that dimension
-		###
-		# print(f"DEBUG -- A ({self.point_coords.iloc[self.rival_a, 0]}, {self.point_coords.iloc[self.rival_a, 1]})")
-		# print(f"DEBUG -- B ({self.point_coords.iloc[self.rival_b, 0]}, {self.point_coords.iloc[self.rival_b, 1]})")
-		diff_dim1 = self.point_coords.iloc[self.rival_b, 0] - self.point_coords.iloc[self.rival_a, 0]
-		diff_dim2 = self.point_coords.iloc[self.rival_b, 1] - self.point_coords.iloc[self.rival_a, 1]
-		sq_dim1 = diff_dim1 ** 2
-		sq_dim2 = diff_dim2 ** 2
-		half_dim1 = math.sqrt(sq_dim1) / 2
-		half_dim2 = math.sqrt(sq_dim2) / 2
-		min_dim1 = min(
-			self.point_coords.iloc[self.rival_a, 0],
-			self.point_coords.iloc[self.rival_b, 0])
-		min_dim2 = min(
-			self.point_coords.iloc[self.rival_a, 1],
-			self.point_coords.iloc[self.rival_b, 1])
-		self.dim1_div = min_dim1 + half_dim1
-		self.dim2_div = min_dim2 + half_dim2
-
+		""" dividers - the point on each plotted dimension that separates the rivals on it.
+		"""
+		rival_a_xy = self.point_coords.iloc[self.rival_a, [self.hor_dim, self.vert_dim]].to_numpy(dtype=float)
+		rival_b_xy = self.point_coords.iloc[self.rival_b, [self.hor_dim, self.vert_dim]].to_numpy(dtype=float)
+		self.dim1_div, self.dim2_div = (rival_a_xy + rival_b_xy) / 2
+		#
 		return
+
 # ------------------------------------------------------------------------------------------------
 
-	def duplicate_similarities(self):
+	def duplicate_similarities(self, defer=False):
+		""" duplicate similarities - records the number of dyads and builds the list,
+			dictionary, sorted and square forms of the similarities. Above
+			mds_landmark_above stimuli, or when defer is set, the other forms are left
+			until a command needs them, so landmark MDS never builds an n by n square
+			in Python and Add points does not rebuild them for every file.
+		"""
+		self.ndyad = int((self.nreferent * (self.nreferent - 1) / 2))
+		self.range_similarities = range(self.ndyad)
+		self.similarities_duplicated = False
+		if not defer and self.nreferent <= self.mds_landmark_above:
+			self.require_duplicated_similarities()
+
+# ------------------------------------------------------------------------------------------------------
+
+	def require_duplicated_similarities(self):
+		""" require duplicated similarities - builds the other forms of the similarities
+			unless they are already current.
+		"""
+		if self.similarities_duplicated:
+			return
+		self.similarities_as_dict = dict()
+		self.similarities_as_list = []
+		self.similarities_as_square = []
+		self.a_item = []
+		self.b_item = []
 		#
 		# Create similarities as a list and a dictionary keyed by a dyad
 
 		from_points = range(1, self.nreferent)
 		for an_item in from_points:
 			to_points = range(an_item)
+			#
+			# Rows restored from a session are arrays, take their values as floats
+			#
+			row = np.asarray(self.similarities[an_item - 1], dtype=float).tolist()
 			for another_item in to_points:
-				self.similarities_as_list.append(self.similarities[an_item - 1][another_item])
+				self.similarities_as_list.append(row[another_item])
 				new_key = str(self.item_labels[another_item] + "_" + self.item_labels[an_item])
 				self.a_item.append(self.item_labels[another_item])
 				self.b_item.append(self.item_labels[an_item])
-				self.similarities_as_dict[new_key] = self.similarities[an_item - 1][another_item]
+				self.similarities_as_dict[new_key] = row[another_item]
 		#
-		self.ndyad = int((self.nreferent * (self.nreferent - 1) / 2))
-		self.range_similarities = range(self.ndyad)
 		sorted_similarities = dict(sorted(self.similarities_as_dict.items(), key=lambda x: x[1]))
 		self.zipped = sorted(zip(self.similarities_as_list, self.a_item, self.b_item))
 		#
@@ -7652,6 +8989,43 @@ class Configuration:
 		# sim_in_numpy = np.array(self.zipped)
 		# temp = sim_in_numpy.argsort(axis=0)
 		# ranks = temp.argsort(axis=0)
+		#
+		self.index_similarities()
+		self.similarities_duplicated = True
+
+# ------------------------------------------------------------------------------------------------------
+
+	def index_similarities(self):
+		""" index similarities - sorts the dyads once by value so a cutoff query is a
+			binary search rather than a scan of the ragged similarities.
+		"""
+		if len(self.similarities) == 0:
+			values = np.array([])
+		else:
+			values = np.concatenate([np.asarray(each_row, dtype=float) for each_row in self.similarities])
+		larger, smaller = np.tril_indices(self.nreferent, -1)
+		order = np.argsort(values, kind="stable")
+		self.sorted_similarity_values = values[order]
+		self.sorted_similarity_smaller = smaller[order]
+		self.sorted_similarity_larger = larger[order]
+
+# ------------------------------------------------------------------------------------------------------
+
+	def alike_pairs(self, cut_point):
+		""" alike pairs - returns the smaller and larger item index and the value of each
+			dyad above (or, if dissimilarities, below) the cutoff, most alike first.
+		"""
+		self.require_duplicated_similarities()
+		if self.value_type == "similarities":
+			first = np.searchsorted(self.sorted_similarity_values, cut_point, side="right")
+			selected = slice(None, first - 1, -1) if first > 0 else slice(None, None, -1)
+		else:
+			last = np.searchsorted(self.sorted_similarity_values, cut_point, side="left")
+			selected = slice(None, last)
+		return (
+			self.sorted_similarity_smaller[selected],
+			self.sorted_similarity_larger[selected],
+			self.sorted_similarity_values[selected])
 
 # ------------------------------------------------------------------------------------------------------
 
@@ -7659,183 +9033,13 @@ class Configuration:
 		""" ends of bisector function - determines the coordinates of the endpoints of the bisector.
 		"""
 		#
-		# Initialize variables needed
-		#
-		self.bisector.goes_through_top = "No"
-		self.bisector.goes_through_bottom = "No"
-		self.bisector.goes_through_right_side = "No"
-		self.bisector.goes_through_left_side = "No"
-		self.bisector.start_x = 0.0
-		self.bisector.start_y = 0.0
-		self.bisector.end_x = 0.0
-		self.bisector.end_y = 0.0
-		# bisector passes through top or bottom
-		#   y at max x
-		self.bisector.y_at_max_x = (self.bisector.slope * self.hor_max) + self.bisector.intercept
-		#   y at min x
-		self.bisector.y_at_min_x = (self.bisector.slope * self.hor_min) + self.bisector.intercept
-		#
-		# bisector passes through right or left side
-		if self.bisector.slope == 0.0:
-			self.bisector.slope = self.bisector.SLOPE_FUDGE
-		#    x at max y
-		self.bisector.x_at_max_y = (self.vert_max - self.bisector.intercept) / self.bisector.slope
-		# 	x at min y
-		self.bisector.x_at_min_y = (self.vert_min - self.bisector.intercept) / self.bisector.slope
-		#
-		# Add bisector to plot
+		self.region_geometry()
 		#
-		# Determine whether bisector goes through edge - top/bottom, right/left
-		#
-		if self.bisector.direction == "Flat":
-			self.bisector.goes_through_right_side = "Yes"
-			self.bisector.goes_through_left_side = "Yes"
-		#
-		else:
-			if self.hor_min < self.bisector.x_at_max_y < self.hor_max:
-				self.bisector.goes_through_top = "Yes"
-			if self.hor_min < self.bisector.x_at_min_y < self.hor_max:
-				self.bisector.goes_through_bottom = "Yes"
-			if self.vert_min < self.bisector.y_at_max_x < self.vert_max:
-				self.bisector.goes_through_right_side = "Yes"
-			if self.vert_min < self.bisector.y_at_min_x < self.vert_max:
-				self.bisector.goes_through_left_side = "Yes"
-		#
-		# Handle lines going through corners
-		#
-		# upper right
-		if self.bisector.x_at_max_y == self.hor_max \
-			and self.bisector.y_at_max_x == self.vert_max:
-			(
-				self.bisector.goes_through_top,
-				self.bisector.goes_through_right_side
-			) = self.choose_a_side_function()
-		# upper left
-		if self.bisector.x_at_max_y == self.hor_min \
-			and self.bisector.y_at_min_x == self.vert_max:
-			(
-				self.bisector.goes_through_top,
-				self.bisector.goes_through_left_side
-			) = self.choose_a_side_function()
-		# lower right
-		if self.bisector.x_at_min_y == self.hor_max \
-			and self.bisector.y_at_max_x == self.vert_min:
-
-			(
-				self.bisector.goes_through_bottom,
-				self.bisector.goes_through_right_side
-			) = self.choose_a_side_function()
-		# lower left
-		if self.bisector.x_at_min_y == self.hor_min \
-			and self.bisector.y_at_min_x == self.vert_min:
-			(
-				self.bisector.goes_through_bottom,
-				self.bisector.goes_through_left_side
-			) = self.choose_a_side_function()
-		#
-		self.set_bisector_case()
-		#
-		match self.bisector.case:
-			#
-			# Bisector Case 0a Bisector slope is zero from Left side to Right side
-			#
-			case "0a":
-				self.bisector.start_x = self.hor_min
-				self.bisector.start_y = self.connector_bisector_cross_y
-				self.bisector.end_x = self.hor_max
-				self.bisector.end_y = self.connector_bisector_cross_y
-			#
-			# Bisector 1 Case 0b Connector slope is zero - from top to bottom
-			#
-			case "0b":
-				self.bisector.start_x = self.connector_bisector_cross_x
-				self.bisector.start_y = self.vert_max
-				self.bisector.end_x = self.connector_bisector_cross_x
-				self.bisector.end_y = self.vert_min
-			#
-			# Bisector Case Ia Positive slope from Left side to Right side and min_y > vert_min
-			#
-			case "Ia":
-				self.bisector.start_x = self.hor_min
-				self.bisector.start_y = self.bisector.y_at_min_x
-				self.bisector.end_x = self.hor_max
-				self.bisector.end_y = self.bisector.y_at_max_x
-		#
-		# Bisector Case IIa Positive slope from Left side to Top and max_y == vert_max
-		#
-			case "IIa":
-				self.bisector.start_x = self.hor_min
-				self.bisector.start_y = self.bisector.y_at_min_x
-				self.bisector.end_x = self.bisector.x_at_max_y
-				self.bisector.end_y = self.vert_max
-		#
-		# Bisector Case IIIa Positive slope from Bottom to Right side
-		#
-			case "IIIa":
-				self.bisector.start_x = self.bisector.x_at_min_y
-				self.bisector.start_y = self.vert_min
-				self.bisector.end_x = self.hor_max
-				self.bisector.end_y = self.bisector.y_at_max_x
-		#
-		# Bisector Case IVa Positive slope from Bottom to Top and min_x < hor_min
-		#
-			case "IVa":
-				self.bisector.start_x = self.bisector.x_at_min_y
-				self.bisector.start_y = self.vert_min
-				self.bisector.end_x = self.bisector.x_at_max_y
-				self.bisector.end_y = self.vert_max
-		#
-		# Bisector Case Ib Negative slope from Left side to Right side
-		#
-			case "Ib":
-				self.bisector.start_x = self.hor_min
-				self.bisector.start_y = self.bisector.y_at_min_x
-				self.bisector.end_x = self.hor_max
-				self.bisector.end_y = self.bisector.y_at_max_x
-		#
-		# Bisector Case IIb Negative slope from Left side to Bottom and min_y == vert_min
-		#
-			case "IIb":
-				self.bisector.start_x = self.hor_min
-				self.bisector.start_y = self.bisector.y_at_min_x
-				self.bisector.end_x = self.bisector.x_at_min_y
-				self.bisector.end_y = self.vert_min
-		#
-		# Bisector Case IIIb Negative slope from Top to Right side and min_x < hor_min ?????????
-		#
-			case "IIIb":
-				self.bisector.start_x = self.bisector.x_at_max_y
-				self.bisector.start_y = self.vert_max
-				self.bisector.end_x = self.hor_max
-				self.bisector.end_y = self.bisector.y_at_max_x
-		#
-		# Bisector Case IVb Negative slope from Bottom to Top and max_y > vert_max  ????????????????????????
-		#
-			case "IVb":
-				self.bisector.start_x = self.bisector.x_at_max_y
-				self.bisector.start_y = self.vert_max
-				self.bisector.end_x = self.bisector.x_at_min_y
-				self.bisector.end_y = self.vert_min
-		#
-		# Ready to add bisector to plot
-		#
-		# Correct outliers
-		#
-		if self.bisector.start_x > self.hor_max:
-			self.bisector.start_x = self.hor_max
-		if self.bisector.start_y > self.vert_max:
-			self.bisector.start_y = self.vert_max
-		if self.bisector.end_x < self.hor_min:
-			self.bisector.end_x = self.hor_min
-		if self.bisector.end_y < self.vert_min:
-			self.bisector.end_y = self.vert_min
-		#
-		# Ready to add bisector to plot
-		#
-		return
-	# ------------------------------------------------------------------------------
-
-	def evaluate(self):
+		return
+
+	# ------------------------------------------------------------------------------
+
+	def evaluate(self):
 
 		#
 		(self.n_individ, self.nreferent) = self.evaluations.shape
@@ -7852,6 +9056,12 @@ class Configuration:
 		#
 		if self.include_explanation():
 			match command:
+				case "Add points":
+					print(
+						"\n\tThe Add points command places new stimuli into the active configuration" +
+						"\n\tfrom their similarities to the existing points, which do not move." +
+						"\n\tThe user will be asked for a file continuing the lower triangle of similarities."
+					)
 				case "Alike":
 					if self.value_type == "similarities":
 						include = "above"
@@ -7895,7 +9105,10 @@ class Configuration:
 						"\n\t\tThe line will be labeled with the label for the point." +
 						"\n\t\tThe line will have zero length when the configurations match perfectly. " +
 						"\n\t\tThe point from the rotated configuration with be labeled with an R. " +
-						"\n\t\tThe point from the target congratulation will be labeled with a T."
+						"\n\t\tThe point from the target congratulation will be labeled with a T." +
+						"\n\tThe transformation may be orthogonal, similarity or oblique and works in any number " +
+						"of dimensions." +
+						"\n\tAdditional target files may be chosen and the disparity with each will be reported."
 					)
 				case "Configuration":
 					print(
@@ -7975,6 +9188,8 @@ class Configuration:
 				case "Factor":
 					print(
 						"\n\tThe Factor command creates a factor analysis of the current correlations." +
+						"\n\t\tParallel analysis can first suggest how many factors to extract, keeping" +
+						"\n\t\t\tfactors whose Eigenvalue exceeds that of most random correlation matrices." +
 						"\n\t\tThe output is a factor matrix with as many points as in the correlation matrix," +
 						"\n\t\tThe plot will have vectors from the origin to each point." +
 						"\n\t\tIt displays a Scree diagram with the Eigenvalue for each" +
@@ -7991,11 +9206,17 @@ class Configuration:
 						"\n\tThe Grouped command reads a file with coordinates for a set of groups on all dimensions." +
 						"\n\t\tThe number of groups in a file should be small." +
 						"\n\t\tThe number of dimensions must be the same as the active configuration" +
-						"\n\t\tIf reference points have been established the user can add the points and the bisector."
+						"\n\t\tIf reference points have been established the user can add the points and the bisector." +
+						"\n\tWhen individual data has been read, groups can instead be computed from it." +
+						"\n\t\tThe user chooses a variable defining the groups and whether each group is" +
+						"\n\t\tlocated at the mean, median or weighted mean of its individuals." +
+						"\n\t\tOptionally 95% intervals are estimated by bootstrap."
 					)
 				case "History":
 					print(
-						"\n\tThe History command displays a list of commands used in this session."
+						"\n\tThe History command displays a list of commands used in this session." +
+						"\n\tFor each command the wall time, CPU time, growth in peak memory and the" +
+						"\n\tsize of the undo copy are shown."
 					)
 				case "Individuals":
 					print(
@@ -8033,20 +9254,48 @@ class Configuration:
 						"\n\t\tbattleground points within a tolerance from bisector between" +
 						"\n\t\treference points."
 					)
+				case "Crosstabs":
+					print(
+						"\n\tThe Crosstabs command breaks the segments down by variables in the individual data," +
+						"\n\tsuch as region, age band or party, optionally weighting each individual." +
+						"\n\tFor each category it shows the percent in each segment." +
+						"\n\tThe tables are recomputed whenever the segments change."
+					)
+				case "Matchups":
+					print(
+						"\n\tThe Matchups command treats every pair of points as rivals." +
+						"\n\tFor each pair it estimates the percent of individuals who are likely supporters," +
+						"\n\tbase and core supporters of each rival and the percent in the battleground." +
+						"\n\tThe pairs can be ordered by how close the contest is or by the size of the battleground."
+					)
+				case "Nearest":
+					print(
+						"\n\tThe Nearest command assigns each individual to the nearest of several reference points." +
+						"\n\tThe user will be asked which points to use as reference points." +
+						"\n\tOptionally individuals about equally near their two nearest points form a battleground," +
+						"\n\tand those within a radius of their nearest point are its core." +
+						"\n\tThe region nearest each reference point is shown shaded."
+					)
 				case "MDS":
 					print(
 						"\n\tThe MDS command is used to perform a metric or non-metric multidimensional scaling of the similarities." +
+						"\n\tVery large sets of stimuli are scaled through a subset of landmark stimuli," +
+						"\n\tthe others being placed from their similarities to the landmarks." +
 						"\n\tThe user will be presented with a Scree diagram and asked how many dimensions to retain????." +
 						"\n\tThe result of MDS will become the active configuration."
 					)
 				case "Move":
 					print(
 						"\n\tThe Move command is used to add a constant to the coordinates along dimension(s)." +
-						"\n\tThe user will be asked which dimension(s) to move." +
-						"\n\tThe user will be asked for a value to be used." +
+						"\n\tThe user will be given a slider for each dimension and the plot follows the sliders." +
 						"\tThe value, positive or negative, will be added to each of the point's coordinate on that dimension." +
 						"\n\tThe resulting configuration becomes the active configuration."
 					)
+				case "Open session":
+					print(
+						"\n\tThe Open session command restores the active and target configurations" +
+						"\n\tfrom a session file written by the Save session command."
+					)
 				case "Paired":
 					print(
 						"\n\tThe Paired command is used to obtain information about two points." +
@@ -8062,11 +9311,20 @@ class Configuration:
 					print(
 						"\n\tThe Plot command is used to create a plot of the active configuration."
 					)
-				case "Principal Components":
+				case "Principal components":
 					print(
 						"\n\tThe Principal Components command is used to obtain the " +
 						"\n\t\tdimensions corresponding to the axes having the highest explanatory power to" +
-						"\n\t\tdescribe the correlations."
+						"\n\t\tdescribe the correlations." +
+						"\n\tThe user chooses the number of components and whether to use an exact or" +
+						"\n\t\trandomized decomposition, or to accumulate the covariance a chunk of evaluations" +
+						"\n\t\tat a time. Without evaluations, they are streamed in chunks from a file." +
+						"\n\tThe variance explained by each component is shown."
+					)
+				case "Profile":
+					print(
+						"\n\tThe Profile command attaches the profiler to the next command." +
+						"\n\tWhen that command finishes the functions taking the most time are listed."
 					)
 				case "Ranks":
 					print(
@@ -8093,8 +9351,8 @@ class Configuration:
 				case "Rotate":
 					print(
 						"\n\tThe Rotate command will be used to rotate the current plane of the active configuration." +
-						"\n\tThe user will be asked to enter the degrees to rotated." +
-						"\n\tA positive value will indicate clockwise rotation." +
+						"\n\tThe user will be given a slider for the degrees to rotate and the plot follows the slider." +
+						"\n\tA positive value will indicate counter-clockwise rotation." +
 						"\n\tThe resulting configuration becomes the active configuration."
 					)
 				case "Sample designer":
@@ -8109,7 +9367,27 @@ class Configuration:
 				case "Save configuration":
 					print(
 						"\n\tThe Save configuration command is used to write the active configuration into a file." +
-						"\n\tThe user will be asked for a file to be used."
+						"\n\tThe user will be asked for a file to be used." +
+						"\n\tFor large configurations a binary copy of the coordinates is also written," +
+						"\n\twith .npy added to the file name."
+					)
+				case "Save factor scores":
+					print(
+						"\n\tThe Save factor scores command writes the factor scores of every evaluator" +
+						"\n\tfrom the last Factor command into a compressed CSV, NumPy or Parquet file." +
+						"\n\tThe scores are computed and written in chunks in the background, so other" +
+						"\n\tcommands can be used meanwhile."
+					)
+				case "Save session":
+					print(
+						"\n\tThe Save session command is used to write the active and target configurations," +
+						"\n\tincluding similarities, evaluations, individuals, segments and reference points," +
+						"\n\tinto a session file.  The user will be asked for a file to be used."
+					)
+				case "Save similarities":
+					print(
+						"\n\tThe Save similarities command is used to write the similarities into a file" +
+						"\n\tin lower triangular form.  The user will be asked for a file to be used."
 					)
 				case "Save target":
 					print(
@@ -8157,7 +9435,9 @@ class Configuration:
 						"\n\tdisplay similarities, a line will rise or descend from" +
 						"\n\tleft to right. Each point on the line represents the" +
 						"\n\tdistance between a pair of items and their corresponding" +
-						"\n\tsimilarity measure."
+						"\n\tsimilarity measure. A red line shows the monotone regression" +
+						"\n\tof distance on similarity. When there are many pairs the user" +
+						"\n\tmay show their density instead of each pair."
 					)
 				case "Similarities":
 					print(
@@ -8183,6 +9463,8 @@ class Configuration:
 					print(
 						"\n\tThe Stress command is used to identify points with high " +
 						"\n\tcontribution to the lack of fit." +
+						"\n\tEach point's share of rank stress and of Kruskal stress-1 is shown" +
+						"\n\tin a table which can be sorted by any column, and as a heatmap of pairs." +
 						"\n\tThe user will be shown all the pairs that include a point in a plot " +
 						"\n\tshowing rank of similarity and rank of distance between the points."
 					)
@@ -8194,6 +9476,11 @@ class Configuration:
 						"\n\ttarget configuration.  The rotated configuration will become the " +
 						"\n\tactive configuration."
 					)
+				case "Trace":
+					print(
+						"\n\tThe Trace command writes the cost of each command used in this session" +
+						"\n\tto a Chrome trace file which can be opened in chrome://tracing or Perfetto."
+					)
 				case "Undo":
 					print(
 						"\n\tThe Undo command is used to return to the active configuration " +
@@ -8216,6 +9503,11 @@ class Configuration:
 					print(
 						"\n\tThe View correlations command is used to display the correlations."
 					)
+				case "View evaluations":
+					print(
+						"\n\tThe View evaluations command is used to display the evaluations." +
+						"\n\tLarger sets of evaluations open in a table that can be scrolled and sorted."
+					)
 				case "View grouped data":
 					print(
 						"\n\tThe View grouped data command is used to display grouped data."
@@ -8265,11 +9557,59 @@ class Configuration:
 
 	# --------------------------------------------------------------------------------------
 
+	def evaluation_correlations(self):
+		""" evaluation correlations - computes the correlations, means and standard deviations
+			of the evaluations once and keeps them, with the factor solutions fitted from them,
+			until the evaluations are replaced. Missing values are filled with each item's
+			median first, as FactorAnalyzer does when fitted to the evaluations themselves.
+		"""
+		if self.factor_cache.get("evaluations") is not self.evaluations:
+			evaluations = self.evaluations.fillna(self.evaluations.median())
+			self.factor_cache = {
+				"evaluations": self.evaluations,
+				"correlations": evaluations.corr().to_numpy(),
+				"mean": evaluations.mean().to_numpy(),
+				"std": evaluations.std(ddof=0).to_numpy(),
+				"solutions": dict()
+			}
+		#
+		return self.factor_cache
+
+	# --------------------------------------------------------------------------------------
+
+	def fit_factors(self, n_factors):
+		""" fit factors - fits n_factors to the cached correlations of the evaluations.
+		"""
+		cache = self.evaluation_correlations()
+		fa = FactorAnalyzer(n_factors=n_factors, rotation="varimax", is_corr_matrix=True)
+		fa.fit(cache["correlations"])
+		#
+		# Fitted to correlations, the analyzer needs the means and deviations to score evaluations
+		#
+		fa.mean_ = cache["mean"]
+		fa.std_ = cache["std"]
+		#
+		return fa
+
+	# --------------------------------------------------------------------------------------
+
+	def factor_solutions(self, candidates):
+		""" factor solutions - fits concurrently each candidate number of factors not already
+			cached and returns the solutions keyed by number of factors.
+		"""
+		solutions = self.evaluation_correlations()["solutions"]
+		needed = [n_factors for n_factors in candidates if solutions.get(n_factors) is None]
+		with ThreadPoolExecutor() as pool:
+			for n_factors, fa in zip(needed, pool.map(self.fit_factors, needed)):
+				solutions[n_factors] = fa
+		#
+		return solutions
+
+	# --------------------------------------------------------------------------------------
+
 	def factors_and_scores(self):
 
-		self.fa = FactorAnalyzer(n_factors=self.ndim,
-										rotation="varimax", is_corr_matrix=False)
-		self.fa.fit(self.evaluations)
+		self.fa = self.factor_solutions([self.ndim])[self.ndim]
 		self.range_dims = range(self.ndim)
 		for each_dim in self.range_dims:
 			self.dim_names.append("Factor " + str(each_dim + 1))
@@ -8309,8 +9649,12 @@ class Configuration:
 			index=["Variance", "Proportional", "Cumulative"])
 		self.uniquenesses = pd.DataFrame(
 			self.fa.get_uniquenesses(), columns=["Uniqueness"], index=self.item_names)
+		#
+		# Scores of every evaluator are written by the Save factor scores command
+		#
+		preview = self.evaluations.head(self.factor_score_preview_rows)
 		self.factor_scores = pd.DataFrame(
-			self.fa.transform(self.evaluations), columns=self.dim_names)
+			self.fa.transform(preview), columns=self.dim_names, index=preview.index)
 		return
 
 	# --------------------------------------------------------------------------------
@@ -8464,6 +9808,75 @@ class Configuration:
 
 	# ---------------------------------------------------------------------------
 
+	def group_individuals(self, grouping_var, statistic="Mean", weight_var=None, n_bootstrap=0):
+		""" group individuals - locates each group defined by grouping_var at the mean,
+			median or weighted mean of its individuals, reducing all groups at once.
+			With n_bootstrap, 95% intervals come from Poisson bootstrap replicates.
+		"""
+		valid = self.ind_vars[grouping_var].notna().to_numpy()
+		if weight_var is not None:
+			valid = valid & self.ind_vars[weight_var].notna().to_numpy()
+		codes, groups = pd.factorize(self.ind_vars[grouping_var][valid], sort=True)
+		ngroup = len(groups)
+		coords = np.column_stack((
+			self.dim1.to_numpy(dtype=float)[valid], self.dim2.to_numpy(dtype=float)[valid]))
+		if weight_var is None:
+			weights = np.ones(len(codes))
+		else:
+			weights = self.ind_vars[weight_var].to_numpy(dtype=float)[valid]
+
+		def reduce(counts=None):
+			#
+			# counts is how often each individual is drawn in a bootstrap replicate
+			#
+			if statistic == "Median":
+				rows = slice(None) if counts is None else np.repeat(np.arange(len(codes)), counts)
+				return pd.DataFrame(coords[rows]).groupby(codes[rows]).median().reindex(range(ngroup)).to_numpy()
+			drawn = weights if counts is None else weights * counts
+			totals = np.bincount(codes, weights=drawn, minlength=ngroup)
+			sums = np.column_stack([
+				np.bincount(codes, weights=drawn * coords[:, each_dim], minlength=ngroup)
+				for each_dim in range(2)])
+			with np.errstate(invalid="ignore", divide="ignore"):
+				return sums / totals[:, None]
+
+		position = reduce()
+		#
+		self.grouping_var = grouping_var
+		self.n_grpd = np.bincount(codes, minlength=ngroup)
+		self.point_codes_grpd = list(groups)
+		self.point_labels_grpd = [str(each_group) for each_group in groups]
+		self.point_names_grpd = [str(each_group) for each_group in groups]
+		self.npoint_grpd = ngroup
+		self.range_points_grpd = range(ngroup)
+		self.ndim_grpd = self.ndim
+		self.range_dims_grpd = range(self.ndim)
+		self.dim_labels_grpd = list(self.dim_labels)
+		self.dim_names_grpd = list(self.dim_names)
+		#
+		# Individuals are located on the plotted dimensions only
+		#
+		grouped = np.full((ngroup, self.ndim), np.nan)
+		grouped[:, self.hor_dim] = position[:, 0]
+		grouped[:, self.vert_dim] = position[:, 1]
+		self.point_coords_grpd = pd.DataFrame(
+			grouped, index=self.point_names_grpd, columns=self.dim_labels_grpd)
+		#
+		self.ci_grpd = pd.DataFrame()
+		if n_bootstrap > 0:
+			rng = np.random.default_rng()
+			replicates = np.stack([
+				reduce(rng.poisson(1.0, len(codes))) for each_replicate in range(n_bootstrap)])
+			low, high = np.nanpercentile(replicates, [2.5, 97.5], axis=0)
+			hor_label = self.dim_labels[self.hor_dim]
+			vert_label = self.dim_labels[self.vert_dim]
+			self.ci_grpd = pd.DataFrame({
+				f"{hor_label} low": low[:, 0], f"{hor_label} high": high[:, 0],
+				f"{vert_label} low": low[:, 1], f"{vert_label} high": high[:, 1]
+			}, index=self.point_names_grpd)
+
+	# -------------------------------------------------------------------------------------------
+
 	def include_explanation(self):
 
 		#
@@ -8544,12 +9957,72 @@ class Configuration:
 	# ---------------------------------------------------------------------------------------------
 
 	def invert(self, which_dim):
-		for each_point in self.range_points:
-			self.point_coords.iloc[each_point][which_dim] \
-				= self.point_coords.iloc[each_point][which_dim] * -1
+		self.point_coords.iloc[:, which_dim] = -self.point_coords.iloc[:, which_dim]
 
 # -------------------------------------------------------------------------------------------
 
+	def label_points(self, ax, x, y, labels, prefer_left=None):
+		""" label points - labels as many points as fit without overlapping, in the order
+			given, and notes how many were left unlabeled. Labels are placed again whenever
+			the limits of the plot change, so zooming in reveals more of them.
+			Call after the limits of the plot have been set. Returns a function that
+			places them again at new coordinates.
+		"""
+		x = np.asarray(x, dtype=float)
+		y = np.asarray(y, dtype=float)
+		lengths = np.array([len(str(each_label)) for each_label in labels])
+		texts = []
+		hidden = ax.text(
+			0.99, 0.01, "", transform=ax.transAxes, ha="right", va="bottom",
+			fontsize="small", color="gray")
+
+		def relabel(ax):
+			for each_text in texts:
+				each_text.remove()
+			texts.clear()
+			#
+			# Size of a character in data units at the current limits
+			#
+			fig = ax.figure
+			ax.apply_aspect()
+			position = ax.get_position()
+			hor_min, hor_max = sorted(ax.get_xlim())
+			vert_min, vert_max = sorted(ax.get_ylim())
+			font_pixels = plt.rcParams["font.size"] * fig.dpi / 72
+			hor_per_pixel = (hor_max - hor_min) / (fig.get_figwidth() * fig.dpi * position.width)
+			vert_per_pixel = (vert_max - vert_min) / (fig.get_figheight() * fig.dpi * position.height)
+			#
+			visible = np.flatnonzero(
+				(x >= hor_min) & (x <= hor_max) & (y >= vert_min) & (y <= vert_max))
+			placed = place_labels(
+				x[visible], y[visible], 0.6 * font_pixels * hor_per_pixel * lengths[visible],
+				1.2 * font_pixels * vert_per_pixel, 0.3 * font_pixels * hor_per_pixel,
+				(hor_min, hor_max, vert_min, vert_max),
+				None if prefer_left is None else np.asarray(prefer_left)[visible])
+			for each_placed, anchor_x, anchor_y, ha, va in placed:
+				texts.append(ax.text(
+					anchor_x, anchor_y, labels[visible[each_placed]], ha=ha, va=va, animated=hidden.get_animated()))
+			n_hidden = len(visible) - len(placed)
+			hidden.set_text(f"{n_hidden} labels hidden" if n_hidden > 0 else "")
+
+		def move_labels(new_x=None, new_y=None, animated=None):
+			# Places the labels again, at new coordinates if given, and returns their artists
+			nonlocal x, y
+			if animated is not None:
+				hidden.set_animated(animated)
+			if new_x is not None:
+				x = np.asarray(new_x, dtype=float)
+				y = np.asarray(new_y, dtype=float)
+			relabel(ax)
+			return [hidden, *texts]
+
+		relabel(ax)
+		ax.callbacks.connect("xlim_changed", relabel)
+		ax.callbacks.connect("ylim_changed", relabel)
+		return move_labels
+
+	# -------------------------------------------------------------------------------------------
+
 	def los(self):
 		self.nreferent = 0
 		self.zipped = []
@@ -8563,6 +10036,7 @@ class Configuration:
 		self.similarities_as_dict = dict()
 		self.similarities_as_list.clear()
 		self.similarities_as_square.clear()
+		self.similarities_duplicated = False
 		self.sorted_similarities = dict()
 
 		self.a_item = []
@@ -8596,7 +10070,7 @@ class Configuration:
 		self.point_labels = self.item_labels
 		if reflect == "Yes":
 			col_max = pd.DataFrame.max(df)
-			df = pd.DataFrame.max(col_max) - df
+			df = col_max.max() - df
 
 		n_items_less_one = self.nreferent - 1
 		for an_item in range(n_items_less_one):
@@ -8672,6 +10146,180 @@ class Configuration:
 		self.duplicate_similarities()
 	# --------------------------------------------------------------------------------------------
 
+	def matchup_sweep(self):
+		""" matchup sweep - segment shares for every pair of points as rivals at once.
+			Each pair is oriented as in region_geometry, so its likely, base and battleground
+			regions are levels of one projection. Individuals are taken in chunks, each tested
+			against all pairs as one matrix, and the chunks are shared among threads. Pairs of
+			points at the same position have no bisector, so are left out and recorded in
+			coincident_pairs.
+		"""
+		dims = self.segment_dimensions()
+		points = self.point_coords.iloc[:, dims].to_numpy(dtype=float)
+		scores = self.segment_scores(dims)
+		labels = np.asarray(self.point_labels)
+		first, second = np.triu_indices(len(points), 1)
+		connector = points[second] - points[first]
+		length = np.linalg.norm(connector, axis=1)
+		apart = length > 0.0
+		self.coincident_pairs = list(zip(labels[first[~apart]].tolist(), labels[second[~apart]].tolist()))
+		first, second, connector, length = first[apart], second[apart], connector[apart], length[apart]
+		#
+		# The left rival of each pair is the one first along its connector direction
+		#
+		normal, flip = lead_positive(connector / length[:, np.newaxis])
+		left = np.where(flip, second, first)
+		right = np.where(flip, first, second)
+		bisector_level = np.einsum("ij,ij->i", normal, (points[first] + points[second]) / 2)
+		west_level = bisector_level - self.tolerance * length
+		east_level = bisector_level + self.tolerance * length
+		core_radius = self.core_tolerance * length
+		squared_norms = np.square(points).sum(axis=1)
+		#
+		# Each block of individuals times pairs holds at most matchup_chunk_cells tests
+		#
+		chunk_rows = max(1, min(len(scores), self.matchup_chunk_cells // 64))
+		chunk_pairs = max(1, self.matchup_chunk_cells // chunk_rows)
+		blocks = [
+			(each_row, each_pair)
+			for each_row in range(0, len(scores), chunk_rows)
+			for each_pair in range(0, len(first), chunk_pairs)]
+
+		def block_counts(block):
+			rows = slice(block[0], block[0] + chunk_rows)
+			pairs = slice(block[1], block[1] + chunk_pairs)
+			chunk = scores[rows]
+			projection = chunk @ normal[pairs].T
+			#
+			# Squared distances to the rivals as |x|^2 - 2 x.p + |p|^2, a product like the projection
+			#
+			chunk_squared = np.square(chunk).sum(axis=1)[:, np.newaxis]
+			to_left = chunk_squared - 2 * chunk @ points[left[pairs]].T + squared_norms[left[pairs]]
+			to_right = chunk_squared - 2 * chunk @ points[right[pairs]].T + squared_norms[right[pairs]]
+			squared_radius = np.square(core_radius[pairs])
+			return block[1], np.stack([
+				np.count_nonzero(projection < bisector_level[pairs], axis=0),
+				np.count_nonzero(projection < west_level[pairs], axis=0),
+				np.count_nonzero(projection > east_level[pairs], axis=0),
+				np.count_nonzero(to_left < squared_radius, axis=0),
+				np.count_nonzero(to_right < squared_radius, axis=0)])
+
+		counts = np.zeros((5, len(first)), dtype=np.int64)
+		with ThreadPoolExecutor() as executor:
+			for each_pair, each_counts in executor.map(block_counts, blocks):
+				counts[:, each_pair:each_pair + each_counts.shape[1]] += each_counts
+		(likely_left, base_left, base_right, core_left, core_right) = counts * 100.0 / len(scores)
+		#
+		self.matchups = pd.DataFrame({
+			"Left": labels[left],
+			"Right": labels[right],
+			"Likely_left": likely_left,
+			"Likely_right": 100.0 - likely_left,
+			"Margin": np.abs(2 * likely_left - 100.0),
+			"Battleground": 100.0 - base_left - base_right,
+			"Base_left": base_left,
+			"Base_right": base_right,
+			"Core_left": core_left,
+			"Core_right": core_right
+		})
+		#
+		# Percent of individuals likely to support the row point against the column point
+		#
+		share = np.full((len(points), len(points)), np.nan)
+		share[left, right] = likely_left
+		share[right, left] = 100.0 - likely_left
+		self.matchup_matrix = pd.DataFrame(share, index=self.point_labels, columns=self.point_labels)
+		#
+		return
+
+	# ---------------------------------------------------------------------------
+
+	def nearest_segments(self, refs, battleground=False, core=False):
+		""" nearest segments - assigns each individual to the nearest of several reference
+			points, a chunk of individuals at a time. With battleground, individuals whose two
+			nearest points are within tolerance of equally near are set apart, and with core,
+			those within core_tolerance of the spacing around their nearest point. With two
+			points these are the battleground and core of the bisector.
+		"""
+		dims = self.segment_dimensions()
+		points = self.point_coords.iloc[refs, dims].to_numpy(dtype=float)
+		scores = self.segment_scores(dims)
+		#
+		# Squared spacing of each pair of reference points, and the core radius of each
+		# as a share of the distance to its closest other reference point
+		#
+		spacing = np.square(points[:, np.newaxis, :] - points[np.newaxis, :, :]).sum(axis=2)
+		np.fill_diagonal(spacing, np.inf)
+		core_radii = self.core_tolerance * np.sqrt(spacing.min(axis=1))
+		#
+		nearest = np.empty(len(scores), dtype=np.int64)
+		in_battleground = np.zeros(len(scores), dtype=bool)
+		in_core = np.zeros(len(scores), dtype=bool)
+		for start in range(0, len(scores), self.nearest_chunk_rows):
+			chunk = scores[start:start + self.nearest_chunk_rows]
+			rows = np.arange(len(chunk))
+			squared = np.square(chunk[:, np.newaxis, :] - points[np.newaxis, :, :]).sum(axis=2)
+			closest, runner_up = np.argpartition(squared, 1, axis=1)[:, :2].T
+			nearest[start:start + len(chunk)] = closest
+			#
+			# Within tolerance of the bisector means the squared distances differ
+			# by less than twice tolerance times the squared spacing
+			#
+			in_battleground[start:start + len(chunk)] = \
+				squared[rows, runner_up] - squared[rows, closest] \
+				< 2 * self.tolerance * spacing[closest, runner_up]
+			in_core[start:start + len(chunk)] = squared[rows, closest] < np.square(core_radii[closest])
+		#
+		self.nearest_refs = list(refs)
+		self.nearest_battleground = battleground
+		self.nearest_core = core
+		self.nearest_core_radii = core_radii
+		labels = [self.point_labels[each_ref] for each_ref in refs]
+		self.nearest_seg = pd.DataFrame({
+			"Dim1_score": scores[:, 0],
+			"Dim2_score": scores[:, 1],
+			"Nearest": np.asarray(labels)[nearest]})
+		percent = 100.0 / len(scores)
+		table = {"Nearest": np.bincount(nearest, minlength=len(refs)) * percent}
+		if battleground:
+			self.nearest_seg["Battleground"] = in_battleground
+			table["Battleground"] = np.bincount(nearest[in_battleground], minlength=len(refs)) * percent
+			table["Settled"] = table["Nearest"] - table["Battleground"]
+		if core:
+			self.nearest_seg["Core"] = in_core
+			table["Core"] = np.bincount(nearest[in_core], minlength=len(refs)) * percent
+		self.nearest_pcts = pd.DataFrame(table, index=labels)
+		#
+		return
+
+	# ---------------------------------------------------------------------------
+
+	def nearest_cells(self):
+		""" nearest cells - the part of the plot nearest each reference point, the plot
+			rectangle clipped to the near side of the bisector with every other point.
+		"""
+		points = self.point_coords.iloc[self.nearest_refs, [self.hor_dim, self.vert_dim]].to_numpy(dtype=float)
+		rectangle = np.array([
+			[self.hor_min, self.vert_min],
+			[self.hor_max, self.vert_min],
+			[self.hor_max, self.vert_max],
+			[self.hor_min, self.vert_max]
+		])
+		cells = []
+		for each_ref, each_point in enumerate(points):
+			cell = rectangle
+			for other_ref, other_point in enumerate(points):
+				connector = other_point - each_point
+				length = np.hypot(connector[0], connector[1])
+				if other_ref == each_ref or length == 0.0:
+					continue
+				normal = connector / length
+				cell = clip_to_half_plane(cell, normal, normal @ (each_point + other_point) / 2)
+			cells.append(cell)
+		return cells
+
+	# ---------------------------------------------------------------------------
+
 	def max_and_min(self, command):
 
 		conf_max = 0.0
@@ -8716,11 +10364,18 @@ class Configuration:
 		self.dim_names = []
 		self.dim_labels = []
 
-		nmds = manifold.MDS(
-			n_components=self.n_comp, metric=self.use_metric,
-			dissimilarity='precomputed', n_init=10, verbose=1, normalized_stress="auto")
+		# Large stimulus sets are scaled through landmarks rather than the full square
 		#
-		npos = nmds.fit_transform(X=self.similarities_as_square)
+		if self.nreferent > self.mds_landmark_above:
+			npos = self.landmark_mds()
+		else:
+			self.require_duplicated_similarities()
+			nmds = manifold.MDS(
+				n_components=self.n_comp, metric=self.use_metric,
+				dissimilarity='precomputed', n_init=10, verbose=1, normalized_stress="auto")
+			#
+			npos = nmds.fit_transform(X=self.similarities_as_square)
+			self.best_stress = nmds.stress_
 		#
 		self.point_coords = pd.DataFrame(npos.tolist())
 		self.point_coords.set_index([self.item_labels], inplace=True)
@@ -8733,7 +10388,6 @@ class Configuration:
 
 		self.point_coords.columns = self.dim_names
 		#
-		self.best_stress = nmds.stress_
 		print("\n\tBest stress: ", self.best_stress)
 
 		# self.point_labels = self.item_labels
@@ -8745,10 +10399,201 @@ class Configuration:
 
 # --------------------------------------------------------------------------------------------
 
+	def add_points(self, labels, names, rows):
+		""" add points - places new stimuli into the active configuration from their values
+			to the existing points, which do not move. Values become distances through a
+			line fitted to the existing similarities when there are any, which must then
+			cover the active configuration. Every new point is triangulated and then
+			refined by stress majorization, all at once.
+		"""
+		existing = self.point_coords.to_numpy(dtype=float)
+		center = existing.mean(axis=0)
+		anchors = existing - center
+		values = np.vstack([each_row[:self.npoint] for each_row in rows])
+		#
+		# Fit distance = intercept + slope * value over the existing pairs, which also
+		# turns similarities around; without them values are taken as distances
+		#
+		intercept, slope = 0.0, 1.0
+		if self.have_similarities():
+			below, across = np.tril_indices(self.npoint, k=-1)
+			known = np.fromiter(chain.from_iterable(self.similarities), dtype=float, count=below.size)
+			distances = np.sqrt(np.maximum(squared_distances(existing, existing)[below, across], 0.0))
+			slope, intercept = np.polyfit(known, distances, 1)
+		targets = np.maximum(intercept + slope * values, 0.0)
+		#
+		coords = triangulate(anchors, targets ** 2)
+		coords = place_by_majorization(coords, anchors[np.newaxis], targets, self.add_points_iterations)
+		#
+		# Extend the similarities so they still cover every point
+		#
+		if self.have_similarities():
+			self.similarities.extend(each_row.tolist() for each_row in rows)
+			if self.item_labels is not self.point_labels:
+				self.item_labels.extend(labels)
+			if self.item_names is not self.point_names:
+				self.item_names.extend(names)
+			self.nreferent += len(labels)
+			self.duplicate_similarities(defer=True)
+		#
+		index = labels if self.point_coords.index.equals(pd.Index(self.point_labels)) else names
+		self.point_coords = pd.concat(
+			[self.point_coords, pd.DataFrame(coords + center, index=index, columns=self.point_coords.columns)])
+		self.point_labels.extend(labels)
+		self.point_names.extend(names)
+		self.npoint += len(labels)
+		self.range_points = range(self.npoint)
+
+	# --------------------------------------------------------------------------------------------
+
+	def landmark_mds(self):
+		""" landmark mds - scales mds_landmarks stimuli, chosen one at a time as the stimulus
+			farthest from those already chosen, and places every other stimulus by
+			triangulation from its values to the landmarks. Only the landmarks' columns
+			are read from the lower triangle, so memory grows with the number of stimuli
+			rather than its square. Placed points are then refined by stress majorization
+			against their nearest landmarks.
+		"""
+		n_landmarks = min(self.mds_landmarks, self.nreferent)
+		#
+		# Choose landmarks by max-min so they spread across the space
+		#
+		landmarks = [0]
+		columns = [self.dissimilarity_column(0)]
+		nearest = columns[0].copy()
+		while len(landmarks) < n_landmarks:
+			landmarks.append(int(np.argmax(nearest)))
+			columns.append(self.dissimilarity_column(landmarks[-1]))
+			nearest = np.minimum(nearest, columns[-1])
+		block = np.column_stack(columns)
+		#
+		# Scale the landmarks as MDS would scale the whole set
+		#
+		nmds = manifold.MDS(
+			n_components=self.n_comp, metric=self.use_metric,
+			dissimilarity='precomputed', n_init=10, verbose=0, normalized_stress="auto")
+		anchors = nmds.fit_transform(X=block[landmarks])
+		anchors -= anchors.mean(axis=0)
+		#
+		# Nonmetric solutions have an arbitrary scale; match it to the values
+		#
+		anchor_distances = np.sqrt(np.maximum(squared_distances(anchors, anchors), 0.0))
+		anchors *= np.sum(anchor_distances * block[landmarks]) / np.sum(anchor_distances ** 2)
+		#
+		# Triangulate every stimulus from its values to the landmarks
+		#
+		squared = block ** 2
+		coords = triangulate(anchors, squared, squared[landmarks].mean(axis=0))
+		coords[landmarks] = anchors
+		#
+		# Refine each placed point against its nearest landmarks, which stay fixed
+		#
+		n_neighbors = min(self.mds_refine_neighbors, n_landmarks)
+		if self.mds_refine_iterations > 0 and n_neighbors > 0:
+			neighbors = np.argpartition(block, n_neighbors - 1, axis=1)[:, :n_neighbors]
+			targets = np.take_along_axis(block, neighbors, axis=1)
+			fixed = anchors[neighbors]
+			placed = np.ones(self.nreferent, dtype=bool)
+			placed[landmarks] = False
+			coords[placed] = place_by_majorization(
+				coords[placed], fixed[placed], targets[placed], self.mds_refine_iterations)
+		#
+		# Stress-1 over every point and landmark pair
+		#
+		fitted = np.sqrt(np.maximum(squared_distances(coords, anchors), 0.0))
+		self.best_stress = float(np.sqrt(np.sum((fitted - block) ** 2) / np.sum(fitted ** 2)))
+		print(f"\n\t{self.nreferent} stimuli placed from {n_landmarks} landmarks")
+		#
+		return coords
+
+	# --------------------------------------------------------------------------------------------
+
+	def dissimilarity_column(self, column):
+		""" dissimilarity column - the values between every stimulus and one of them, read
+			from the lower triangle of similarities without building the square.
+		"""
+		values = np.zeros(self.nreferent)
+		if column > 0:
+			values[:column] = self.similarities[column - 1]
+		values[column + 1:] = [
+			self.similarities[each_row - 1][column] for each_row in range(column + 1, self.nreferent)]
+		return values
+
+	# --------------------------------------------------------------------------------------------
+
+	def memory_footprint(self):
+		""" memory footprint - estimates the bytes held by this configuration, counting
+			data frames and arrays fully and other attributes shallowly. Used to report
+			the size of undo snapshots.
+		"""
+		footprint = 0
+		for each_value in vars(self).values():
+			if isinstance(each_value, pd.DataFrame):
+				footprint += int(each_value.memory_usage(deep=True).sum())
+			elif isinstance(each_value, pd.Series):
+				footprint += int(each_value.memory_usage(deep=True))
+			elif isinstance(each_value, np.ndarray):
+				footprint += each_value.nbytes
+			else:
+				footprint += sys.getsizeof(each_value)
+		#
+		return footprint
+
+	# --------------------------------------------------------------------------------------------
+
+	def monotone_regression(self):
+		""" monotone regression - fits disparities, the distances as a monotone function of
+			the similarities, by pool adjacent violators after a single sort.
+		"""
+		similarity = self.df["Similarity"].to_numpy(dtype=float)
+		distance = self.df["Distance_AB"].to_numpy(dtype=float)
+		#
+		# Distance falls as similarity rises, and rises with dissimilarity
+		#
+		fit = IsotonicRegression(increasing=(self.value_type != "similarities"))
+		self.df["Disparity"] = fit.fit_transform(similarity, distance)
+		#
+		return similarity, distance, self.df["Disparity"].to_numpy()
+
+	# --------------------------------------------------------------------------------------------
+
+	def stress_decomposition(self):
+		""" stress decomposition - divides rank stress and Kruskal stress-1 among the points.
+			Half of each dyad's squared difference goes to each of its two points, summed
+			for all points in one pass over the dyads.
+		"""
+		if "Disparity" not in self.df:
+			self.monotone_regression()
+		distance = self.df["Distance_AB"].to_numpy(dtype=float)
+		rank_squared = self.df["AB_Rank_Difference"].to_numpy(dtype=float) ** 2
+		residual_squared = (distance - self.df["Disparity"].to_numpy(dtype=float)) ** 2
+		#
+		npoint = len(self.item_labels)
+		ends = np.concatenate((self.dyad_a_index, self.dyad_b_index))
+		rank_by_point = np.bincount(ends, weights=np.tile(rank_squared / 2, 2), minlength=npoint)
+		residual_by_point = np.bincount(ends, weights=np.tile(residual_squared / 2, 2), minlength=npoint)
+		#
+		total_rank = rank_squared.sum()
+		total_residual = residual_squared.sum()
+		total_distance = (distance ** 2).sum()
+		self.kruskal_stress = math.sqrt(total_residual / total_distance) if total_distance > 0 else 0.0
+		#
+		self.stress_matrix = np.zeros((npoint, npoint))
+		self.stress_matrix[self.dyad_a_index, self.dyad_b_index] = residual_squared
+		self.stress_matrix[self.dyad_b_index, self.dyad_a_index] = residual_squared
+		#
+		self.stress_contributions = pd.DataFrame({
+			"Name": self.item_names[:npoint],
+			"Rank_Stress_Pct": 100 * rank_by_point / total_rank if total_rank > 0 else 0.0,
+			"Kruskal_Pct": 100 * residual_by_point / total_residual if total_residual > 0 else 0.0
+		}, index=self.item_labels).sort_values(by="Kruskal_Pct", ascending=False)
+		#
+		return self.stress_contributions
+
+	# --------------------------------------------------------------------------------------------
+
 	def move(self, which_dim, value):
-		for each_point in self.range_points:
-			self.point_coords.iloc[each_point][which_dim] = \
-				((self.point_coords.iloc[each_point][which_dim]) + value)
+		self.point_coords.iloc[:, which_dim] = self.point_coords.iloc[:, which_dim] + value
 
 	# ---------------------------------------------------------------------------
 
@@ -8888,24 +10733,104 @@ class Configuration:
 
 	# ----------------------------------------------------------------------------------------------
 
-	def plot_alike(self):
-		""" plot alike  -creates a plot with a line joining points with high similarity.
-		A plot of the configuration will be created with a line joining pairs of points with
-		a similarity above (or if dissimilarities, below) the cutoff.
+	def parallel_analysis(self, percentile=95):
+		""" parallel analysis - suggests the number of factors by Horn's method, retaining
+			factors while the eigenvalue of the evaluations' correlations exceeds the given
+			percentile of those of random correlation matrices of the same size. The random
+			matrices are spread across a pool of threads, whose matrix products run outside
+			the interpreter lock, so no process is forked from the running Qt application.
 		"""
+		cache = self.evaluation_correlations()
+		n_obs, n_vars = self.evaluations.shape
+		n_workers = os.cpu_count() or 1
+		sizes = [
+			len(each_chunk) for each_chunk in
+			np.array_split(np.arange(self.parallel_analysis_matrices), n_workers) if len(each_chunk) > 0]
+		seeds = np.random.SeedSequence().spawn(len(sizes))
+		with ThreadPoolExecutor(max_workers=len(sizes)) as pool:
+			random_eigen = np.concatenate(list(pool.map(
+				random_correlation_eigenvalues, repeat(n_obs), repeat(n_vars), sizes, seeds)))
+		#
+		observed = np.linalg.eigvalsh(cache["correlations"])[::-1]
+		threshold = np.percentile(random_eigen, percentile, axis=0)
+		retained = observed > threshold
+		suggested = n_vars if retained.all() else int(np.argmin(retained))
+		self.parallel_analysis_results = pd.DataFrame({
+			"Observed": observed,
+			"Random mean": random_eigen.mean(axis=0),
+			f"Random {percentile}th percentile": threshold
+		}, index=range(1, n_vars + 1))
+		#
+		return suggested
+
+	# --------------------------------------------------------------------------------------------
+
+	def principal_components_chunked(self, chunks, n_components, item_names):
+		""" principal components chunked - finds principal components from the covariance of
+			evaluations accumulated a chunk at a time, so memory stays bounded by the chunk
+			size however many evaluators there are. Evaluators with missing values are dropped.
+			Returns None, after reporting the error, when fewer than two evaluators remain.
+		"""
+		n_vars = len(item_names)
+		n_obs = 0
+		mean = np.zeros(n_vars)
+		scatter = np.zeros((n_vars, n_vars))
+		for each_chunk in chunks:
+			values = each_chunk.dropna().to_numpy(dtype=float)
+			if values.shape[0] == 0:
+				continue
+			#
+			# Merge the chunk's mean and scatter into the running totals
+			#
+			chunk_mean = values.mean(axis=0)
+			centered = values - chunk_mean
+			delta = chunk_mean - mean
+			total = n_obs + values.shape[0]
+			scatter += centered.T @ centered + np.outer(delta, delta) * (n_obs * values.shape[0] / total)
+			mean += delta * (values.shape[0] / total)
+			n_obs = total
 		#
-		# Initialize variables needed
+		if n_obs < 2:
+			self.error(
+				f"Only {n_obs} evaluators have no missing values.",
+				"At least two complete evaluations are needed to find principal components.")
+			return None
 		#
-		x_coords = []
-		y_coords = []
+		covariance = scatter / (n_obs - 1)
+		variances, vectors = np.linalg.eigh(covariance)
+		order = np.argsort(variances)[::-1]
+		variances = np.clip(variances[order], 0.0, None)
+		vectors = vectors[:, order]
 		#
-		# Determine boundaries for plot and how much to move labels????????????
+		# Largest loading of each component is positive, as sklearn reports them
 		#
-		# parts = boundaries_function(conf, parts)
+		signs = np.sign(vectors[np.argmax(np.abs(vectors), axis=0), range(n_vars)])
+		vectors = vectors * np.where(signs == 0, 1.0, signs)
 		#
-		# Begin the building of the plot
+		names = [f"pca{each_component}" for each_component in range(n_components)]
+		self.pca_covar = pd.DataFrame(covariance, columns=item_names, index=item_names)
+		self.pca_explained = pd.DataFrame({
+			"Variance": variances[:n_components],
+			"Proportion": variances[:n_components] / variances.sum()
+		}, index=names)
+		self.pca_explained["Cumulative"] = self.pca_explained["Proportion"].cumsum()
 		#
-		fig, ax = plt.subplots()
+		return pd.DataFrame(vectors[:, :n_components].T, index=names, columns=item_names)
+
+	# --------------------------------------------------------------------------------------------
+
+	def plot_alike(self, num_bins=10):
+		""" plot alike  -creates a plot with a line joining points with high similarity.
+		A plot of the configuration will be created with a line joining pairs of points with
+		a similarity above (or if dissimilarities, below) the cutoff.  Clicking on the
+		histogram beside it moves the cutoff and redraws the lines.
+		"""
+		self.require_duplicated_similarities()
+		#
+		# Begin the building of the plot - configuration on the left, distribution of
+		# similarities on the right
+		#
+		fig, (ax, hist_ax) = plt.subplots(1, 2, gridspec_kw={"width_ratios": [3, 2]})
 		#
 		# Set aspect ratio
 		#
@@ -8916,33 +10841,44 @@ class Configuration:
 		ax.set_xlabel(self.dim_names[self.hor_dim])
 		ax.set_ylabel(self.dim_names[self.vert_dim])
 		#
-		# Add point coordinates to coordinate vectors and labels to plot
-		#
-		for each_point in self.range_points:
-			x_coords.append(self.point_coords.iloc[each_point][self.hor_dim])
-			y_coords.append(self.point_coords.iloc[each_point][self.vert_dim])
-			ax.text(
-				self.point_coords.iloc[each_point][self.hor_dim] + self.move_label,
-				self.point_coords.iloc[each_point][self.vert_dim], self.point_labels[each_point])
-		#
-		# Add points to plot by passing in coordinate vectors
+		# Add points and labels to plot
 		#
-		ax.scatter(x_coords, y_coords)
+		coords = self.point_coords.iloc[:, [self.hor_dim, self.vert_dim]].to_numpy()
+		ax.scatter(coords[:, 0], coords[:, 1])
 		#
-		# Show lines joining each most alike pair based on similarities
-		# 		Need to use range because for alike vectors have duplicates
-		# 		and .index returns only first instance
+		# Show lines joining each most alike pair as a single collection
 		#
-		nalike = range(len(self.a_x_alike))
-		for each_alike in nalike:
-			ax.plot(
-				(self.a_x_alike[each_alike], self.b_x_alike[each_alike]),
-				(self.a_y_alike[each_alike], self.b_y_alike[each_alike]),
-				color="k")
+		lines = LineCollection(
+			np.stack([
+				np.column_stack([self.a_x_alike, self.a_y_alike]),
+				np.column_stack([self.b_x_alike, self.b_y_alike])], axis=1).reshape(-1, 2, 2),
+			colors="k")
+		ax.add_collection(lines)
+		ax.set_title(f"{len(self.a_x_alike)} pairs")
 		#
 		# Ready to complete plot
 		#
 		ax.axis([self.hor_min, self.hor_max, self.vert_min, self.vert_max])
+		self.label_points(ax, coords[:, 0], coords[:, 1], self.point_labels)
+		#
+		# Histogram with the cutoff marked - a click sets a new cutoff
+		#
+		hist_ax.hist(self.sorted_similarity_values, num_bins)
+		hist_ax.set_xlabel("Similarity")
+		hist_ax.set_ylabel("Frequency")
+		hist_ax.set_title("Click to move cutoff")
+		cut_line = hist_ax.axvline(self.alike_cut_point, color="r")
+
+		def move_cutoff(event):
+			if event.inaxes is not hist_ax or event.xdata is None:
+				return
+			smaller, larger, values = self.alike_pairs(event.xdata)
+			lines.set_segments(np.stack([coords[larger], coords[smaller]], axis=1))
+			cut_line.set_xdata([event.xdata, event.xdata])
+			ax.set_title(f"{len(values)} pairs")
+			event.canvas.draw_idle()
+
+		fig.canvas.mpl_connect("button_press_event", move_cutoff)
 		#
 		return fig
 
@@ -9013,216 +10949,10 @@ class Configuration:
 		#
 		ax.axis([self.hor_min, self.hor_max, self.vert_min, self.vert_max])
 		#
-		# Create base regions around the reference points
-		#
-		# WEST
-		#
-		# print(f"DEBUG -- {self.west.case = }")
-		# print(f"DEBUG -- {self.east.case = }")
-		match self.west.case:
-		#
-		# west Case 0a west slope is zero from Left side to Right side --- 0a - west & right
-		#
-			case "0a":
-				self.base_left.vertices = np.array([
-					[self.west.start_x, self.west.start_y],
-					[self.west.end_x, self.west.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_min, self.vert_min]
-				])
-		#
-		# west  Case 0b slope is zero - from top to bottom       ----- 0b - west & left
-		#
-			case "0b":
-				self.base_left.vertices = np.array([
-					[self.west.start_x, self.west.start_y],
-					[self.west.end_x, self.west.end_y],
-					[self.hor_min, self.vert_min],
-					[self.hor_min, self.vert_max]
-				])
-		#
-		# west Case Ia Positive slope from Left side to Right side and min_y > self.vert_min ----- Ia - west & left
-		#
-			case "Ia":
-				self.base_left.vertices = np.array([
-					[self.west.start_x, self.west.start_y],
-					[self.west.end_x, self.west.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_min, self.vert_max]
-				])
-		#
-		# west Case IIa Positive slope from Left side to Top and max_y == self.vert_max ----- IIa - west & left
-		#
-			case "IIa":
-				self.base_left.vertices = np.array([
-					[self.west.start_x, self.west.start_y],
-					[self.west.end_x, self.west.end_y],
-					[self.hor_min, self.vert_max]
-				])
-		#
-		# west Case IIIa Positive slope from Bottom to Right side     ---- IIIa - west & left
-		#
-			case "IIIa":
-				self.base_left.vertices = np.array([
-					[self.west.start_x, self.west.start_y],
-					[self.west.end_x, self.west.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_min, self.vert_max],
-					[self.hor_min, self.vert_min]
-				])
-		#
-		# west Case IVa Positive slope from Bottom to Top    ----- IVa - west & left
-		#
-			case "IVa":
-				self.base_left.vertices = np.array([
-					[self.west.start_x, self.west.start_y],
-					[self.west.end_x, self.west.end_y],
-					[self.hor_min, self.vert_max],
-					[self.hor_min, self.vert_min]
-				])
-		#
-		# west Case Ib Negative slope from Left side to Right side      ---- Ib - west & right
-		#
-			case "Ib":
-				self.base_left.vertices = np.array([
-					[self.west.start_x, self.west.start_y],
-					[self.west.end_x, self.west.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_min, self.vert_min]
-				])
-		#
-		# west Case IIb Negative slope from Left side to Bottom       ----- IIb - west & right
-		#
-			case "IIb":
-				self.base_left.vertices = np.array([
-					[self.west.start_x, self.west.start_y],
-					[self.west.end_x, self.west.end_y],
-					[self.hor_min, self.vert_min]
-				])
-		#
-		# west Case IIIb Negative slope from Top to Right side      ----- IIIb - west & right
-		#
-			case "IIIb":
-				self.base_left.vertices = np.array([
-					[self.west.start_x, self.west.start_y],
-					[self.west.end_x, self.west.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_min, self.vert_min],
-					[self.hor_min, self.vert_max]
-				])
-		#
-		# west Case IVb Negative slope from Top to Bottom      ------ IVb - west & right
-		#
-			case "IVb":
-				self.base_left.vertices = np.array([
-					[self.west.start_x, self.west.start_y],
-					[self.west.end_x, self.west.end_y],
-					[self.hor_min, self.vert_min],
-					[self.hor_min, self.vert_max]
-				])
-		#
-		# EAST
-		#
-		match self.east.case:
-		#
-		# east  Case 0a  slope is zero - from top to bottom    ---- 0a - east & left
-		#
-			case "0a":
-				self.base_right.vertices = np.array([
-					[self.east.start_x, self.east.start_y],
-					[self.east.end_x, self.east.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_min, self.vert_max]
-				])
-		#
-		# east Case 0b east slope is zero from Left side to Right side     ---- 0b - east & right
-		#
-			case "0b":
-				self.base_right.vertices = np.array([
-					[self.east.start_x, self.east.start_y],
-					[self.east.end_x, self.east.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_max, self.vert_max]
-				])
-		#
-		# east Case Ia Positive slope from Left side to Right side and min_y > self.vert_min     --- Ia - east & right
-		#
-			case "Ia":
-				self.base_right.vertices = np.array([
-					[self.east.start_x, self.east.start_y],
-					[self.east.end_x, self.east.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_min, self.vert_min]
-				])
-		#
-		# east Case IIa Positive slope from Left side to Top and max_y == self.vert_max    ---- IIa - east & right
-		#
-			case "IIa":
-				self.base_right.vertices = np.array([
-					[self.east.start_x, self.east.start_y],
-					[self.east.end_x, self.east.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_max, self.vert_min],
-					[self.hor_min, self.vert_min]
-				])
-		#
-		#
-		# east Case IIIa Positive slope from Bottom to Right side    ---- IIIa - east & right
-		#
-			case "IIIa":
-				self.base_right.vertices = np.array([
-					[self.east.start_x, self.east.start_y],
-					[self.east.end_x, self.east.end_y],
-					[self.hor_max, self.vert_min]
-				])
-		#
-		# east Case IVa Positive slope from Bottom to Top      ----  IVa -  east & right
-		#
-			case "IVa":
-				self.base_right.vertices = np.array([
-					[self.east.start_x, self.east.start_y],
-					[self.east.end_x, self.east.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_max, self.vert_min]
-				])
-		#
-		# east Case Ib Negative slope from Left side to Right side     ----   east & left
-		#
-			case "Ib":
-				self.base_right.vertices = np.array([
-					[self.east.start_x, self.east.start_y],
-					[self.east.end_x, self.east.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_min, self.vert_max]
-				])
-		#
-		# east Case IIb Negative slope from Left side to Bottom      ---- IIb - east & left
-		#
-			case "IIb":
-				self.base_right.vertices = np.array([
-					[self.east.start_x, self.east.start_y],
-					[self.east.end_x, self.east.end_y],
-					[self.hor_min, self.vert_min]
-				])
-		#
-		# east Case IIIb Negative slope from Top to Right side      ---- IIIb - east & left
-		#
-			case "IIIb":
-				self.base_right.vertices = np.array([
-					[self.east.start_x, self.east.start_y],
-					[self.east.end_x, self.east.end_y],
-					[self.hor_max, self.vert_max]
-				])
-		#
-		# east Case IVb Negative slope from Bottom to Top       -----   east & left
-		#
-			case "IVb":
-				self.base_right.vertices = np.array([
-					[self.east.start_x, self.east.start_y],
-					[self.east.end_x, self.east.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_max, self.vert_max]
-				])
+		# Create base regions beyond the west and east edges
+		#
+		self.base_left.vertices = self.region_polygon(upper="West")
+		self.base_right.vertices = self.region_polygon(lower="East")
 		#
 		# Shade base regions
 		#
@@ -9302,13 +11032,13 @@ class Configuration:
 		#
 		for each_point in self.range_points:
 			mid_x = (
-				(self.point_coords.iloc[each_point][0]
-				+ target.iloc[each_point][0])
+				(self.point_coords.iloc[each_point, self.hor_dim]
+				+ target.iloc[each_point, self.hor_dim])
 				/ 2
 			)
 			mid_y = (
-				(self.point_coords.iloc[each_point][1]
-				+ target.iloc[each_point][1])
+				(self.point_coords.iloc[each_point, self.vert_dim]
+				+ target.iloc[each_point, self.vert_dim])
 				/ 2
 			)
 			ax.text(
@@ -9317,18 +11047,18 @@ class Configuration:
 				self.point_labels[each_point])
 
 			ax.plot(
-				[self.point_coords.iloc[each_point][0], target.iloc[each_point][0]],
-				[self.point_coords.iloc[each_point][1], target.iloc[each_point][1]],
+				[self.point_coords.iloc[each_point, self.hor_dim], target.iloc[each_point, self.hor_dim]],
+				[self.point_coords.iloc[each_point, self.vert_dim], target.iloc[each_point, self.vert_dim]],
 				color="black"
 			)
 			ax.text(
-				self.point_coords.iloc[each_point][0],
-				self.point_coords.iloc[each_point][1],
+				self.point_coords.iloc[each_point, self.hor_dim],
+				self.point_coords.iloc[each_point, self.vert_dim],
 				"A"
 			)
 			ax.text(
-				target.iloc[each_point][0],
-				target.iloc[each_point][1],
+				target.iloc[each_point, self.hor_dim],
+				target.iloc[each_point, self.vert_dim],
 				"T"
 			)
 		#
@@ -9375,22 +11105,26 @@ class Configuration:
 		x_coords.append(self.point_coords.iloc[:, self.hor_dim])
 		y_coords.append(self.point_coords.iloc[:, self.vert_dim])
 
-		for each_point in self.range_points:
-			ax.text(
-				self.point_coords.iloc[each_point][self.hor_dim] + self.move_label,
-				self.point_coords.iloc[each_point][self.vert_dim],
-				self.point_labels[each_point])
-		ax.scatter(x_coords, y_coords, color="black", s=5)
+		points = ax.scatter(x_coords, y_coords, color="black", s=5)
 		#
 		ax.axis([self.hor_min, self.hor_max, self.vert_min, self.vert_max])
 		#
+		move_labels = self.label_points(
+			ax, self.point_coords.iloc[:, self.hor_dim], self.point_coords.iloc[:, self.vert_dim],
+			self.point_labels)
+		#
+		# Keep the artists so the live plot can move them rather than plotting again
+		#
+		self.configuration_artists = {
+			"points": points, "labels": move_labels, "connector": None, "bisector": None, "bisector_marks": []}
+		#
 		# Show connector if requested
 		#
 		if self.show_connector:
 			#
 			# Draw a line connecting the reference points
 			#
-			ax.plot(
+			self.configuration_artists["connector"], = ax.plot(
 				[self.point_coords.iloc[self.rival_a][self.hor_dim],
 				self.point_coords.iloc[self.rival_b][self.hor_dim]],
 				[self.point_coords.iloc[self.rival_a][self.vert_dim],
@@ -9404,21 +11138,16 @@ class Configuration:
 				self.ends_of_bisector_function()
 				#
 				# Add bisector to plot
-				# For debugging label Start and End
-				#
-				ax.text(self.bisector.start_x, self.bisector.start_y, "S")
-				ax.text(self.bisector.end_x, self.bisector.end_y, "E")
-				#
-				# For Debugging label midpoint as M
-				#
-				ax.text(self.connector_bisector_cross_x, self.connector_bisector_cross_y, "M")
+				# For debugging label Start and End and the midpoint as M
 				#
-				ax.text(self.bisector.start_x, self.bisector.start_y, "S")
-				ax.text(self.bisector.end_x, self.bisector.end_y, "E")
+				self.configuration_artists["bisector_marks"] = [
+					ax.text(self.bisector.start_x, self.bisector.start_y, "S"),
+					ax.text(self.bisector.end_x, self.bisector.end_y, "E"),
+					ax.text(self.connector_bisector_cross_x, self.connector_bisector_cross_y, "M")]
 				#
 				# Draw bisector
 				#
-				ax.plot(
+				self.configuration_artists["bisector"], = ax.plot(
 					[self.bisector.start_x, self.bisector.end_x],
 					[self.bisector.start_y, self.bisector.end_y])
 		# Ready to complete plot
@@ -9577,246 +11306,10 @@ class Configuration:
 		#
 		self.ends_of_bisector_function()
 		#
-		# Create convertible regions
-		#
-		# print(f"DEBUG -- {self.bisector.case = }")
-		# print(f"DEBUG -- {self.west.case = }")
-		# print(f"DEBUG -- {self.east.case = }")
-		right_includes_upper_right = np.array([
-			[self.bisector.start_x, self.bisector.start_y],
-			[self.bisector.end_x, self.bisector.end_y],
-			[self.hor_max, self.vert_max],
-			[self.west.end_x, self.west.end_y],
-			[self.west.start_x, self.west.start_y]
-		])
-		right_includes_lower_right = np.array([
-			[self.bisector.start_x, self.bisector.start_y],
-			[self.bisector.end_x, self.bisector.end_y],
-			[self.hor_max, self.vert_min],
-			[self.west.end_x, self.west.end_y],
-			[self.west.start_x, self.west.start_y]
-		])
-		right_includes_upper_left = np.array([
-			[self.bisector.start_x, self.bisector.start_y],
-			[self.bisector.end_x, self.bisector.end_y],
-			[self.west.end_x, self.west.end_y],
-			[self.west.start_x, self.west.start_y],
-			[self.hor_min, self.vert_max]
-		])
-		right_includes_lower_left = np.array([
-			[self.bisector.start_x, self.bisector.start_y],
-			[self.bisector.end_x, self.bisector.end_y],
-			[self.west.end_x, self.west.end_y],
-			[self.west.start_x, self.west.start_y],
-			[self.hor_min, self.vert_min]
-		])
-		left_includes_lower_left = np.array([
-			[self.bisector.start_x, self.bisector.start_y],
-			[self.bisector.end_x, self.bisector.end_y],
-			[self.hor_min, self.vert_min],
-			[self.east.end_x, self.east.end_y],
-			[self.east.start_x, self.east.start_y]
-		])
-		left_includes_upper_left = np.array([
-			[self.bisector.start_x, self.bisector.start_y],
-			[self.bisector.end_x, self.bisector.end_y],
-			[self.east.end_x, self.east.end_y],
-			[self.east.start_x, self.east.start_y],
-			[self.hor_min, self.vert_max]
-		])
-		left_includes_lower_right = np.array([
-			[self.bisector.start_x, self.bisector.start_y],
-			[self.bisector.end_x, self.bisector.end_y],
-			[self.hor_max, self.vert_min],
-			[self.east.end_x, self.east.end_y],
-			[self.east.start_x, self.east.start_y]
-		])
-		left_includes_upper_right = np.array([
-			[self.bisector.start_x, self.bisector.start_y],
-			[self.bisector.end_x, self.bisector.end_y],
-			[self.hor_max, self.vert_max],
-			[self.east.end_x, self.east.end_y],
-			[self.east.start_x, self.east.start_y]
-		])
-		#
-		# Establish default areas
-		#
-		self.convertible_to_left.vertices = np.array([
-			[self.bisector.start_x, self.bisector.start_y],
-			[self.bisector.end_x, self.bisector.end_y],
-			[self.east.end_x, self.east.end_y],
-			[self.east.start_x, self.east.start_y]
-		])
-		self.convertible_to_right.vertices = np.array([
-			[self.bisector.start_x, self.bisector.start_y],
-			[self.bisector.end_x, self.bisector.end_y],
-			[self.west.end_x, self.west.end_y],
-			[self.west.start_x, self.west.start_y]
-		])
-		#
-		# Bisector Case 0a Bisector slope is zero from Left side to Right side
-		# Bisector Case 0b Connector slope is zero - from top to bottom
-		# Bisector Case Ia Positive slope from Left side to Right side
-		# bisector test is redundant, case includes slope, but improves efficiency
-		#
-		if self.bisector.direction == "Upward slope":
-			if self.bisector.case == "Ia":
-				#
-				# if self.west.case == "Ia":									# test with FP
-				# defaults should cover this
-				if self.west.case == "IIa":								# test with TG
-					self.convertible_to_right.vertices = right_includes_upper_right
-				#
-				# if self.east.case == "Ia":
-				# defaults should cover this							test with BG
-				if self.east.case == "IIIa":							# test with TC/FP
-					self.convertible_to_left.vertices = left_includes_lower_left
-			#
-			# Bisector Case IIa Positive slope from Left side to Top and max_y == vert_max
-			#
-			elif self.bisector.case == "IIa":
-				# if self.west.case == "IIa":
-				# defaults should cover this							test with TG
-				if self.east.case == "Ia":    							# test with  BK
-					self.convertible_to_left.vertices = left_includes_upper_right
-				# elif self.east.case == "IIa":                     test with BF
-				# defaults should cover this
-				elif self.east.case == "IIIa":						# test with    TS
-					self.convertible_to_left.vertices = np.array([
-						[self.bisector.start_x, self.bisector.start_y],
-						[self.bisector.end_x, self.bisector.end_y],
-						[self.hor_max, self.vert_max],
-						[self.east.end_x, self.east.end_y],
-						[self.east.start_x, self.east.start_y],
-						[self.hor_min, self.vert_min],
-					])
-				elif self.east.case == "IVa":						# test with BL
-					self.convertible_to_left.vertices = left_includes_lower_left
-			#
-			# Bisector Case IIIa Positive slope from Bottom to Right side
-			#
-			elif self.bisector.case == "IIIa":
-				if self.west.case == "Ia":							# test with GP
-					self.convertible_to_right.vertices = right_includes_lower_left
-				elif self.west.case == "IIa":						# test with BC
-					self.convertible_to_right.vertices = np.array([
-						[self.bisector.start_x, self.bisector.start_y],
-						[self.bisector.end_x, self.bisector.end_y],
-						[self.hor_max, self.vert_max],
-						[self.west.end_x, self.west.end_y],
-						[self.west.start_x, self.west.start_y],
-						[self.hor_min, self.vert_min]
-					])
-				elif self.west.case == "IVa":						# test with CF
-					self.convertible_to_right.vertices = np.array([
-						[self.bisector.start_x, self.bisector.start_y],
-						[self.bisector.end_x, self.bisector.end_y],
-						[self.hor_max, self.vert_max],
-						[self.west.end_x, self.west.end_y],
-						[self.west.start_x, self.west.start_y]
-					])
-					# self.convertible_to_left.vertices = np.array([
-					# 	[self.bisector.start_x, self.bisector.start_y],
-					# 	[self.bisector.end_x, self.bisector.end_y],
-					# 	[self.east.end_x, self.east.end_y],
-					# 	[self.east.start_x, self.east.start_y],
-					# ])
-				# elif self.west.case == "IIIa":					test with EH
-				# 	defaults should cover this as well as all cases match
-				# if self.east.case == "IIIa":						test with EH
-				# defaults should cover this as well as all cases match
-			#
-			# Bisector Case IVa Positive slope from Bottom to Top
-			#
-			elif self.bisector.case == "IVa":
-				if self.west.case == "IIa":							# test with TN
-					self.convertible_to_right.vertices = right_includes_lower_left
-				#
-				# elif self.west.case == "IVa":						test with ????????????????
-					# defaults should cover this
-				#
-				if self.east.case == "IIIa":						# test with EJ
-					self.convertible_to_left.vertices = left_includes_upper_right
-
-				# elif self.east.case == "IVa":						test with BD
-					# defaults should cover this as well as all cases match
-		#
-		# Bisector Case Ib Negative slope from Left side to Right side
+		# Create convertible regions between the bisector and each edge
 		#
-		elif self.bisector.direction == "Downward slope":
-			if self.bisector.case == "Ib":
-				# if self.west.case == "Ib":						test with AC
-				# defaults should cover this
-				#
-				if self.west.case == "IIb":							# test with EP
-					self.convertible_to_right.vertices = right_includes_lower_right
-				#
-				# if self.east.case == "Ib":						test with CE
-					# defaults should cover this as well as all cases match
-				#
-				if self.east.case == "IIIb":						# test with AC
-					self.convertible_to_left.vertices = left_includes_upper_left
-			#
-			# Bisector Case IIb Negative slope from Left side to Bottom and min_y == vert_min
-			#
-			elif self.bisector.case == "IIb":
-				if self.west.case == "IIb":							# test with HI
-					# defaults should cover this
-					if self.east.case == "Ib":						# test with IY
-						self.convertible_to_left.vertices = left_includes_lower_right
-					# elif self.east.case == "IIb":					test with IK
-					# defaults should cover this as well as all cases match
-					elif self.east.case == "IIIb":  				# test with PX
-						self.convertible_to_left.vertices = np.array([
-							[self.bisector.start_x, self.bisector.start_y],
-							[self.bisector.end_x, self.bisector.end_y],
-							[self.hor_max, self.vert_min],
-							[self.east.end_x, self.east.end_y],
-							[self.east.start_x, self.east.start_y],
-							[self.hor_min, self.vert_max]
-						])
-					elif self.east.case == "IVb":						# test with IW
-						self.convertible_to_left.vertices = left_includes_upper_left
-			#
-			# Bisector Case IIIb Negative slope from Top to right side
-			#
-			#
-			elif self.bisector.case == "IIIb":
-				if self.east.case == "IIIb":
-					noop = 13
-				#
-				if self.west.case == "Ib":								#test with AS
-					self.convertible_to_right.vertices = right_includes_upper_left
-				#
-				elif self.west.case == "IIb":							# test with ?
-					self.convertible_to_right.vertices = np.array([
-						[self.bisector.start_x, self.bisector.start_y],
-						[self.bisector.end_x, self.bisector.end_y],
-						[self.hor_max, self.vert_min],
-						[self.west.end_x, self.west.end_y],
-						[self.west.start_x, self.west.start_y],
-						[self.hor_min, self.vert_max]
-					])
-				#
-				# elif self.west.case == "IIIb":					test with AQ
-				# defaults should cover this as well as all cases match
-				elif self.west.case == "IVb":						# test with AK
-					self.convertible_to_right.vertices = right_includes_lower_right
-			#
-			# Bisector Case IVb Negative slope from Bottom to Top and max_y > vert_max  ????????????????????????
-			#
-			elif self.bisector.case == "IVb":
-				if self.west.case == "IIb":								# test with GH
-					self.convertible_to_right.vertices = right_includes_upper_left
-					if self.east.case == "IIIb":							#test with GM
-						self.convertible_to_left.vertices = left_includes_lower_right
-					# if self.east.case == "IVb": 						#test with GY
-					# defaults should cover this
-				elif self.west.case == "IVb":							#Test with 	DG
-					if self.east.case == "IIIb":
-						self.convertible_to_left.vertices = left_includes_lower_right
-					# elif self.east.case == "IVb":
-					# defaults should cover this as well as all cases match
+		self.convertible_to_left.vertices = self.region_polygon(lower="Bisector", upper="East")
+		self.convertible_to_right.vertices = self.region_polygon(lower="West", upper="Bisector")
 		#
 		# Shade convertible regions
 		#
@@ -9913,47 +11406,23 @@ class Configuration:
 		#
 		ax.axis([self.hor_min, self.hor_max, self.vert_min, self.vert_max])
 		#
-		# Determine which reference point is closest to edge 1
+		# The left rival, whose core is blue, is the one core_segments takes as left
+		#
+		rival_a_xyz = self.point_coords.iloc[self.rival_a, self.segment_dims].to_numpy(dtype=float)
+		rival_b_xyz = self.point_coords.iloc[self.rival_b, self.segment_dims].to_numpy(dtype=float)
+		a_is_left = self.segment_normal @ rival_a_xyz < self.segment_normal @ rival_b_xyz
+		color_a, color_b = ("blue", "red") if a_is_left else ("red", "blue")
 		#
 		# Create circle around the reference points
 		#
-		if self.bisector.direction == "Flat":
-			if self.point_coords.iloc[self.rival_a][self.vert_dim] > self.point_coords.iloc[self.rival_b][self.vert_dim]:
-				core_a = plt.Circle((
-					self.point_coords.iloc[self.rival_a][self.hor_dim],
-					self.point_coords.iloc[self.rival_a][self.vert_dim]),
-					radius=self.core_radius, color='blue')
-				core_b = plt.Circle((
-					self.point_coords.iloc[self.rival_b][self.hor_dim],
-					self.point_coords.iloc[self.rival_b][self.vert_dim]),
-					radius=self.core_radius, color='red')
-			else:
-				core_a = plt.Circle((
-					self.point_coords.iloc[self.rival_a][self.hor_dim],
-					self.point_coords.iloc[self.rival_a][self.vert_dim]),
-					radius=self.core_radius, color='red')
-				core_b = plt.Circle((
-					self.point_coords.iloc[self.rival_b][self.hor_dim],
-					self.point_coords.iloc[self.rival_b][self.vert_dim]),
-					radius=self.core_radius, color='blue')
-		elif self.point_coords.iloc[self.rival_a][self.hor_dim] > self.point_coords.iloc[self.rival_b][self.hor_dim]:
-			core_a = plt.Circle((
-				self.point_coords.iloc[self.rival_a][self.hor_dim],
-				self.point_coords.iloc[self.rival_a][self.vert_dim]),
-				radius=self.core_radius, color='red')
-			core_b = plt.Circle((
-				self.point_coords.iloc[self.rival_b][self.hor_dim],
-				self.point_coords.iloc[self.rival_b][self.vert_dim]),
-				radius=self.core_radius, color='blue')
-		else:
-			core_a = plt.Circle((
-				self.point_coords.iloc[self.rival_a][self.hor_dim],
-				self.point_coords.iloc[self.rival_a][self.vert_dim]),
-				radius=self.core_radius, color='blue')
-			core_b = plt.Circle((
-				self.point_coords.iloc[self.rival_b][self.hor_dim],
-				self.point_coords.iloc[self.rival_b][self.vert_dim]),
-				radius=self.core_radius, color='red')
+		core_a = plt.Circle((
+			self.point_coords.iloc[self.rival_a][self.hor_dim],
+			self.point_coords.iloc[self.rival_a][self.vert_dim]),
+			radius=self.core_radius, color=color_a)
+		core_b = plt.Circle((
+			self.point_coords.iloc[self.rival_b][self.hor_dim],
+			self.point_coords.iloc[self.rival_b][self.vert_dim]),
+			radius=self.core_radius, color=color_b)
 		#
 		plt.gca().add_artist(core_a)
 		plt.gca().add_artist(core_b)
@@ -9992,6 +11461,7 @@ class Configuration:
 
 	def plot_cutoff(self, num_bins):
 
+		self.require_duplicated_similarities()
 		fig, ax = plt.subplots()
 		ax.hist(self.similarities_as_list, num_bins)
 		ax.set_xlabel("Similarity")
@@ -10017,6 +11487,8 @@ class Configuration:
 		ax.set_xlabel(self.dim_names[self.hor_dim])
 		ax.set_ylabel(self.dim_names[self.vert_dim])
 		#
+		x_dirs = []
+		y_dirs = []
 		for each_point in self.range_points:
 			length = np.sqrt(self.point_coords.iloc[each_point][self.hor_dim]**2
 							+ self.point_coords.iloc[each_point][self.vert_dim]**2
@@ -10033,16 +11505,8 @@ class Configuration:
 					head_width=self.vector_head_width,
 					width=self.vector_width
 			)
-			if x_dir >= 0.0:
-				ax.text(
-					x_dir + self.move_label,
-					y_dir,
-					self.point_labels[each_point])
-			else:
-				ax.text(
-					x_dir - (2 * (len(self.point_labels[each_point]) - 1) * self.move_label),
-					y_dir,
-					self.point_labels[each_point])
+			x_dirs.append(x_dir)
+			y_dirs.append(y_dir)
 			print(f"DEBUG -- {length = }")
 		#
 		unit_circle = plt.Circle((0.0, 0.0), 1.0, fill=False)
@@ -10051,6 +11515,11 @@ class Configuration:
 		# ax.axis([self.hor_min, self.hor_max, self.vert_min, self.vert_max])
 		ax.axis([-1.5, 1.5, -1.5, 1.5])
 		#
+		# Labels go outward, to the left of vectors pointing left
+		#
+		self.label_points(
+			ax, x_dirs, y_dirs, self.point_labels, prefer_left=np.asarray(x_dirs) < 0.0)
+		#
 		# Ready to complete plot
 		#
 		return fig
@@ -10072,6 +11541,25 @@ class Configuration:
 
 		# --------------------------------------------------------------------------------------------
 
+	def plot_explained_variance(self):
+		""" plot explained variance - scree view of the proportion of variance explained by
+			each principal component.
+		"""
+		fig, ax = plt.subplots()
+		#
+		proportion = self.pca_explained["Proportion"].to_numpy()
+		components = range(1, len(proportion) + 1)
+		ax.bar(components, proportion, color="gray")
+		ax.plot(components, self.pca_explained["Cumulative"].to_numpy(), color="black", marker="o")
+		ax.set_title("Explained Variance")
+		ax.set_xlabel("Component")
+		ax.set_ylabel("Proportion of variance")
+		ax.set_xticks(components)
+		#
+		return fig
+
+	# ------------------------------------------------------------------------------------------
+
 	def plot_first(self, reply):
 		#
 		# Initialize variables needed
@@ -10212,15 +11700,26 @@ class Configuration:
 		x_coords.append(self.point_coords_grpd.iloc[:, self.hor_dim])
 		y_coords.append(self.point_coords_grpd.iloc[:, self.vert_dim])
 		#
-		for each_point in self.range_points_grpd:
-			ax.text(
-				self.point_coords_grpd.iloc[each_point][self.hor_dim] + self.move_label,
-				self.point_coords_grpd.iloc[each_point][self.vert_dim],
-				self.point_labels_grpd[each_point])
 		ax.scatter(x_coords, y_coords, color="black", s=5)
 		#
+		# Show bootstrap intervals if groups were computed with them
+		#
+		if not self.ci_grpd.empty:
+			x_grpd = self.point_coords_grpd.iloc[:, self.hor_dim].to_numpy()
+			y_grpd = self.point_coords_grpd.iloc[:, self.vert_dim].to_numpy()
+			interval = self.ci_grpd.to_numpy()
+			ax.errorbar(
+				x_grpd, y_grpd,
+				xerr=[x_grpd - interval[:, 0], interval[:, 1] - x_grpd],
+				yerr=[y_grpd - interval[:, 2], interval[:, 3] - y_grpd],
+				fmt="none", ecolor="gray")
+		#
 		ax.axis([self.hor_min, self.hor_max, self.vert_min, self.vert_max])
 		#
+		self.label_points(
+			ax, self.point_coords_grpd.iloc[:, self.hor_dim], self.point_coords_grpd.iloc[:, self.vert_dim],
+			self.point_labels_grpd)
+		#
 		# Show bisector if requested
 		#
 		if self.show_connector:
@@ -10290,6 +11789,7 @@ class Configuration:
 
 		x_coords = []
 		y_coords = []
+		labeled_points = []
 		#
 		# Begin the building of the plot
 		#
@@ -10300,18 +11800,12 @@ class Configuration:
 			if self.show_just_reference_points == "No":
 				x_coords.append(self.point_coords.iloc[each_point][self.hor_dim])
 				y_coords.append(self.point_coords.iloc[each_point][self.vert_dim])
-				ax.text(
-					self.point_coords.iloc[each_point][self.hor_dim] + self.move_label,
-					self.point_coords.iloc[each_point][self.vert_dim],
-					self.point_labels[each_point])
+				labeled_points.append(each_point)
 			elif self.show_just_reference_points == "Yes":
 				if each_point == self.rival_a or each_point == self.rival_b:
 					x_coords.append(self.point_coords.iloc[each_point][self.hor_dim])
 					y_coords.append(self.point_coords.iloc[each_point][self.vert_dim])
-					ax.text(
-						self.point_coords.iloc[each_point][self.hor_dim] + self.move_label,
-						self.point_coords.iloc[each_point][self.vert_dim],
-						self.point_labels[each_point])
+					labeled_points.append(each_point)
 		#
 		# Add points to plot by passing in coordinate vectors
 		# This is done for all points regardless of whether they are basic or reference
@@ -10422,6 +11916,15 @@ class Configuration:
 		#
 		ax.axis([(-all_max), all_max, (-all_max), all_max])
 		#
+		# Label reference points first so they are never among those hidden
+		#
+		labeled_points.sort(key=lambda each_point: each_point not in (self.rival_a, self.rival_b))
+		self.label_points(
+			ax,
+			self.point_coords.iloc[labeled_points, self.hor_dim],
+			self.point_coords.iloc[labeled_points, self.vert_dim],
+			[self.point_labels[each_point] for each_point in labeled_points])
+		#
 		# Plot Configuration
 		#
 		return fig
@@ -10480,172 +11983,10 @@ class Configuration:
 		#
 		self.ends_of_bisector_function()
 		#
-		# Create likely regions around the reference points
-		#
-		# Bisector Case 0a Bisector is flat - from left to right
-		#
-		# print(f"DEBUG -- {self.bisector.case = }")
-
-		match self.bisector.case:
-			case "0a":
-				self.likely_right.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_min, self.vert_max]
-				])
-				self.likely_left.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_min, self.vert_min]
-				])
-			#
-			# Bisector Case 0b Bisector is vertical - from top to bottom
-			#
-			case "0b":
-				self.likely_right.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_max, self.vert_max]
-				])
-				self.likely_left.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_min, self.vert_min],
-					[self.hor_min, self.vert_max]
-				])
-			#
-			# Bisector Case Ia Positive slope from Left side to Right side and min_y > vert_min
-			#
-			case "Ia":
-				self.likely_right.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_min, self.vert_min]
-				])
-				self.likely_left.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_min, self.vert_max]
-				])
-			#
-			# Bisector Case IIa Positive slope from Left side to Top and max_y == vert_max
-			#
-			case "IIa":
-				self.likely_right.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_max, self.vert_min],
-					[self.hor_min, self.vert_min]
-				])
-				self.likely_left.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_min, self.vert_max]
-				])
-			#
-			# Bisector Case IIIa Positive slope from Bottom to Right side
-			#
-			case "IIIa":
-				self.likely_right.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_max, self.vert_min],
-					[self.hor_min, self.vert_min]
-				])
-				self.likely_left.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_min, self.vert_max],
-					[self.hor_min, self.vert_min]
-				])
-			#
-			# Bisector Case IVa Positive slope from Bottom to Top and min_x < hor_min
-			#
-			case "IVa":
-				self.likely_right.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_max, self.vert_min]
-				])
-				self.likely_left.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_min, self.vert_max],
-					[self.hor_min, self.vert_min]
-				])
-			#
-			# Bisector Case Ib Negative slope from Left side to Right side
-			#
-			case "Ib":
-				self.likely_right.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_max],
-					[self.hor_min, self.vert_max]
-				])
-				self.likely_left.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_min, self.vert_min]
-				])
-			#
-			# Bisector Case IIb Negative slope from Left side to Bottom and min_y == vert_min
-			#
-			case "IIb":
-				self.likely_right.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_max, self.vert_max],
-					[self.hor_min, self.vert_max]
-				])
-				self.likely_left.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_min, self.vert_min]
-				])
-			#
-			# Bisector Case IIIb Negative slope from Top to Right side and min_x < hor_min ?????????
-			#
-			case "IIIb":
-				self.likely_right.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_max]
-				])
-				self.likely_left.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_min, self.vert_min],
-					[self.hor_min, self.vert_max]
-				])
-			#
-			# Bisector Case IVb Negative slope from Bottom to Top and max_y > vert_max  ????????????????????????
-			#
-			case "IVb":
-				self.likely_right.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_max, self.vert_min],
-					[self.hor_max, self.vert_max]
-				])
-				self.likely_left.vertices = np.array([
-					[self.bisector.start_x, self.bisector.start_y],
-					[self.bisector.end_x, self.bisector.end_y],
-					[self.hor_min, self.vert_min],
-					[self.hor_min, self.vert_max]
-				])
+		# Create likely regions on each side of the bisector
+		#
+		self.likely_left.vertices = self.region_polygon(upper="Bisector")
+		self.likely_right.vertices = self.region_polygon(lower="Bisector")
 
 		# # Taking transpose
 		# x, y = data.T
@@ -10656,12 +11997,8 @@ class Configuration:
 		#
 		# Shade likely regions
 		#
-		if self.bisector.case in ("0a", "0b", "Ia", "IIa", "IIIa", "IVa", "Ib", "IIb", "IIIb", "IVb"):
-			ax.fill(self.likely_right.x, self.likely_right.y, self.likely_right.color)
-			ax.fill(self.likely_left.x, self.likely_left.y, self.likely_left.color)
-		else:
-			ax.fill(self.likely_right_x, self.likely_right_y, "red")
-			ax.fill(self.likely_left_x, self.likely_left_y, "blue")
+		ax.fill(self.likely_right.x, self.likely_right.y, self.likely_right.color)
+		ax.fill(self.likely_left.x, self.likely_left.y, self.likely_left.color)
 		#
 		if self.have_segments():
 			if reply[0:4] in ["left", "righ", "both"]:
@@ -10803,150 +12140,10 @@ class Configuration:
 		#
 		ax.plot([self.east.start_x, self.east.end_x], [self.east.start_y, self.east.end_y])
 
-		# print(f"DEBUG -- {self.bisector.case = }")
-		# print(f"DEBUG -- {self.west.case = }")
-		# print(f"DEBUG -- {self.east.case = }")
-		#
-		# west Case 0a west slope is zero from Left side to Right side --- 0a - west & right
-		#
-		# Set up shading battleground area
-		#
-		if (self.west.goes_through_right_side == self.east.goes_through_right_side) \
-			and (self.west.goes_through_left_side == self.east.goes_through_left_side) \
-			and (self.west.goes_through_top == self.east.goes_through_top) \
-			and (self.west.goes_through_bottom == self.east.goes_through_bottom):
-			self.battleground.vertices = np.array([
-				[self.west.start_x, self.west.start_y],
-				[self.west.end_x, self.west.end_y],
-				[self.east.end_x, self.east.end_y],
-				[self.east.start_x, self.east.start_y]
-			])
-			if (
-				self.bisector.goes_through_top == "Yes"
-				and self.bisector.goes_through_bottom == "Yes") \
-				or (
-				self.bisector.goes_through_left_side == "Yes"
-					and self.bisector.goes_through_right_side == "Yes"):
-
-				self.convertible_to_left_x = [
-					self.west.start_x, self.west.end_x,
-					self.bisector.end_x, self.bisector.start_x]
-				self.convertible_to_left_y = [
-					self.west.start_y, self.west.end_y,
-					self.bisector.end_y, self.bisector.start_y]
-				self.convertible_to_right_x = [
-					self.east.start_x, self.east.end_x,
-					self.bisector.end_x, self.bisector.start_x]
-				self.convertible_to_right_y = [
-					self.east.start_y, self.east.end_y,
-					self.bisector.end_y, self.bisector.start_y]
-
-		#
-		# Top Left only
-		elif \
-			((self.east.goes_through_top == "Yes")
-				and (self.east.goes_through_bottom == "Yes")
-				and (self.west.goes_through_left_side == "Yes")
-				and (self.west.goes_through_bottom == "Yes")) \
-			or \
-			((self.east.goes_through_top == "Yes")
-				and (self.east.goes_through_right_side == "Yes")
-				and (self.west.goes_through_left_side == "Yes")
-				and (self.west.goes_through_right_side == "Yes")):
-			#
-			self.battleground.vertices = np.array([
-				[self.east.start_x, self.east.start_y],
-				[self.east.end_x, self.east.end_y],
-				[self.west.end_x, self.west.end_y],
-				[self.west.start_x, self.west.start_y],
-				[self.hor_min, self.vert_max]
-			])
-		#
-		# Top right only
-		elif \
-			((self.west.goes_through_top == "Yes")
-				and (self.west.goes_through_bottom == "Yes")
-				and (self.east.goes_through_right_side == "Yes")
-				and (self.east.goes_through_bottom == "Yes")) \
-			or \
-			((self.west.goes_through_top == "Yes")
-				and (self.west.goes_through_left_side == "Yes")
-				and (self.east.goes_through_right_side == "Yes")
-				and (self.east.goes_through_left_side == "Yes")):
-			#
-			self.battleground.vertices = np.array([
-				[self.west.start_x, self.west.start_y],
-				[self.west.end_x, self.west.end_y],
-				[self.hor_max, self.vert_max],
-				[self.east.end_x, self.east.end_y],
-				[self.east.start_x, self.east.start_y]
-			])
-		#
-		# Bottom right only
-		elif \
-			((self.east.goes_through_top == "Yes")
-				and (self.east.goes_through_right_side == "Yes")
-				and (self.west.goes_through_top == "Yes")
-				and (self.west.goes_through_bottom == "Yes")) \
-			or \
-			((self.east.goes_through_left_side == "Yes")
-				and (self.east.goes_through_right_side == "Yes")
-				and (self.west.goes_through_left_side == "Yes")
-				and (self.west.goes_through_bottom == "Yes")):
-			#
-			self.battleground.vertices = np.array([
-				[self.west.start_x, self.west.start_y],
-				[self.west.end_x, self.west.end_y],
-				[self.hor_max, self.vert_min],
-				[self.east.end_x, self.east.end_y],
-				[self.east.start_x, self.east.start_y]
-			])
-		#
-		# Bottom left only
-		elif \
-			((self.west.goes_through_top == "Yes")
-				and (self.west.goes_through_left_side == "Yes")
-				and (self.east.goes_through_top == "Yes")
-				and (self.east.goes_through_bottom == "Yes")) \
-			or \
-			((self.west.goes_through_right_side == "Yes")
-				and (self.west.goes_through_left_side == "Yes")
-				and (self.east.goes_through_right_side == "Yes")
-				and (self.east.goes_through_bottom == "Yes")):
-			#
-			self.battleground.vertices = np.array([
-				[self.west.start_x, self.west.start_y],
-				[self.west.end_x, self.west.end_y],
-				[self.east.end_x, self.east.end_y],
-				[self.east.start_x, self.east.start_y],
-				[self.hor_min, self.vert_min]
-			])
-			#
-		# Both top right and bottom left ------ need reverse of 1 and 2 ????
-		elif (self.west.goes_through_top == "Yes") and (self.west.goes_through_left_side == "Yes") \
-			and (self.east.goes_through_right_side == "Yes") and (self.east.goes_through_bottom == "Yes"):
-			#
-			self.battleground.vertices = np.array([
-				[self.west.start_x, self.west.start_y],
-				[self.west.end_x, self.west.end_y],
-				[self.hor_max, self.vert_max],
-				[self.east.end_x, self.east.end_y],
-				[self.east.start_x, self.east.start_y],
-				[self.hor_min, self.vert_min]
-			])
-		#
-		# Both top left and bottom right ------ need reverse of 1 and 2 ????
-		elif (self.east.goes_through_top == "Yes") and (self.east.goes_through_right_side == "Yes") \
-			and (self.west.goes_through_bottom == "Yes") and (self.west.goes_through_left_side == "Yes"):
-			#
-			self.battleground.vertices = np.array([
-				[self.west.start_x, self.west.start_y],
-				[self.west.end_x, self.west.end_y],
-				[self.hor_max, self.vert_min],
-				[self.east.end_x, self.east.end_y],
-				[self.east.start_x, self.east.start_y],
-				[self.hor_min, self.vert_max]
-			])
+		#
+		# Set up shading battleground area between the west and east edges
+		#
+		self.battleground.vertices = self.region_polygon(lower="West", upper="East")
 		#
 		# Shade battleground area
 		#
@@ -10969,6 +12166,61 @@ class Configuration:
 
 	# ------------------------------------------------------------------------------------------
 
+	def plot_matchups(self):
+		""" plot matchups - shows the percent of likely supporters of each row point
+			against each column point, even contests in the palest colours.
+		"""
+		fig, ax = plt.subplots()
+		#
+		ax.set_title("Matchups")
+		image = ax.imshow(self.matchup_matrix, cmap="RdBu", vmin=0.0, vmax=100.0, interpolation="nearest")
+		fig.colorbar(image, ax=ax, label="Percent likely supporting row point")
+		#
+		# Label every point only while labels can still be read
+		#
+		if len(self.point_labels) <= 50:
+			ticks = range(len(self.point_labels))
+			ax.set_xticks(ticks, self.point_labels, rotation=90)
+			ax.set_yticks(ticks, self.point_labels)
+		#
+		return fig
+
+	# ------------------------------------------------------------------------------------------
+
+	def plot_nearest(self):
+		""" plot nearest - shades the region nearest each reference point and shows
+			battleground individuals and core radii when they were identified.
+		"""
+		fig, ax = plt.subplots()
+		#
+		ax.set_aspect("equal")
+		ax.set_title("Nearest reference point")
+		ax.set_xlabel(self.dim_names[self.hor_dim])
+		ax.set_ylabel(self.dim_names[self.vert_dim])
+		#
+		points = self.point_coords.iloc[self.nearest_refs, [self.hor_dim, self.vert_dim]].to_numpy(dtype=float)
+		for each_ref, each_cell in enumerate(self.nearest_cells()):
+			if len(each_cell) > 0:
+				ax.fill(each_cell[:, 0], each_cell[:, 1], color=plt.cm.tab20(each_ref % 20), alpha=0.5)
+			if self.nearest_core:
+				ax.add_artist(plt.Circle(
+					(points[each_ref, 0], points[each_ref, 1]),
+					radius=self.nearest_core_radii[each_ref], fill=False, hatch="X"))
+		#
+		if self.nearest_battleground:
+			battleground = self.nearest_seg[self.nearest_seg["Battleground"]]
+			ax.scatter(battleground["Dim1_score"], battleground["Dim2_score"], color="black", s=self.point_size)
+		#
+		ax.scatter(points[:, 0], points[:, 1])
+		ax.axis([self.hor_min, self.hor_max, self.vert_min, self.vert_max])
+		self.label_points(
+			ax, points[:, 0], points[:, 1],
+			[self.point_labels[each_ref] for each_ref in self.nearest_refs])
+		#
+		return fig
+
+	# ------------------------------------------------------------------------------------------
+
 	def plot_ranks(self):
 
 		#
@@ -11143,68 +12395,71 @@ class Configuration:
 
 # ------------------------------------------------------------------------------------
 
-	def plot_shep(self, axis):
-
+	def plot_shep(self, axis, density=False):
+		""" plot shep - draws the Shepard diagram as one scatter and one line through the
+			dyads in order of similarity, with the monotone regression fit overlaid.
+			With density, the dyads are binned into a raster instead.
+		"""
 		fig, ax = plt.subplots()
 		#
 		ax.set_title("Shepard Diagram")
 		#
-		if axis == 'y':
-			hor_max = max(self.distances_as_list)
-			hor_min = min(self.distances_as_list)
-			vert_max = min(self.similarities_as_list)
-			vert_min = max(self.similarities_as_list)
-			#
+		similarity, distance, disparity = self.monotone_regression()
+		#
+		# Only the steps of the fit are needed to draw it
+		#
+		steps = np.diff(disparity) != 0
+		keep = np.concatenate(([True], steps)) | np.concatenate((steps, [True]))
+		#
+		if axis == "Y":
+			hor, vert = distance, similarity
+			hor_fit, vert_fit = disparity[keep], similarity[keep]
+			hor_min, hor_max = distance.min(), distance.max()
+			vert_min, vert_max = similarity.max(), similarity.min()
 			ax.set_xlabel("Distance")
 			ax.set_ylabel("Similarity")
-			#
-			for each_dyad in self.range_similarities:
-				if each_dyad != self.ndyad - 1:
-					ax.plot(
-						(self.df.at[each_dyad, "Distance_AB"],
-						self.df.at[each_dyad + 1, "Distance_AB"]),
-						(self.df.at[each_dyad, "Similarity"],
-						self.df.at[each_dyad + 1, "Similarity"]),
-						color="k")
 		else:
-			vert_max = max(self.distances_as_list)
-			vert_min = min(self.distances_as_list)
-			hor_max = min(self.similarities_as_list)
-			hor_min = max(self.similarities_as_list)
-
-			ax.set_ylabel("Distance")
+			hor, vert = similarity, distance
+			hor_fit, vert_fit = similarity[keep], disparity[keep]
+			hor_min, hor_max = similarity.max(), similarity.min()
+			vert_min, vert_max = distance.min(), distance.max()
 			ax.set_xlabel("Similarity")
-			#
-			for each_dyad in self.range_similarities:
-				if each_dyad != self.ndyad - 1:
-					ax.plot(
-						(self.df.at[each_dyad, "Similarity"],
-						self.df.at[each_dyad + 1, "Similarity"]),
-						(self.df.at[each_dyad, "Distance_AB"],
-						self.df.at[each_dyad + 1, "Distance_AB"]),
-						color="k")
+			ax.set_ylabel("Distance")
+		#
+		if density:
+			counts, hor_edges, vert_edges = np.histogram2d(hor, vert, bins=200)
+			ax.imshow(
+				np.log1p(counts.T), origin="lower", aspect="auto", cmap="Greys",
+				interpolation="nearest",
+				extent=(hor_edges[0], hor_edges[-1], vert_edges[0], vert_edges[-1]))
+		else:
+			ax.scatter(hor, vert, s=4, color="k")
+			ax.plot(hor, vert, color="k", linewidth=0.5)
+		ax.plot(hor_fit, vert_fit, color="r", label="Monotone fit")
+		ax.legend()
 		#
 		# Ready to complete plot
 		#
 		ax.axis([hor_min, hor_max, vert_min, vert_max])
 		#
 		return fig
+
 	# -----------------------------------------------------------------------------------
 
 	def plot_stress_by_point(self, point, point_index):
 
 		fig, ax = plt.subplots()
 		#
-		x_others = []
-		y_others = []
-		label_others = []
-		index_others = []
-		for each_dyad in self.range_similarities:
-			if self.df.iloc[each_dyad][point] != "INAP":
-				x_others.append(self.df.at[each_dyad, "Similarity_Rank"])
-				y_others.append(self.df.at[each_dyad, "Distance_Rank"])
-				label_others.append(self.df.at[each_dyad, point])
-				index_others.append(each_dyad)
+		# Dyads including the point and the other item in each
+		#
+		index_others = np.flatnonzero(
+			(self.dyad_a_index == point_index) | (self.dyad_b_index == point_index))
+		partners = np.where(
+			self.dyad_a_index[index_others] == point_index,
+			self.dyad_b_index[index_others],
+			self.dyad_a_index[index_others])
+		x_others = self.df["Similarity_Rank"].to_numpy()[index_others]
+		y_others = self.df["Distance_Rank"].to_numpy()[index_others]
 		#
 		# Create plot for selected item
 		#
@@ -11213,15 +12468,14 @@ class Configuration:
 		ax.set_xlabel("Similarity Rank")
 		ax.set_ylabel("Distance Rank")
 		ax.scatter(x_others, y_others)
-		other_range = range(len(x_others))
-		for each_item in other_range:
-			ax.text(
-				x_others[each_item],
-				y_others[each_item],
-				label_others[each_item])
-			ax.plot(
-				[index_others[each_item] + 1, x_others[each_item]],
-				[index_others[each_item] + 1, y_others[each_item]], 'b')
+		for x_other, y_other, partner in zip(x_others, y_others, partners):
+			ax.text(x_other, y_other, self.item_labels[partner])
+		#
+		# Join each pair to where it would be with no stress
+		#
+		perfect = np.column_stack((index_others + 1, index_others + 1))
+		ax.add_collection(LineCollection(
+			np.stack((perfect, np.column_stack((x_others, y_others))), axis=1), colors="b"))
 		#
 		# Add line to indicate what a perfect relationship, no stress, would be
 		#
@@ -11231,6 +12485,27 @@ class Configuration:
 
 	# -------------------------------------------------------------------------------------------
 
+	def plot_stress_heatmap(self):
+		""" plot stress heatmap - shows the squared residual of each pair of points from
+			the monotone fit, so points and pairs adding most to stress stand out.
+		"""
+		fig, ax = plt.subplots()
+		#
+		ax.set_title(f"Contribution to stress (Kruskal stress-1 {self.kruskal_stress:.4f})")
+		image = ax.imshow(self.stress_matrix, cmap="Reds", interpolation="nearest")
+		fig.colorbar(image, ax=ax, label="Squared residual")
+		#
+		# Label every point only while labels can still be read
+		#
+		if len(self.item_labels) <= 50:
+			ticks = range(len(self.item_labels))
+			ax.set_xticks(ticks, self.item_labels, rotation=90)
+			ax.set_yticks(ticks, self.item_labels)
+		#
+		return fig
+
+	# -------------------------------------------------------------------------------------------
+
 	def plot_vectors(self):
 
 		# print("DEBUG -- at top of plot_vectors")
@@ -11251,18 +12526,6 @@ class Configuration:
 		ax.set_ylabel(self.dim_names[self.vert_dim])
 		#
 		for each_point in self.range_points:
-			if self.point_coords.iloc[each_point][self.hor_dim] >= 0.0:
-				ax.text(
-					self.point_coords.iloc[each_point][self.hor_dim]
-						+ (2 * self.move_label),
-					self.point_coords.iloc[each_point][self.vert_dim],
-					self.point_labels[each_point])
-			else:
-				ax.text(
-					self.point_coords.iloc[each_point][self.hor_dim]
-						- (2 * len(self.point_labels[each_point]) * self.move_label),
-					self.point_coords.iloc[each_point][self.vert_dim],
-					self.point_labels[each_point])
 			ax.arrow(
 					0, 0,
 					self.point_coords.iloc[each_point][self.hor_dim],
@@ -11274,6 +12537,12 @@ class Configuration:
 		#
 		ax.axis([self.hor_min, self.hor_max, self.vert_min, self.vert_max])
 		#
+		# Labels go outward, to the left of vectors pointing left
+		#
+		hor_coords = self.point_coords.iloc[:, self.hor_dim].to_numpy()
+		self.label_points(
+			ax, hor_coords, self.point_coords.iloc[:, self.vert_dim], self.point_labels,
+			prefer_left=hor_coords < 0.0)
 
 		# Ready to complete plot
 		#
@@ -11294,6 +12563,9 @@ class Configuration:
 		""" print active grouped - is used by many command to print the active configuration.
 		"""
 		print(self.point_coords_grpd)
+		if not self.ci_grpd.empty:
+			print("\n\t95% bootstrap intervals\n")
+			print(self.ci_grpd)
 
 		return None
 
@@ -11306,29 +12578,22 @@ class Configuration:
 			called them correlations, similarities or even dissimilarities.
 			Analogously within this function it refers to labels and names rather
 			than item_labels and item_names. And lastly it uses nelements rather
-			than npoints.
+			than npoints. Only the first print_rows_limit items are printed.
 		"""
 		#
 		# 	Define needed variables
 		#
 		one_less = int(width - 1)
+		shown = min(nelements, self.print_rows_limit)
 		#
 		# Print the labels and names of points in the lower triangle
 		#
 		print("\n\tItems:")
-		for index, each_item in enumerate(labels):
-			print("\t\t", each_item, "\t", names[index])
+		print("\n".join(f"\t\t {label} \t {name}" for label, name in zip(labels[:shown], names[:shown])))
 		#
 		# Print column headings using the labels of the points
 		#
-		# labs = labels
-		# print("\n       ", *labs, sep="    ")
-		formatted_labels = ""
-		# for each_point in npoints:
-		# curr_label = labels[each_point]
-		range_labels = range(len(labels))
-		for each_label in range_labels:
-			formatted_labels = formatted_labels + '{:>{width}}'.format(labels[each_label], width=width)
+		formatted_labels = "".join(f"{label:>{width}}" for label in labels[:shown])
 		print("\n", (one_less * " "), formatted_labels)
 		#
 		# Print line with just the label of the first item
@@ -11336,73 +12601,68 @@ class Configuration:
 		an_item = 0
 		print("  ", labels[an_item], "   -----")
 		#
-		# Assemble a line with the values for all the points below this point
-		# Print a line for each of the remaining points in the lower triangle
+		# Print the remaining rows of the lower triangle a block at a time
 		#
-		npoints = range(1, nelements)
-		for each_point in npoints:
-			curr_values = values[each_point - 1]
-			formatted_values = ""
-			for value in curr_values:
-				formatted_values = formatted_values + '{:{width}.{decimals}f}'.format(value, width=width,
-					decimals=decimals)
-			print("  ", labels[each_point], formatted_values)
+		for block in format_lower_triangle(values[:shown - 1], labels[1:shown], f" %{one_less}.{decimals}f"):
+			print(block, end="")
+		if shown < nelements:
+			print(f"\n\tFirst {shown} of {nelements} items shown")
 		#
 		return None
 
+	# --------------------------------------------------------------------------------------
+
+	def write_lower_triangle(self, file_name, labels, names, values):
+		""" write lower triangle function - streams values to file_name in the lower
+			triangular form read by read_lower_triangular, a block of rows at a time.
+		"""
+		heading = f"Lower triangular\n{len(labels)}\n" + "".join(
+			f"{label};{name}\n" for label, name in zip(labels, names))
+		# Each value is written as the shortest text that reads back as exactly the same value,
+		# so values read from text keep their few digits and full precision values keep all theirs
+		chunks = chain((heading,), format_lower_triangle(values, None, " %s"))
+		problem_writing_file = not write_atomically(file_name, (chunk.encode() for chunk in chunks))
+		return problem_writing_file
+
 	#
 
 	# ------------------------------------------------------------------------------------------
 
 	def print_most_similar(self, cut_point):
-		self.a_x_alike.clear()
-		self.a_y_alike.clear()
-		self.b_x_alike.clear()
-		self.b_y_alike.clear()
-		cut = "Null"
-
+		""" print most similar - prints the pairs meeting the cutoff, most alike first, and
+			gathers the coordinates of their end points for plot_alike.
+		"""
 		#
-		# Print pairs above/below cutoff depending on value_type
+		# Binary search of the sorted similarities gives the pairs meeting the cutoff
 		#
-		print("\t\tMost similar pairs: ")
+		smaller, larger, values = self.alike_pairs(cut_point)
+		self.alike_cut_point = cut_point
 		#
-		each_similarity = 0
-		while self.zipped[each_similarity][0] < cut_point:
-			#
-			print(
-				"\t\t", self.zipped[each_similarity][1], ' ',
-				self.zipped[each_similarity][2], " ",
-				self.zipped[each_similarity][0])
-			each_similarity += 1
+		print("\t\tMost similar pairs: ")
+		print("\n".join(
+			f"\t\t {self.item_labels[a_smaller]}   {self.item_labels[a_larger]}   {a_value}"
+			for a_smaller, a_larger, a_value in zip(smaller, larger, values)))
 		#
-		# create coordinate lists for plotting
+		# Gather end point coordinates for plotting with a single indexing operation
 		#
-		from_points = range(1, self.nreferent)
-		for an_item in from_points:
-			to_points = range(an_item)
-			for another_item in to_points:
-				if self.value_type == "similarities":
-					if self.similarities[an_item - 1][another_item] > cut_point:
-						# printing here is not in sorted order - replaced by code above
-						# print(
-						# "\t\t", self.point_labels[an_item], self.point_labels[another_item],
-						# self.similarities[an_item - 1][another_item])
-						self.a_x_alike.append(self.point_coords.iloc[an_item][self.hor_dim])
-						self.b_x_alike.append(self.point_coords.iloc[another_item][self.hor_dim])
-						self.a_y_alike.append(self.point_coords.iloc[an_item][self.vert_dim])
-						self.b_y_alike.append(self.point_coords.iloc[another_item][self.vert_dim])
-				elif self.value_type == "dissimilarities":
-					if self.similarities[an_item - 1][another_item] < cut_point:
-						# print(
-						# "\t\t", self.point_labels[an_item], self.point_labels[another_item],
-						# self.similarities[an_item - 1][another_item])
-						self.a_x_alike.append(self.point_coords.iloc[an_item][self.hor_dim])
-						self.b_x_alike.append(self.point_coords.iloc[another_item][self.hor_dim])
-						self.a_y_alike.append(self.point_coords.iloc[an_item][self.vert_dim])
-						self.b_y_alike.append(self.point_coords.iloc[another_item][self.vert_dim])
+		coords = self.point_coords.iloc[:, [self.hor_dim, self.vert_dim]].to_numpy()
+		self.a_x_alike, self.a_y_alike = coords[larger].T
+		self.b_x_alike, self.b_y_alike = coords[smaller].T
 
 	# --------------------------------------------------------------------------------------------------
 
+	def print_crosstabs(self):
+		""" print crosstabs - prints the percent in each segment within each category.
+		"""
+		weighting = "unweighted" if self.crosstab_weight is None else f"weighted by {self.crosstab_weight}"
+		for (each_var, each_family), each_table in self.crosstabs.items():
+			print(f"\n\t{each_family} by {each_var}, percent of row, {weighting}:\n")
+			print(each_table.round(1).to_string())
+		#
+		return
+
+	# ---------------------------------------------------------------------------
+
 	def print_segments(self, width, decimals):
 
 		#
@@ -11464,7 +12724,57 @@ class Configuration:
 
 	# --------------------------------------------------------------------------------------
 
+	def procrustes_function(self, sources, targets, variant="similarity"):
+		""" procrustes function - aligns targets to sources in any number of dimensions.
+			Sources and targets are either single (npoint, ndim) arrays or stacks of
+			them, (npair, npoint, ndim), and are broadcast against each other. This
+			allows one active configuration to be compared with many targets, or many
+			replicates with one target, using a single batched SVD.
+			Variant is "orthogonal" (rotation/reflection), "similarity" (rotation,
+			reflection and uniform scaling, as scipy.spatial.procrustes) or
+			"oblique" (unrestricted linear transformation).
+			Returns the standardized sources, the transformed targets and the
+			disparity of each pair.
+		"""
+		#
+		# Broadcast to a common stack of pairs
+		#
+		sources, targets = np.broadcast_arrays(
+			np.asarray(sources, dtype=float), np.asarray(targets, dtype=float))
+		if sources.ndim == 2:
+			sources = sources[np.newaxis]
+			targets = targets[np.newaxis]
+		#
+		# Center each configuration and scale it to unit sum of squares
+		#
+		sources = sources - sources.mean(axis=1, keepdims=True)
+		targets = targets - targets.mean(axis=1, keepdims=True)
+		source_norms = np.linalg.norm(sources, axis=(1, 2), keepdims=True)
+		target_norms = np.linalg.norm(targets, axis=(1, 2), keepdims=True)
+		if np.any(source_norms == 0.0) or np.any(target_norms == 0.0):
+			raise ValueError("Configurations must contain more than one unique point")
+		sources = sources / source_norms
+		targets = targets / target_norms
+		#
+		# Transform every target toward its source
+		#
+		if variant == "oblique":
+			transformation = np.linalg.pinv(targets) @ sources
+			fitted = targets @ transformation
+		else:
+			u, s, vt = np.linalg.svd(np.swapaxes(targets, 1, 2) @ sources)
+			fitted = targets @ (u @ vt)
+			if variant == "similarity":
+				fitted = fitted * s.sum(axis=1)[:, np.newaxis, np.newaxis]
+		#
+		disparities = ((sources - fitted) ** 2).sum(axis=(1, 2))
+		#
+		return sources, fitted, disparities
+
+	# --------------------------------------------------------------------------------------
+
 	def rank(self):
+		self.require_duplicated_similarities()
 		#
 		# Create dataframe which is used for computing and displaying ranks
 		# It will start with self.zipped which has similarities sorted ascending and
@@ -11479,14 +12789,8 @@ class Configuration:
 		#
 		# Add and rank the distances
 		#
-		temp_list = []
-		for each_dyad in self.range_similarities:
-			temp_list.append(str(self.df.iloc[each_dyad]["A"] + "_" + self.df.iloc[each_dyad]["B"]))
-		self.df["Dyad"] = temp_list
-		self.df["Distance_AB"] = 0.0
-		#
-		for each_dyad in self.range_similarities:
-			self.df.at[each_dyad, "Distance_AB"] = self.distances_as_dict[temp_list[each_dyad]]
+		self.df["Dyad"] = self.df["A"] + "_" + self.df["B"]
+		self.df["Distance_AB"] = self.df["Dyad"].map(self.distances_as_dict).astype(float)
 		self.df["Distance_Rank"] = self.df['Distance_AB'].rank(method='average')
 		#
 		# Compute the difference in ranks between the similarities and the distances
@@ -11499,21 +12803,11 @@ class Configuration:
 		#   ????????????????????????????????????????????????????????????????????
 		fig = self.plot_ranks()
 		#
-		# Create filter for each item  indicating when an item is part of a dyad
-		# and the other item they are paired with. Item can be either  the A or B item.
+		# Index of the A and B item of each dyad, used to find the dyads a point is part of
 		#
-		for each_item in self.range_points:
-			self.df[self.point_labels[each_item]] = "INAP"
-		for each_pair in self.range_similarities:
-			for each_item in self.range_points:
-				if self.df.iloc[each_pair]["A"] == self.point_labels[each_item] \
-						or self.df.iloc[each_pair]["B"] == self.point_labels[each_item]:
-					if self.df.iloc[each_pair]["A"] == self.point_labels[each_item]:
-						self.df.at[each_pair, self.point_labels[each_item]] = self.df.iloc[each_pair]["B"]
-					else:
-						self.df.at[each_pair, self.point_labels[each_item]] = self.df.iloc[each_pair]["A"]
-				else:
-					self.df.at[each_pair, self.point_labels[each_item]] = "INAP"
+		position = {label: index for index, label in enumerate(self.item_labels)}
+		self.dyad_a_index = self.df["A"].map(position).to_numpy(dtype=int)
+		self.dyad_b_index = self.df["B"].map(position).to_numpy(dtype=int)
 
 		return fig
 
@@ -11560,31 +12854,35 @@ class Configuration:
 				#
 				#   Read in DIMENSION labels / names
 				#
-				for i in range(expected_dim):
-					(dim_label, dim_name) = file_handle.readline().rstrip('\n').split(';')
-					self.dim_labels.append(dim_label)
-					self.dim_names.append(dim_name)
+				dim_fields = [each_line.rstrip('\n').split(';') for each_line in islice(file_handle, expected_dim)]
 				#
 				#   Read in POINT labels / names
 				#
-				for i in range(expected_points):
-					(point_label, point_name) = file_handle.readline().split(';')
-					self.point_labels.append(point_label)
-					self.point_names.append(point_name)
-					self.point_names[i] = self.point_names[i].strip()
+				point_fields = [each_line.split(';') for each_line in islice(file_handle, expected_points)]
+				if len(dim_fields) != expected_dim or len(point_fields) != expected_points \
+						or any(len(fields) != 2 for fields in dim_fields + point_fields):
+					self.error("Labels do not match number of dimensions and points in file ",
+							file_name)
+					problem_reading_file = True
+					return problem_reading_file
+				self.dim_labels.extend(fields[0] for fields in dim_fields)
+				self.dim_names.extend(fields[1] for fields in dim_fields)
+				self.point_labels.extend(fields[0] for fields in point_fields)
+				self.point_names.extend(fields[1].strip() for fields in point_fields)
 				#
 				#   Read in POINTS
 				#
+				coords = read_coordinate_block(file_handle, file_name, expected_points, expected_dim)
+				if coords is None:
+					self.error("Coordinates do not match number of dimensions and points in file ",
+							file_name)
+					problem_reading_file = True
+					return problem_reading_file
 				self.point_coords = pd.DataFrame(
-					[
-						[
-							float(p) for p in
-							file_handle.readline().split()
-						]
-						for i in range(expected_points)
-					],
+					coords,
 					index=self.point_names,
-					columns=self.dim_labels
+					columns=self.dim_labels,
+					copy=False
 				)
 		except FileNotFoundError:
 			problem_reading_file = True
@@ -11595,6 +12893,49 @@ class Configuration:
 
 	# ----------------------------------------------------------------------------------------
 
+	def read_additional_points(self, file_name):
+		""" read additional points - reads stimuli to be added to the active configuration.
+			The file continues the lower triangle of the existing points: after a line
+			"additional points", the number of new stimuli and a label;name line for each,
+			each new stimulus has a line of values to every existing point followed by
+			values to the new stimuli before it. Returns the problem indicator, the labels,
+			the names and the line of values of each new stimulus.
+		"""
+		try:
+			with open(file_name, 'rt') as file_handle:
+				if file_handle.readline().lower().strip() != "additional points":
+					self.error("File is not an additional points file:",
+							file_name)
+					return True, [], [], []
+				n_new = int(file_handle.readline())
+				if n_new < 1:
+					self.error("No additional points in file ",
+							file_name)
+					return True, [], [], []
+				fields = [each_line.rstrip('\n').split(';') for each_line in islice(file_handle, n_new)]
+				if len(fields) != n_new or any(len(each_field) != 2 for each_field in fields):
+					self.error("Labels do not match number of points in file ",
+							file_name)
+					return True, [], [], []
+				values = np.array(file_handle.read().split(), dtype=np.float64)
+		except (FileNotFoundError, ValueError):
+			self.error("Problem reading file.",
+					"Review file name and contents")
+			return True, [], [], []
+		#
+		# Line k holds npoint + k values
+		#
+		lengths = self.npoint + np.arange(n_new)
+		if values.size != lengths.sum():
+			self.error("Values do not match number of points in file ",
+					file_name)
+			return True, [], [], []
+		rows = np.split(values, np.cumsum(lengths)[:-1])
+		#
+		return False, [each_field[0] for each_field in fields], [each_field[1].strip() for each_field in fields], rows
+
+	# ----------------------------------------------------------------------------------------
+
 	def read_grouped_data(self, file_name):
 		""" read_groups - is used by group command needing to read a group configuration
 			from a file.
@@ -11660,42 +13001,45 @@ class Configuration:
 				#
 				#   Read in DIMENSION labels / names
 				#
-				for i in range(expected_dim):
-					(dim_label_grpd, dim_name_grpd) = file_handle.readline().split(';')
-					self.dim_labels_grpd.append(dim_label_grpd)
-					dim_name_grpd.strip("\n")
-					self.dim_names_grpd.append(dim_name_grpd)
+				dim_fields = [each_line.rstrip("\n").split(';') for each_line in islice(file_handle, expected_dim)]
 				#
-				# Check to see they are the same as in the active configuration
+				#   Read in POINT labels / codes / names
 				#
-					if not self.dim_labels_grpd[i] == self.dim_labels[i]:
-						print(
-							"\n\tDimension label in grouped file is not the " +
-							"same as in active configuration")
-						problem_reading_file = True
-						file_handle.close()
-						return problem_reading_file
+				point_fields = [each_line.split(';') for each_line in islice(file_handle, expected_points)]
+				if len(dim_fields) != expected_dim or len(point_fields) != expected_points \
+						or any(len(fields) != 2 for fields in dim_fields) \
+						or any(len(fields) != 3 for fields in point_fields):
+					self.error("Labels do not match number of dimensions and groups in file ",
+							file_name)
+					problem_reading_file = True
+					return problem_reading_file
+				self.dim_labels_grpd.extend(fields[0] for fields in dim_fields)
+				self.dim_names_grpd.extend(fields[1] for fields in dim_fields)
 				#
-				#   Read in POINT labels / codes / names
+				# Check to see they are the same as in the active configuration
 				#
-				for i in range(expected_points):
-					(point_label_grpd, point_code_grpd, point_name_grpd) = file_handle.readline().split(';')
-					self.point_labels_grpd.append(point_label_grpd)
-					self.point_names_grpd.append(point_name_grpd)
-					self.point_names_grpd[i] = self.point_names_grpd[i].strip()
+				if not self.dim_labels_grpd == self.dim_labels[:expected_dim]:
+					print(
+						"\n\tDimension label in grouped file is not the " +
+						"same as in active configuration")
+					problem_reading_file = True
+					return problem_reading_file
+				self.point_labels_grpd.extend(fields[0] for fields in point_fields)
+				self.point_names_grpd.extend(fields[2].strip() for fields in point_fields)
 				#
 				#   Read in POINTS
 				#
+				coords = read_coordinate_block(file_handle, file_name, expected_points, expected_dim)
+				if coords is None:
+					self.error("Coordinates do not match number of dimensions and groups in file ",
+							file_name)
+					problem_reading_file = True
+					return problem_reading_file
 				self.point_coords_grpd = pd.DataFrame(
-					[
-						[
-							float(p) for p in
-							file_handle.readline().split()
-						]
-						for i in range(expected_points)
-					],
+					coords,
 					index=self.point_names_grpd,
-					columns=self.dim_labels_grpd
+					columns=self.dim_labels_grpd,
+					copy=False
 				)
 		except FileNotFoundError:
 			problem_reading_file = True
@@ -11911,29 +13255,20 @@ class Configuration:
 		#
 		# Multiply all point coordinates by user supplied value
 		#
-		for each_point in self.range_points:
-			self.point_coords.iloc[each_point][which_dim] \
-				= self.point_coords.iloc[each_point][which_dim] * value
+		self.point_coords.iloc[:, which_dim] = self.point_coords.iloc[:, which_dim] * value
 
 	# ---------------------------------------------------------------------------
 
 	def rotate(self, radians):
-		# for each_point in self.point_coords:
-		for each_point in self.range_points:
-			new_x = (
-				(math.cos(radians) * self.point_coords.iloc[each_point][self.hor_dim])
-				- (math.sin(radians) * self.point_coords.iloc[each_point][self.vert_dim])
-				)
-			new_y = (
-				(math.sin(radians) * self.point_coords.iloc[each_point][self.hor_dim])
-				+ (math.cos(radians) * self.point_coords.iloc[each_point][self.vert_dim])
-				)
-			self.point_coords.iloc[each_point][self.hor_dim] = new_x
-			self.point_coords.iloc[each_point][self.vert_dim] = new_y
+		hor = self.point_coords.iloc[:, self.hor_dim].to_numpy(dtype=float, copy=True)
+		vert = self.point_coords.iloc[:, self.vert_dim].to_numpy(dtype=float, copy=True)
+		self.point_coords.iloc[:, self.hor_dim] = (math.cos(radians) * hor) - (math.sin(radians) * vert)
+		self.point_coords.iloc[:, self.vert_dim] = (math.sin(radians) * hor) + (math.cos(radians) * vert)
 
 	# ----------------------------------------------------------------------------------------
 
 	def scree(self):
+		self.require_duplicated_similarities()
 		self.dim_names.append("Dimension 1")
 		self.dim_labels.append("Dim1")
 		#
@@ -11970,73 +13305,6 @@ class Configuration:
 
 	# ---------------------------------------------------------------------------------
 
-	def set_bisector_case(self):
-
-		#
-		# Bisector Case 0a Bisector slope is zero from Left side to Right side
-		#
-		if self.bisector.direction == "Flat":
-			self.bisector.case = "0a"
-		#
-		# Bisector 1 Case 0b Connector slope is zero - from top to bottom
-		#
-		if self.connector.direction == "Flat":
-			self.bisector.case = "0b"
-		#
-		# Bisector Case Ia Positive slope from Left side to Right side and min_y > vert_min
-		#
-		if self.bisector.direction == "Upward slope":
-			#
-			if self.bisector.goes_through_left_side == "Yes" \
-				and self.bisector.goes_through_right_side == "Yes":
-				self.bisector.case = "Ia"
-			#
-			# Bisector Case IIa Positive slope from Left side to Top and bisector_max_y == vert_max
-			#
-			elif self.bisector.goes_through_left_side == "Yes" \
-				and self.bisector.goes_through_top == "Yes":
-				self.bisector.case = "IIa"
-			#
-			# Bisector Case IIIa Positive slope from Bottom to Right side
-			#
-			elif self.bisector.goes_through_bottom == "Yes" \
-				and self.bisector.goes_through_right_side == "Yes":
-				self.bisector.case = "IIIa"
-			#
-			# Bisector Case IVa Positive slope from Bottom to Top and min_x < hor_min
-			#
-			elif self.bisector.goes_through_bottom == "Yes" \
-				and self.bisector.goes_through_top == "Yes":
-				self.bisector.case = "IVa"
-		#
-		# Bisector Case Ib Negative slope from Left side to Right side
-		#
-		if self.bisector.direction == "Downward slope":
-			#
-			if self.bisector.goes_through_left_side == "Yes" \
-				and self.bisector.goes_through_right_side == "Yes":
-				self.bisector.case = "Ib"
-			#
-			# Bisector Case IIb Negative slope from Left side to Bottom and min_y == vert_min
-			#
-			elif self.bisector.goes_through_left_side == "Yes" \
-				and self.bisector.goes_through_bottom == "Yes":
-				self.bisector.case = "IIb"
-			#
-			# Bisector Case IIIb Negative slope from Top to Right side and min_x < hor_min ?????????
-			#
-			elif self.bisector.goes_through_top == "Yes" \
-				and self.bisector.goes_through_right_side == "Yes":
-				self.bisector.case = "IIIb"
-			#
-			# Bisector Case IVb Negative slope from Bottom to Top and max_y > vert_max  ????????????????????????
-			#
-			elif self.bisector.goes_through_bottom == "Yes" \
-				and self.bisector.goes_through_top == "Yes":
-				self.bisector.case = "IVb"
-
-	# ---------------------------------------------------------------------------------
-
 	def set_direction_flags(self):
 		""" set direction flags function - determines the direction of the slope of the
 			connector and the bisector
@@ -12111,526 +13379,13 @@ class Configuration:
 	# ---------------------------------------------------------------------------------------
 
 	def set_line_case(self):
-		""" set line case function - determines the case of the bisector and edges
+		""" set line case function - determines the west and east edges of the battleground
 		Assumes that the calling function has checked to see the reference points
 		have been established
 		"""
 		#
-		#   self.bisector.case = "Unknown"   ???????????????????????????????
-		#
-		# Initialize variables needed
-		#
-		x_coords = []
-		y_coords = []
-		x = []
-		y = []
-		self.west.goes_through_top = "No"
-		self.west.goes_through_bottom = "No"
-		self.west.goes_through_left_side = "No"
-		self.west.goes_through_right_side = "No"
-		self.east.goes_through_top = "No"
-		self.east.goes_through_bottom = "No"
-		self.east.goes_through_left_side = "No"
-		self.east.goes_through_right_side = "No"
-		self.west.start_x = 0.0
-		self.west.start_y = 0.0
-		self.west.end_x = 0.0
-		self.west.end_y = 0.0
-		self.east.start_x = 0.0
-		self.east.start_y = 0.0
-		self.east.end_x = 0.0
-		self.east.end_y = 0.0
-
-		#
-		# Determine distance and each dimension's contribution to distance
-		#
-		differ_x = self.point_coords.iloc[self.rival_a][0] - self.point_coords.iloc[self.rival_b][0]
-		differ_y = self.point_coords.iloc[self.rival_a][1] - self.point_coords.iloc[self.rival_b][1]
-		sq_diff_x = differ_x * differ_x
-		sq_diff_y = differ_y * differ_y
-		x_dist = math.sqrt(sq_diff_x)
-		y_dist = math.sqrt(sq_diff_y)
-		#
-		# Determine width of battleground based on portion of distance between reference point
-		# tolerance is set in main  - default is.1
-		#
-		half_battleground_x = (self.tolerance * x_dist)
-		half_battleground_y = (self.tolerance * y_dist)
-		#
-		# Set west.slope, direction, intercept, case
-		# Switching  from bisector to self.west
-		#
-		self.west.slope = self.bisector.slope
-		#
-		if self.bisector.direction == "Upward slope":
-			self.west_connector_cross_x = self.connector_bisector_cross_x - half_battleground_x
-			self.west_connector_cross_y = self.connector_bisector_cross_y + half_battleground_y
-			self.west.intercept = \
-				self.west_connector_cross_y \
-				- (self.west.slope * self.west_connector_cross_x)
-		elif self.bisector.direction == "Downward slope":
-			# self.west_connector_cross_x = self.connector_bisector_cross_x + half_battleground_x
-			# self.west_connector_cross_y = self.connector_bisector_cross_y + half_battleground_y
-			self.west_connector_cross_x = self.connector_bisector_cross_x - half_battleground_x
-			self.west_connector_cross_y = self.connector_bisector_cross_y - half_battleground_y
-			self.west.intercept = self.west_connector_cross_y \
-				- (self.west.slope * self.west_connector_cross_x)
-		elif self.bisector.direction == "Flat":
-			self.west_connector_cross_x = self.connector_bisector_cross_x
-			self.west_connector_cross_y = self.connector_bisector_cross_y + half_battleground_y
-			self.west.intercept = self.west_connector_cross_y
-		elif self.bisector.direction == "Vertical":
-			self.west_connector_cross_x = self.connector_bisector_cross_x + half_battleground_x
-			self.west_connector_cross_y = self.connector_bisector_cross_y + half_battleground_y
-			self.west.intercept = self.west_connector_cross_y \
-				- (self.west.slope * self.west_connector_cross_x)
-		#
-		# self.west passes through top or bottom
-		#   y at max x
-		self.west.y_at_max_x = (self.west.slope * self.hor_max) \
-			+ self.west.intercept
-
-		# 	y at min x
-		self.west.y_at_min_x = (self.west.slope * self.hor_min) \
-			+ self.west.intercept
-
-		self.west.x_at_max_y = ((
-			self.vert_max
-			- self.west.intercept)
-			/ self.west.slope)
-
-		# 	x at min y
-		self.west.x_at_min_y = ((
-			self.vert_min
-			- self.west.intercept)
-			/ self.west.slope)
-		# -----------------------------------------------------------
-		#
-
-		if self.bisector.direction == "Flat":
-			#
-			if self.west.y_at_max_x > self.vert_max and self.west.y_at_max_x > self.vert_min:
-				self.west.y_at_max_x = self.vert_max
-			if self.west.y_at_max_x < self.vert_min and self.west.y_at_max_x < self.vert_max:
-				self.west.y_at_max_x = self.vert_min
-			if self.west.y_at_min_x > self.vert_max and self.west.y_at_min_x > self.vert_min:
-				self.west.y_at_min_x = self.vert_max
-			if self.west.y_at_min_x < self.vert_min and self.west.y_at_min_x < self.vert_max:
-				self.west.y_at_min_x = self.vert_min
-			if self.west.x_at_max_y > self.hor_max and self.west.x_at_max_y > self.hor_min:
-				self.west.x_at_max_y = self.hor_max
-			if self.west.x_at_max_y < self.hor_min and self.west.x_at_max_y < self.hor_max:
-				self.west.x_at_max_y = self.hor_min
-			if self.west.x_at_min_y > self.hor_max and self.west.x_at_min_y > self.hor_min:
-				self.west.x_at_min_y = self.hor_max
-			if self.west.x_at_min_y < self.hor_min and self.west.x_at_min_y < self.hor_max:
-				self.west.x_at_min_y = self.hor_min
-		#
-		if self.bisector.direction == "Flat":
-			self.west.goes_through_right_side = "Yes"
-			self.west.goes_through_left_side = "Yes"
-			self.west.goes_through_top = "No"
-			self.west.goes_through_bottom = "No"
-		#
-		if self.connector.direction == "Flat":
-			self.west.goes_through_right_side = "No"
-			self.west.goes_through_left_side = "No"
-			self.west.goes_through_top = "Yes"
-			self.west.goes_through_bottom = "Yes"
-		#
-		if self.bisector.direction != "Flat" and self.connector.direction != "Flat":
-			if self.vert_min <= self.west.y_at_max_x <= self.vert_max:
-				self.west.goes_through_right_side = "Yes"
-			if self.vert_min <= self.west.y_at_min_x <= self.vert_max:
-				self.west.goes_through_left_side = "Yes"
-			if self.hor_min <= self.west.x_at_max_y <= self.hor_max:
-				self.west.goes_through_top = "Yes"
-			if self.hor_min <= self.west.x_at_min_y <= self.hor_max:
-				self.west.goes_through_bottom = "Yes"
-		#
-		# Handle lines going through corners
-		#
-		# upper right
-		if self.west.x_at_max_y == self.hor_max \
-			and self.west.y_at_max_x == self.vert_max:
-			self.west.goes_through_top, \
-				self.west.goes_through_right_side = self.choose_a_side_function()
-		# upper left
-		if self.west.x_at_max_y == self.hor_min \
-			and self.west.y_at_min_x == self.vert_max:
-			(self.west.goes_through_top,
-				self.west.goes_through_left_side) = self.choose_a_side_function()
-		# lower right
-		if self.west.x_at_min_y == self.hor_max \
-			and self.west.y_at_max_x == self.vert_min:
-			(self.west.goes_through_bottom,
-				self.west.goes_through_right_side) = self.choose_a_side_function()
-		# lower left
-		if self.west.x_at_min_y == self.hor_min \
-			and self.west.y_at_min_x == self.vert_min:
-			(self.west.goes_through_bottom,
-			self.west.goes_through_left_side) = self.choose_a_side_function()
-		#
-		# Set west.case
-		#
-		if self.west.direction == "Vertical":
-			self.west.case = "0b"			# had been 0a
-		elif self.west.direction == "Flat":
-			self.west.case = "0a"			# had been 0b
-		elif self.west.direction == "Upward slope" \
-				and self.west.goes_through_left_side == "Yes" \
-				and self.west.goes_through_right_side == "Yes":
-			self.west.case = "Ia"
-		elif self.west.direction == "Upward slope" \
-				and self.west.goes_through_left_side == "Yes" \
-				and self.west.goes_through_top == "Yes":
-			self.west.case = "IIa"
-		elif self.west.direction == "Upward slope" \
-				and self.west.goes_through_right_side == "Yes" \
-				and self.west.goes_through_bottom == "Yes":
-			self.west.case = "IIIa"
-		elif self.west.direction == "Upward slope" \
-				and self.west.goes_through_top == "Yes" \
-				and self.west.goes_through_bottom == "Yes":
-			self.west.case = "IVa"
-		elif self.west.direction == "Downward slope" \
-				and self.west.goes_through_left_side == "Yes" \
-				and self.west.goes_through_right_side == "Yes":
-			self.west.case = "Ib"
-		elif self.west.direction == "Downward slope" \
-				and self.west.goes_through_left_side == "Yes" \
-				and self.west.goes_through_bottom == "Yes":
-			self.west.case = "IIb"
-		elif self.west.direction == "Downward slope" \
-				and self.west.goes_through_right_side == "Yes" \
-				and self.west.goes_through_top == "Yes":
-			self.west.case = "IIIb"
-		elif self.west.direction == "Downward slope" \
-				and self.west.goes_through_top == "Yes" \
-				and self.west.goes_through_bottom == "Yes":
-			self.west.case = "IVb"
-
-		match self.west.case:
-			#
-			# west Case 0a  Bisector slope is zero - from Left side to Right side
-			#  had been 0b
-			case "0a":
-				self.west.start_x = self.hor_min
-				self.west.start_y = self.connector_bisector_cross_y - half_battleground_y
-				self.west.end_x = self.hor_max
-				self.west.end_y = self.connector_bisector_cross_y - half_battleground_y
-			#
-			# west Case 0b Connector slope is zero - self.west from top to bottom
-			#  had been 0a
-			case "0b":
-				self.west.start_x = self.connector_bisector_cross_x - half_battleground_x
-				self.west.start_y = self.vert_max
-				self.west.end_x = self.connector_bisector_cross_x - half_battleground_x
-				self.west.end_y = self.vert_min
-			#
-			# west Case Ia Positive slope from Left side to Right side
-			#
-			case "Ia":
-				self.west.start_x = self.hor_min
-				self.west.start_y = self.west.y_at_min_x
-				self.west.end_x = self.hor_max
-				self.west.end_y = self.west.y_at_max_x
-			#
-			# west Case IIa Positive slope from Left side to Top
-			#
-			case "IIa":
-				self.west.start_x = self.hor_min
-				self.west.start_y = self.west.y_at_min_x
-				self.west.end_x = self.west.x_at_max_y
-				self.west.end_y = self.vert_max
-			#
-			# self.west Case IIIa Positive slope from Bottom to Right side
-			#
-			case "IIIa":
-				self.west.start_x = self.west.x_at_min_y
-				self.west.start_y = self.vert_min
-				self.west.end_x = self.hor_max
-				self.west.end_y = self.west.y_at_max_x
-			#
-			# west Case IVa Positive slope from Bottom to Top
-			#
-			case "IVa":
-				self.west.start_x = self.west.x_at_min_y
-				self.west.start_y = self.vert_min
-				self.west.end_x = self.west.x_at_max_y
-				self.west.end_y = self.vert_max
-			#
-			# self.west Case Ib Negative slope from Left side to Right side
-			#
-			case "Ib":
-				self.west.start_x = self.hor_min
-				self.west.start_y = self.west.y_at_min_x
-				self.west.end_x = self.hor_max
-				self.west.end_y = self.west.y_at_max_x
-			#
-			# self.west Case IIb Negative slope from Left side to Bottom
-			#
-			case "IIb":
-				self.west.start_x = self.hor_min
-				self.west.start_y = self.west.y_at_min_x
-				self.west.end_x = self.west.x_at_min_y
-				self.west.end_y = self.vert_min
-			#
-			# self.west Case IIIb Negative slope from Top to Right side
-			#
-			case "IIIb":
-				self.west.start_x = self.west.x_at_max_y
-				self.west.start_y = self.vert_max
-				self.west.end_x = self.hor_max
-				self.west.end_y = self.west.y_at_max_x
-			#
-			# self.west Case IVb Negative slope from Bottom to TopTop to Bottom
-			case "IVb":
-				self.west.start_x = self.west.x_at_max_y
-				self.west.start_y = self.vert_max
-				self.west.end_x = self.west.x_at_min_y
-				self.west.end_y = self.vert_min
-		#
-		# Begin east
-		#
-		self.east.slope = self.bisector.slope
-		#
-		if self.bisector.direction == "Upward slope":
-			self.east_connector_cross_x = self.connector_bisector_cross_x + half_battleground_x
-			self.east_connector_cross_y = self.connector_bisector_cross_y - half_battleground_y
-			self.east.intercept = \
-				self.east_connector_cross_y \
-				- (self.east.slope * self.east_connector_cross_x)
-		elif self.bisector.direction == "Downward slope":
-			# self.east_connector_cross_x = self.connector_bisector_cross_x - half_battleground_x
-			# self.east_connector_cross_y = self.connector_bisector_cross_y - half_battleground_y
-			self.east_connector_cross_x = self.connector_bisector_cross_x + half_battleground_x
-			self.east_connector_cross_y = self.connector_bisector_cross_y + half_battleground_y
-			self.east.intercept = \
-				self.east_connector_cross_y \
-				- (self.east.slope * self.east_connector_cross_x)
-		elif self.bisector.direction == "Flat":
-			self.east_connector_cross_x = self.connector_bisector_cross_x
-			self.east_connector_cross_y = self.connector_bisector_cross_y - half_battleground_y
-			self.east.intercept = self.east_connector_cross_y
-		elif self.bisector.direction == "Vertical":
-			self.east_connector_cross_x = self.connector_bisector_cross_x - half_battleground_x
-			self.east_connector_cross_y = self.connector_bisector_cross_y
-			self.east.intercept = \
-				self.east_connector_cross_y \
-				- (self.east.slope * self.east_connector_cross_x)
-		#
-		# self.east passes through top or bottom
-		#   y at max x
-		self.east.y_at_max_x = (
-			self.east.slope
-			* self.hor_max) \
-			+ self.east.intercept
-		#   y at min x
-		self.east.y_at_min_x = (
-			self.east.slope
-			* self.hor_min) \
-			+ self.east.intercept
-		#
-		# self.east passes through right or left side
-		#    x at max y
-		self.east.x_at_max_y = ((
-			self.vert_max
-			- self.east.intercept)
-			/ self.east.slope)
-		# + self.east.intercept)
-
-		# 	x at min y
-		self.east.x_at_min_y = ((
-			self.vert_min
-			- self.east.intercept)
-			/ self.east.slope)
-		# + self.east.intercept)
-
-		#
-		if self.bisector.direction == "Flat":
-			#
-			if self.east.y_at_max_x > self.vert_max and self.east.y_at_max_x > self.vert_min:
-				self.east.y_at_max_x = self.vert_max
-			if self.east.y_at_max_x < self.vert_min and self.east.y_at_max_x < self.vert_max:
-				self.east.y_at_max_x = self.vert_min
-			if self.east.y_at_min_x > self.vert_max and self.east.y_at_min_x > self.vert_min:
-				self.east.y_at_min_x = self.vert_max
-			if self.east.y_at_min_x < self.vert_min and self.east.y_at_min_x < self.vert_max:
-				self.east.y_at_min_x = self.vert_min
-			if self.east.x_at_max_y > self.hor_max and self.east.x_at_max_y > self.hor_min:
-				self.east.x_at_max_y = self.hor_max
-			if self.east.x_at_max_y < self.hor_min and self.east.x_at_max_y < self.hor_max:
-				self.east.x_at_max_y = self.hor_min
-			if self.east.x_at_min_y > self.hor_max and self.east.x_at_min_y > self.hor_min:
-				self.east.x_at_min_y = self.hor_max
-			if self.east.x_at_min_y < self.hor_min and self.east.x_at_min_y < self.hor_max:
-				self.east.x_at_min_y = self.hor_min
+		self.region_geometry()
 		#
-		if self.connector.direction == "Vertical":
-			self.east.goes_through_right_side = "Yes"
-			self.east.goes_through_left_side = "Yes"
-			self.east.goes_through_top = "No"
-			self.east.goes_through_bottom = "No"
-		if self.connector.direction == "Flat":
-			self.east.goes_through_right_side = "No"
-			self.east.goes_through_left_side = "No"
-			self.east.goes_through_top = "Yes"
-			self.east.goes_through_bottom = "Yes"
-
-		if self.bisector.direction != "Flat" and self.connector.direction != "Flat":
-			if self.vert_min <= self.east.y_at_max_x <= self.vert_max:
-				self.east.goes_through_right_side = "Yes"
-			if self.vert_min <= self.east.y_at_min_x <= self.vert_max:
-				self.east.goes_through_left_side = "Yes"
-			if self.hor_min <= self.east.x_at_max_y <= self.hor_max:
-				self.east.goes_through_top = "Yes"
-			if self.hor_min <= self.east.x_at_min_y <= self.hor_max:
-				self.east.goes_through_bottom = "Yes"
-		#
-		# Handle lines going through corners
-		#
-		# upper right
-		if self.east.x_at_max_y == self.hor_max \
-			and self.east.y_at_max_x == self.vert_max:
-			(self.east.goes_through_top,
-			self.east.goes_through_right_side) = self.choose_a_side_function()
-		# upper left
-		if self.east.x_at_max_y == self.hor_min \
-			and self.east.y_at_min_x == self.vert_max:
-			(self.east.goes_through_top,
-			self.east.goes_through_left_side) = self.choose_a_side_function()
-		# lower right
-		if self.east.x_at_min_y == self.hor_max \
-			and self.east.y_at_max_x == self.vert_min:
-			(self.east.goes_through_bottom,
-			self.east.goes_through_right_side) = self.choose_a_side_function()
-		# lower left
-		if self.east.x_at_min_y == self.hor_min \
-			and self.east.y_at_min_x == self.vert_min:
-			(self.east.goes_through_bottom,
-			self.east.goes_through_left_side) = self.choose_a_side_function()
-		#
-		# Set east_case
-		#
-		if self.east.direction == "Vertical":
-			self.east.case = "0b"			# had been 0a
-		elif self.east.direction == "Flat":
-			self.east.case = "0a"			# had been 0b
-		elif self.east.direction == "Upward slope" \
-			and self.east.goes_through_left_side == "Yes" \
-			and self.east.goes_through_right_side == "Yes":
-			self.east.case = "Ia"
-		elif self.east.direction == "Upward slope" \
-			and self.east.goes_through_left_side == "Yes" \
-			and self.east.goes_through_top == "Yes":
-			self.east.case = "IIa"
-		elif self.east.direction == "Upward slope" \
-			and self.east.goes_through_right_side == "Yes" \
-			and self.east.goes_through_bottom == "Yes":
-			self.east.case = "IIIa"
-		elif self.east.direction == "Upward slope" \
-			and self.east.goes_through_top == "Yes" \
-			and self.east.goes_through_bottom == "Yes":
-			self.east.case = "IVa"
-		elif self.east.direction == "Downward slope" \
-			and self.east.goes_through_left_side == "Yes" \
-			and self.east.goes_through_right_side == "Yes":
-			self.east.case = "Ib"
-		elif self.east.direction == "Downward slope" \
-			and self.east.goes_through_left_side == "Yes" \
-			and self.east.goes_through_bottom == "Yes":
-			self.east.case = "IIb"
-		elif self.east.direction == "Downward slope" \
-			and self.east.goes_through_right_side == "Yes" \
-			and self.east.goes_through_top == "Yes":
-			self.east.case = "IIIb"
-		elif self.east.direction == "Downward slope" \
-			and self.east.goes_through_top == "Yes" \
-			and self.east.goes_through_bottom == "Yes":
-			self.east.case = "IVb"
-		#
-		match self.east.case:
-			#
-			# east Case 0a Bisector slope is zero - Left side to Right sid
-			#   had been 0b
-			case "0a":
-				self.east.start_x = self.hor_min
-				self.east.start_y = self.connector_bisector_cross_y + half_battleground_y
-				self.east.end_x = self.hor_max
-				self.east.end_y = self.connector_bisector_cross_y + half_battleground_y
-			#
-			# east Case 0b eConnector slope is zero - top to bottom
-			#   had been 0a
-			case "0b":
-				self.east.start_x = self.connector_bisector_cross_x + half_battleground_x
-				self.east.start_y = self.vert_max
-				self.east.end_x = self.connector_bisector_cross_x + half_battleground_x
-				self.east.end_y = self.vert_min
-			#
-			# east Case Ia Positive slope from Left side to Right side
-			#
-			case "Ia":
-				self.east.start_x = self.hor_min
-				self.east.start_y = self.east.y_at_min_x
-				self.east.end_x = self.hor_max
-				self.east.end_y = self.east.y_at_max_x
-			#
-			# east Case IIa Positive slope from Left side to Top and max_y == vert_max
-			#
-			case "IIa":
-				self.east.start_x = self.hor_min
-				self.east.start_y = self.east.y_at_min_x
-				self.east.end_x = self.east.x_at_max_y
-				self.east.end_y = self.vert_max
-			#
-			# self.east Case IIIa Positive slope from Bottom to Right side
-			#
-			case "IIIa":
-				self.east.start_x = self.east.x_at_min_y
-				self.east.start_y = self.vert_min
-				self.east.end_x = self.hor_max
-				self.east.end_y = self.east.y_at_max_x
-			#
-			# east Case IVa Positive slope from Bottom to Top and min_x < hor_min
-			#
-			case "IVa":
-				self.east.start_x = self.east.x_at_min_y
-				self.east.start_y = self.vert_min
-				self.east.end_x = self.east.x_at_max_y
-				self.east.end_y = self.vert_max
-			#
-			# self.east Case Ib Negative slope from Left side to Right side
-			#
-			case "Ib":
-				self.east.start_x = self.hor_min
-				self.east.start_y = self.east.y_at_min_x
-				self.east.end_x = self.hor_max
-				self.east.end_y = self.east.y_at_max_x
-			#
-			# self.east Case IIb Negative slope from Left side to Bottom
-			#
-			case "IIb":
-				self.east.start_x = self.hor_min
-				self.east.start_y = self.east.y_at_min_x
-				self.east.end_x = self.east.x_at_min_y
-				self.east.end_y = self.vert_min
-			#
-			# self.east Case IIIb Negative slope from Top to Right side
-			#
-			case "IIIb":
-				self.east.start_x = self.east.x_at_max_y
-				self.east.start_y = self.vert_max
-				self.east.end_x = self.hor_max
-				self.east.end_y = self.east.y_at_max_x
-			#
-			# self.east Case IVb Negative slope from Top to Bottom
-			#
-			case "IVb":
-				self.east.start_x = self.east.x_at_max_y
-				self.east.start_y = self.vert_max
-				self.east.end_x = self.east.x_at_min_y
-				self.east.end_y = self.vert_min
 		return
 
 	# ----------------------------------------------------------------------------------
@@ -12653,60 +13408,63 @@ class Configuration:
 
 	# ----------------------------------------------------------------------------------
 
-	def write(self, file_name):
-
+	def write(self, file_name, binary=False):
+		""" write - writes the configuration to a file, formatting all coordinates at once.
+			The name is claimed by creating an empty file exclusively, so an existing file
+			is never overwritten, and the contents replace it only when completely written
+			so a failure never leaves part of one. With binary the coordinates are also
+			written to file_name + ".npy", which read_coordinate_block maps instead of
+			parsing the text.
+		"""
 		problem_writing_file = False
 		#
 		try:
-			with open(file_name, 'x') as file_handle:
-
-				#
-				# Write line declaring file type to be "Configuration".	\
-				#
-				file_handle.write("Configuration\n")
-				#
-				# Write line showing number of dimensions and number of points
-				#
-				file_handle.write(" " + str(self.ndim) + " " + str(self.npoint) + "\n")
-				#
-				# Write a line for each dimension showing the label and name for each dimension,
-				# separated by a semicolon.
-				#
-				# semi_string = ";"
-				# semi_list = [";"]
-				# semi_list2 = {}
-				# semi_list2.append(";")
-				for each_dim in self.range_dims:
-					file_handle.write(f"{self.dim_labels[each_dim]};{self.dim_names[each_dim].strip()}\n")
-					# file_handle.write(self.dim_labels[each_dim] + ";" + self.dim_names[each_dim].strip() + "\n")
-					# file_handle.write(self.dim_labels[each_dim] + semi_string + self.dim_names[each_dim].strip())  # + "\n")
-					# file_handle.write(self.dim_labels[each_dim] + semi_list + self.dim_names[each_dim].strip()) # + "\n")
-					# file_handle.write(self.dim_labels[each_dim] + semi_list2 + self.dim_names[each_dim].strip()) # + "\n")
-					# file_handle.write(self.dim_labels[each_dim] + semi_list2[0] + self.dim_names[each_dim].strip() + "\n")
-				#
-				# Write a line for each point showing the label and name for the point,
-				# separated by a semicolon.
-				#
-				for each_point in self.range_points:
-					file_handle.write(f"{self.point_labels[each_point]};{self.point_names[each_point]}\n")
-					#file_handle.write(self.point_labels[each_point] + ";" + self.point_names[each_point] + "\n")
-				#
-				# Write a line for each point with the coordinate of the point on each dimension,
-				# separated by a blank.
-				#
-				for each_point in self.range_points:
-					for each_dim in self.range_dims:
-						file_handle.write(str(self.point_coords.iloc[each_point][each_dim]) + " ")
-						continue
-					file_handle.write("\n")
-					continue
+			open(file_name, "x").close()
 		except FileExistsError:
 			self.error("File already exists: ",
 				file_name)
 			problem_writing_file = True
 			return problem_writing_file
-
-		problem_writing_file = False
+		except OSError:
+			self.error("Unable to write file: ",
+				file_name)
+			problem_writing_file = True
+			return problem_writing_file
+		#
+		# Line declaring file type, line with number of dimensions and number of points,
+		# then label and name of each dimension and of each point separated by a semicolon
+		#
+		lines = ["Configuration", f" {self.ndim} {self.npoint}"]
+		lines += [
+			f"{self.dim_labels[each_dim]};{self.dim_names[each_dim].strip()}"
+			for each_dim in self.range_dims]
+		lines += [
+			f"{self.point_labels[each_point]};{self.point_names[each_point]}"
+			for each_point in self.range_points]
+		#
+		# A line for each point with its coordinates separated by a blank, all formatted by
+		# one printf-style operation, %r giving the shortest text that reads back exactly
+		#
+		coords = self.point_coords.iloc[:, :self.ndim]
+		values = coords.to_numpy(dtype=np.float64)
+		text = "\n".join(lines) + "\n" + (" ".join(["%r"] * values.shape[1]) + "\n") * values.shape[0] % tuple(
+			values.ravel().tolist())
+		#
+		if not write_atomically(file_name, text.encode()):
+			os.remove(file_name)
+			self.error("Unable to write file: ",
+				file_name)
+			problem_writing_file = True
+			return problem_writing_file
+		#
+		if binary:
+			buffer = BytesIO()
+			np.save(buffer, values)
+			if not write_atomically(file_name + ".npy", buffer.getvalue()):
+				self.error("Unable to write binary copy: ",
+					file_name + ".npy")
+				problem_writing_file = True
+				return problem_writing_file
 		#
 		return problem_writing_file
 
@@ -12720,6 +13478,532 @@ class Configuration:
 # --------------------------------------------------------------------------------------------
 
 
+def clip_to_half_plane(vertices, normal, level):
+	""" clip to half plane - one Sutherland-Hodgman pass keeping the part of a convex
+		polygon where normal . p <= level. Returns the clipped vertices, possibly none.
+	"""
+	vertices = np.asarray(vertices, dtype=float)
+	if len(vertices) == 0:
+		return vertices
+	heights = vertices @ normal - level
+	clipped = []
+	for each_vertex in range(len(vertices)):
+		following = (each_vertex + 1) % len(vertices)
+		here = heights[each_vertex]
+		there = heights[following]
+		if here <= 0.0:
+			clipped.append(vertices[each_vertex])
+		if (here < 0.0 < there) or (there < 0.0 < here):
+			share = here / (here - there)
+			clipped.append(vertices[each_vertex] + share * (vertices[following] - vertices[each_vertex]))
+	return np.array(clipped, dtype=float).reshape(-1, 2)
+
+# --------------------------------------------------------------------------------------------
+
+
+def lead_positive(vectors):
+	""" lead positive - flips each row whose first nonzero element is negative, so a
+		direction and its reverse are oriented alike. Returns the rows and which were flipped.
+	"""
+	vectors = np.atleast_2d(np.asarray(vectors, dtype=float))
+	first = np.argmax(vectors != 0.0, axis=1)
+	flip = vectors[np.arange(len(vectors)), first] < 0.0
+	return np.where(flip[:, np.newaxis], -vectors, vectors), flip
+
+# --------------------------------------------------------------------------------------------
+
+
+def line_across_rectangle(normal, level, bounds):
+	""" line across rectangle - ends of the line normal . p = level, for a unit normal,
+		inside bounds (x_min, x_max, y_min, y_max), west end first or bottom end first
+		when vertical. Returns None when the line misses the rectangle.
+	"""
+	anchor = level * np.asarray(normal, dtype=float)
+	along = np.array([-normal[1], normal[0]], dtype=float)
+	if along[0] < 0.0 or (along[0] == 0.0 and along[1] < 0.0):
+		along = -along
+	low = -np.inf
+	high = np.inf
+	for start, step, lower, upper in (
+			(anchor[0], along[0], bounds[0], bounds[1]), (anchor[1], along[1], bounds[2], bounds[3])):
+		if step == 0.0:
+			if not lower <= start <= upper:
+				return None
+			continue
+		first, second = sorted(((lower - start) / step, (upper - start) / step))
+		low = max(low, first)
+		high = min(high, second)
+	if low > high:
+		return None
+	return anchor + low * along, anchor + high * along
+
+# --------------------------------------------------------------------------------------------
+
+
+def format_lower_triangle(values, labels, value_format, block_values=1000000):
+	""" format_lower_triangle - yields the text of the rows of a lower triangle, a block
+		of rows at a time. Each block is formatted by one printf-style operation over
+		all of its values rather than one format call per value. With labels each row
+		begins with the label of its item; without them rows hold only values.
+	"""
+	start = 0
+	while start < len(values):
+		stop = start
+		n_values = 0
+		while stop < len(values) and (stop == start or n_values + len(values[stop]) <= block_values):
+			n_values += len(values[stop])
+			stop += 1
+		if labels is None:
+			template = "".join(value_format * len(values[each_row]) + "\n" for each_row in range(start, stop))
+		else:
+			template = "".join(
+				"   " + str(labels[each_row]).replace("%", "%%") + " " + value_format * len(values[each_row]) + "\n"
+				for each_row in range(start, stop))
+		yield template % tuple(chain.from_iterable(values[start:stop]))
+		start = stop
+
+# --------------------------------------------------------------------------------------------------
+
+def squared_distances(points, others):
+	""" squared_distances - squared Euclidean distances between every row of points and
+		every row of others, as |x|^2 - 2 x.p + |p|^2 so no difference array is formed.
+	"""
+	return (
+		np.einsum("ij,ij->i", points, points)[:, np.newaxis] - 2.0 * (points @ others.T)
+		+ np.einsum("ij,ij->i", others, others)[np.newaxis, :])
+
+# --------------------------------------------------------------------------------------------------
+
+def triangulate(anchors, squared, anchor_means=None):
+	""" triangulate - places points from their squared distances to the rows of anchors,
+		a centered configuration, as landmark MDS does: x = -1/2 pinv(anchors) (squared
+		- anchor_means). anchor_means is the mean squared distance from the anchors to
+		each anchor, taken from the anchors' own configuration unless given.
+	"""
+	if anchor_means is None:
+		anchor_means = squared_distances(anchors, anchors).mean(axis=0)
+	return -0.5 * (squared - anchor_means) @ np.linalg.pinv(anchors).T
+
+# --------------------------------------------------------------------------------------------------
+
+
+def place_by_majorization(coords, fixed, targets, iterations):
+	""" place_by_majorization - moves each row of coords toward its targets, the distances
+		wanted to its own fixed points (rows x fixed points x dimensions, or one set
+		broadcast to all rows), by repeated Guttman transforms. The fixed points never move.
+	"""
+	for each_iteration in range(iterations):
+		offsets = coords[:, np.newaxis, :] - fixed
+		lengths = np.maximum(np.linalg.norm(offsets, axis=2), 1e-12)
+		coords = (fixed + (targets / lengths)[:, :, np.newaxis] * offsets).mean(axis=1)
+	return coords
+
+# --------------------------------------------------------------------------------------------------
+
+def export_factor_scores(fa, evaluations, file_name, file_format, chunk_rows, columns):
+	""" export factor scores - scores evaluations chunk_rows at a time and appends each chunk
+		to a gzip compressed CSV, a .npy array or a Parquet file, so only one chunk of scores
+		is ever in memory. The file is written under a temporary name and renamed when complete.
+		Returns the number of evaluators scored.
+	"""
+	partial_name = file_name + ".partial"
+	n_rows = evaluations.shape[0]
+	starts = range(0, n_rows, chunk_rows)
+
+	def scored(start):
+		chunk = evaluations.iloc[start:start + chunk_rows]
+		return pd.DataFrame(fa.transform(chunk), columns=columns, index=chunk.index)
+
+	try:
+		if file_format == "npy":
+			scores = np.lib.format.open_memmap(
+				partial_name, mode="w+", dtype=np.float64, shape=(n_rows, len(columns)))
+			for start in starts:
+				scores[start:start + chunk_rows] = scored(start).to_numpy()
+			scores.flush()
+			del scores
+		elif file_format == "parquet":
+			writer = None
+			for start in starts:
+				table = pyarrow.Table.from_pandas(scored(start))
+				if writer is None:
+					writer = pq.ParquetWriter(partial_name, table.schema)
+				writer.write_table(table)
+			if writer is not None:
+				writer.close()
+		else:
+			with gzip.open(partial_name, "wt", newline="") as file_handle:
+				for start in starts:
+					scored(start).to_csv(file_handle, header=(start == 0))
+		os.replace(partial_name, file_name)
+	finally:
+		if os.path.exists(partial_name):
+			os.remove(partial_name)
+	#
+	return n_rows
+
+# --------------------------------------------------------------------------------------------
+
+
+def random_correlation_eigenvalues(n_obs, n_vars, n_matrices, seed):
+	""" random correlation eigenvalues - returns, largest first, the eigenvalues of the
+		correlations among n_vars uncorrelated normal variables observed n_obs times, for
+		n_matrices samples. Cross products are drawn directly from their Wishart distribution
+		by Bartlett's decomposition, so no sample of n_obs observations is ever generated.
+	"""
+	rng = np.random.default_rng(seed)
+	diagonal = np.arange(n_vars)
+	lower = np.tril(rng.standard_normal((n_matrices, n_vars, n_vars)), -1)
+	lower[:, diagonal, diagonal] = np.sqrt(rng.chisquare(n_obs - 1 - diagonal, size=(n_matrices, n_vars)))
+	cross_products = lower @ np.swapaxes(lower, 1, 2)
+	scale = 1.0 / np.sqrt(np.diagonal(cross_products, axis1=1, axis2=2))
+	correlations = cross_products * scale[:, :, None] * scale[:, None, :]
+	#
+	return np.linalg.eigvalsh(correlations)[:, ::-1]
+
+# --------------------------------------------------------------------------------------------
+
+
+def read_coordinate_block(file_handle, file_name, npoint, ndim):
+	""" read coordinate block - reads the next npoint lines of ndim coordinates with a
+		single numeric parse. When file_name + ".npy" of the right shape is at least as new
+		as file_name, the coordinates are mapped from it instead. Returns None when the
+		number of coordinates is not npoint times ndim.
+	"""
+	binary_name = file_name + ".npy"
+	if os.path.exists(binary_name) and os.path.getmtime(binary_name) >= os.path.getmtime(file_name):
+		coords = np.load(binary_name, mmap_mode="c")
+		if coords.shape == (npoint, ndim):
+			return coords
+	#
+	values = np.array("".join(islice(file_handle, npoint)).split(), dtype=np.float64)
+	if values.size != npoint * ndim:
+		return None
+	#
+	return values.reshape(npoint, ndim)
+
+# --------------------------------------------------------------------------------------------
+
+
+def write_atomically(file_name, data):
+	""" write atomically - writes data through QSaveFile, which writes to a temporary file
+		and renames it to file_name only once all of data has been written. Data is
+		either bytes or an iterable of bytes written one chunk after another.
+	"""
+	save_file = QSaveFile(file_name)
+	if not save_file.open(QIODevice.WriteOnly):
+		return False
+	for chunk in ((data,) if isinstance(data, bytes) else data):
+		if save_file.write(chunk) != len(chunk):
+			save_file.cancelWriting()
+			return False
+	return save_file.commit()
+
+# --------------------------------------------------------------------------------------------
+
+
+SESSION_MAGIC = b"SPACESS1"
+SESSION_ALIGNMENT = 64
+#
+# Forms of the similarities rebuilt from similarities by require_duplicated_similarities
+#
+SESSION_DERIVED = (
+	"similarities_as_dict", "similarities_as_list", "similarities_as_square", "a_item", "b_item", "zipped",
+	"sorted_similarity_values", "sorted_similarity_smaller", "sorted_similarity_larger")
+
+
+def session_aligned(offset):
+	return -(-offset // SESSION_ALIGNMENT) * SESSION_ALIGNMENT
+
+# --------------------------------------------------------------------------------------------
+
+
+def encode_session_value(value, arrays):
+	""" encode session value - describes value for the JSON header of a session file.
+		Numeric arrays, columns and lists are appended to arrays and referred to by
+		position so they can be memory-mapped when the session is opened.
+	"""
+	if value is None or isinstance(value, (bool, int, float, str)):
+		return {"json": value}
+	if isinstance(value, np.generic):
+		return {"json": value.item()}
+	if isinstance(value, np.ndarray):
+		if value.dtype.kind in "biuf":
+			arrays.append(np.ascontiguousarray(value))
+			return {"array": len(arrays) - 1}
+		return {"list": [encode_session_value(each, arrays) for each in value.tolist()], "as": "ndarray"}
+	if isinstance(value, range):
+		return {"range": [value.start, value.stop, value.step]}
+	if isinstance(value, pd.DataFrame):
+		frame = {
+			"columns": encode_session_value(list(value.columns), arrays),
+			"index": encode_session_value(list(value.index), arrays)
+		}
+		#
+		# A frame of one numeric type is kept as a single block so it can be mapped without copying
+		#
+		if value.shape[1] > 0 and value.dtypes.nunique() == 1 and value.dtypes.iloc[0].kind in "biuf":
+			frame["values"] = encode_session_value(value.to_numpy(), arrays)
+		else:
+			frame["data"] = [
+				encode_session_value(value.iloc[:, each_column].to_numpy(), arrays)
+				for each_column in range(value.shape[1])]
+		return {"frame": frame}
+	if isinstance(value, pd.Series):
+		return {"series": {
+			"name": encode_session_value(value.name, arrays),
+			"index": encode_session_value(list(value.index), arrays),
+			"data": encode_session_value(value.to_numpy(), arrays)
+		}}
+	if isinstance(value, (list, tuple)):
+		kind = type(value).__name__
+		#
+		# Strings, such as labels and names, become one fixed width array
+		#
+		if len(value) > 0 and all(isinstance(each, str) for each in value):
+			arrays.append(np.array(value, dtype=str))
+			return {"array": len(arrays) - 1, "as": kind}
+		#
+		# Rectangular numbers become one array, the lower triangle one array plus row lengths
+		#
+		if len(value) > 0 and not isinstance(value[0], (str, bool)):
+			try:
+				candidate = np.asarray(value)
+			except (ValueError, TypeError):
+				candidate = None
+			if candidate is not None and candidate.dtype.kind in "iuf":
+				arrays.append(np.ascontiguousarray(candidate))
+				return {"array": len(arrays) - 1, "as": kind}
+			if (candidate is None or candidate.dtype.kind == "O") and all(isinstance(each, list) for each in value):
+				try:
+					flat = np.asarray([each_value for each in value for each_value in each], dtype=float)
+				except (ValueError, TypeError):
+					flat = None
+				if flat is not None:
+					arrays.append(flat)
+					arrays.append(np.asarray([len(each) for each in value], dtype=np.int64))
+					return {"ragged": [len(arrays) - 2, len(arrays) - 1], "as": kind}
+		return {"list": [encode_session_value(each, arrays) for each in value], "as": kind}
+	if isinstance(value, dict):
+		return {"dict": [
+			[encode_session_value(key, arrays), encode_session_value(each, arrays)]
+			for key, each in value.items()]}
+	if isinstance(value, (Line, Polygon)):
+		return {"object": type(value).__name__, "attrs": {
+			name: encode_session_value(each, arrays) for name, each in vars(value).items()}}
+	#
+	# Anything else (e.g. fitted estimators) is not part of the session
+	#
+	return {"skipped": type(value).__name__}
+
+# --------------------------------------------------------------------------------------------
+
+
+def decode_session_value(entry, arrays):
+	""" decode session value - rebuilds a value described by encode_session_value.
+		Arrays, rows of a lower triangle and data frame columns remain views on the
+		memory-mapped file. Lists of strings or numbers become lists again, since
+		commands append to them.
+	"""
+	if "json" in entry:
+		return entry["json"]
+	if "array" in entry:
+		array = arrays[entry["array"]]
+		if entry.get("as") == "list":
+			return array.tolist()
+		if entry.get("as") == "tuple":
+			return tuple(array.tolist())
+		return array
+	if "ragged" in entry:
+		flat = arrays[entry["ragged"][0]]
+		ends = np.cumsum(arrays[entry["ragged"][1]])
+		rows = np.split(flat, ends[:-1]) if len(ends) > 0 else []
+		return tuple(rows) if entry.get("as") == "tuple" else rows
+	if "range" in entry:
+		return range(*entry["range"])
+	if "frame" in entry:
+		frame = entry["frame"]
+		columns = list(decode_session_value(frame["columns"], arrays))
+		index = list(decode_session_value(frame["index"], arrays))
+		if len(columns) == 0:
+			return pd.DataFrame(index=index)
+		if "values" in frame:
+			return pd.DataFrame(
+				decode_session_value(frame["values"], arrays), index=index, columns=columns, copy=False)
+		data = [decode_session_value(each, arrays) for each in frame["data"]]
+		result = pd.DataFrame(dict(zip(range(len(columns)), data)), index=index)
+		result.columns = columns
+		return result
+	if "series" in entry:
+		series = entry["series"]
+		index = list(decode_session_value(series["index"], arrays))
+		return pd.Series(
+			decode_session_value(series["data"], arrays), index=index if len(index) > 0 else None,
+			name=decode_session_value(series["name"], arrays))
+	if "list" in entry:
+		items = [decode_session_value(each, arrays) for each in entry["list"]]
+		if entry.get("as") == "tuple":
+			return tuple(items)
+		if entry.get("as") == "ndarray":
+			return np.array(items, dtype=object)
+		return items
+	if "dict" in entry:
+		return {
+			decode_session_value(key, arrays): decode_session_value(each, arrays)
+			for key, each in entry["dict"]}
+	if "object" in entry:
+		an_object = Line() if entry["object"] == "Line" else Polygon()
+		for name, each in entry["attrs"].items():
+			setattr(an_object, name, decode_session_value(each, arrays))
+		return an_object
+	return None
+
+# --------------------------------------------------------------------------------------------
+
+
+def write_session_file(file_name, configurations):
+	""" write session file - writes configurations, a dictionary of Configuration objects,
+		as a small JSON header followed by uncompressed arrays, each aligned so that it
+		can be memory-mapped in place when the session is opened. The forms derived from
+		the similarities are left to be rebuilt when needed, and an attribute that is the
+		same object as an earlier one is recorded as that attribute.
+	"""
+	arrays = []
+	state = dict()
+	for name, conf in configurations.items():
+		state[name] = dict()
+		encoded = dict()
+		for attribute, value in vars(conf).items():
+			if attribute in SESSION_DERIVED:
+				continue
+			if attribute == "similarities_duplicated":
+				state[name][attribute] = {"json": False}
+			elif isinstance(value, (list, dict, np.ndarray, pd.DataFrame, pd.Series)) and id(value) in encoded:
+				state[name][attribute] = {"same": encoded[id(value)]}
+			else:
+				encoded[id(value)] = attribute
+				state[name][attribute] = encode_session_value(value, arrays)
+	#
+	# Lay out the arrays after the header
+	#
+	descriptors = []
+	offset = 0
+	for each_array in arrays:
+		offset = session_aligned(offset)
+		descriptors.append({"dtype": each_array.dtype.str, "shape": list(each_array.shape), "offset": offset})
+		offset += each_array.nbytes
+	header = json.dumps({
+		"version": 1,
+		"created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"arrays": descriptors,
+		"configurations": state
+	}).encode("utf-8")
+	data_start = session_aligned(len(SESSION_MAGIC) + 8 + len(header))
+	#
+	# Write next to the destination and replace it only once complete
+	#
+	temporary_name = file_name + ".partial"
+	try:
+		with open(temporary_name, "wb") as file_handle:
+			file_handle.write(SESSION_MAGIC)
+			file_handle.write(len(header).to_bytes(8, "little"))
+			file_handle.write(header)
+			for each_array, each_descriptor in zip(arrays, descriptors):
+				file_handle.write(b"\0" * (data_start + each_descriptor["offset"] - file_handle.tell()))
+				file_handle.write(each_array.data)
+		os.replace(temporary_name, file_name)
+	finally:
+		if os.path.exists(temporary_name):
+			os.remove(temporary_name)
+	#
+	return data_start + offset
+
+# --------------------------------------------------------------------------------------------
+
+
+def read_session_file(file_name):
+	""" read session file - maps a file written by write_session_file and returns its
+		configurations. The arrays are copy-on-write views of the file so nothing is
+		read until it is used.
+	"""
+	with open(file_name, "rb") as file_handle:
+		if file_handle.read(len(SESSION_MAGIC)) != SESSION_MAGIC:
+			raise ValueError("File is not a Spaces session file")
+		header_length = int.from_bytes(file_handle.read(8), "little")
+		header = json.loads(file_handle.read(header_length).decode("utf-8"))
+	data_start = session_aligned(len(SESSION_MAGIC) + 8 + header_length)
+	#
+	arrays = []
+	if len(header["arrays"]) > 0:
+		whole = np.memmap(file_name, dtype=np.uint8, mode="c")
+		for each_descriptor in header["arrays"]:
+			dtype = np.dtype(each_descriptor["dtype"])
+			shape = tuple(each_descriptor["shape"])
+			begin = data_start + each_descriptor["offset"]
+			end = begin + dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+			arrays.append(whole[begin:end].view(dtype).reshape(shape))
+	#
+	configurations = dict()
+	for name, state in header["configurations"].items():
+		conf = Configuration()
+		for attribute, entry in state.items():
+			if "same" in entry:
+				setattr(conf, attribute, getattr(conf, entry["same"]))
+			else:
+				setattr(conf, attribute, decode_session_value(entry, arrays))
+		configurations[name] = conf
+	#
+	return configurations
+
+# --------------------------------------------------------------------------------------------
+
+
+def place_labels(x, y, widths, height, gap, bounds, prefer_left=None):
+	""" place labels - greedily places a label beside each point, in order of priority,
+		wherever it overlaps no label already placed and stays within bounds.
+		Placed boxes are kept in a grid of cells a mean label wide and a label high, so
+		each test looks only at nearby labels.
+		Returns index, anchor x, anchor y and alignments of each label placed.
+	"""
+	hor_min, hor_max, vert_min, vert_max = bounds
+	cell_x = float(np.mean(widths)) if np.any(widths) else 1.0
+	cell_y = height
+	grid = dict()
+	placed = []
+	for each_point in range(len(x)):
+		point_x, point_y, width = x[each_point], y[each_point], widths[each_point]
+		right = (point_x + gap, point_y - height / 2, "left", "center")
+		left = (point_x - gap - width, point_y - height / 2, "right", "center")
+		above = (point_x - width / 2, point_y + gap, "center", "bottom")
+		below = (point_x - width / 2, point_y - gap - height, "center", "top")
+		if prefer_left is not None and prefer_left[each_point]:
+			candidates = (left, right, above, below)
+		else:
+			candidates = (right, left, above, below)
+		for x0, y0, ha, va in candidates:
+			x1, y1 = x0 + width, y0 + height
+			if x0 < hor_min or x1 > hor_max or y0 < vert_min or y1 > vert_max:
+				continue
+			cells = [
+				(each_column, each_row)
+				for each_column in range(int(x0 // cell_x), int(x1 // cell_x) + 1)
+				for each_row in range(int(y0 // cell_y), int(y1 // cell_y) + 1)]
+			if any(
+				x0 < other[2] and other[0] < x1 and y0 < other[3] and other[1] < y1
+				for each_cell in cells for other in grid.get(each_cell, ())):
+				continue
+			for each_cell in cells:
+				grid.setdefault(each_cell, []).append((x0, y0, x1, y1))
+			anchor_x = {"left": x0, "right": x1, "center": point_x}[ha]
+			anchor_y = {"center": point_y, "bottom": y0, "top": y1}[va]
+			placed.append((each_point, anchor_x, anchor_y, ha, va))
+			break
+	#
+	return placed
+
+# --------------------------------------------------------------------------------------------
+
+
 # def example_plot():
 # 	fig, ax = plt.subplots()
 # 	ax.plot([1, 2, 3, 4], [1, 4, 9, 16], 'ro')